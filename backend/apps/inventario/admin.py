@@ -1,7 +1,7 @@
 # apps/inventario/admin.py 
 
 from django.contrib import admin
-from .models import Producto, Categoria, MovimientoInventario
+from .models import Producto, Categoria, MovimientoInventario, EliminacionCatalogo, CorteStock, AlertaStockBajo
 
 @admin.register(Categoria)
 class CategoriaAdmin(admin.ModelAdmin):
@@ -42,4 +42,25 @@ class MovimientoInventarioAdmin(admin.ModelAdmin):
     search_fields = ('id_producto__nombre', 'id_usuario__username', 'descripcion', 'numero_documento')
     readonly_fields = ('stock_anterior', 'stock_nuevo')
     date_hierarchy = 'fecha_movimiento'
-    raw_id_fields = ('id_producto', 'id_usuario')
\ No newline at end of file
+    raw_id_fields = ('id_producto', 'id_usuario')
+
+
+@admin.register(EliminacionCatalogo)
+class EliminacionCatalogoAdmin(admin.ModelAdmin):
+    list_display = ('modelo', 'id_objeto', 'fecha_eliminacion')
+    list_filter = ('modelo',)
+    date_hierarchy = 'fecha_eliminacion'
+
+
+@admin.register(CorteStock)
+class CorteStockAdmin(admin.ModelAdmin):
+    list_display = ('fecha_corte', 'id_producto', 'stock')
+    date_hierarchy = 'fecha_corte'
+    raw_id_fields = ('id_producto',)
+
+
+@admin.register(AlertaStockBajo)
+class AlertaStockBajoAdmin(admin.ModelAdmin):
+    list_display = ('id_producto', 'stock', 'stock_minimo', 'fecha_alerta', 'fecha_envio')
+    date_hierarchy = 'fecha_alerta'
+    raw_id_fields = ('id_producto',)
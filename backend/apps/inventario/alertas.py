@@ -0,0 +1,89 @@
+# apps/inventario/alertas.py
+"""
+Alertas de stock bajo por lotes.
+
+En lugar de revisar el stock en cada movimiento, los caminos que cambian
+stock comparan el valor anterior y el nuevo con el mínimo (que ya tienen
+a mano) y solo cuando el producto cruza el umbral insertan una
+AlertaStockBajo. El comando enviar_alertas_stock, ejecutado cada cierto
+intervalo, agrupa las pendientes en un solo correo a los administradores.
+"""
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import AlertaStockBajo, Producto
+
+
+def cruza_minimo(anterior, nuevo, stock_minimo, minimo_anterior=None):
+    """
+    True si el producto pasa de estar por encima del mínimo a estar en o
+    por debajo de él.
+    """
+    if minimo_anterior is None:
+        minimo_anterior = stock_minimo
+    return anterior > minimo_anterior and nuevo <= stock_minimo
+
+
+def registrar_alertas(cruces):
+    """
+    Encola {id_producto: (stock, stock_minimo)}. Si el producto ya tiene
+    una alerta pendiente se conserva esa (restricción única parcial).
+    """
+    if cruces:
+        AlertaStockBajo.objects.bulk_create([
+            AlertaStockBajo(id_producto_id=id_producto, stock=stock, stock_minimo=stock_minimo)
+            for id_producto, (stock, stock_minimo) in cruces.items()
+        ], ignore_conflicts=True)
+
+
+def destinatarios_alertas():
+    from apps.usuarios.models import Usuario
+
+    return list(getattr(settings, 'INVENTARIO_DESTINATARIOS_ALERTAS', None) or Usuario.objects.filter(
+        tipo_usuario='administrador', is_active=True
+    ).values_list('email', flat=True))
+
+
+def componer_resumen(productos):
+    lineas = [f'{len(productos)} productos llegaron a su stock mínimo:', '']
+    lineas += [
+        f'- {nombre} ({codigo_barras or "sin código"}): stock {stock}, mínimo {stock_minimo}'
+        for _, codigo_barras, nombre, stock, stock_minimo in productos
+    ]
+    return '\n'.join(lineas)
+
+
+@transaction.atomic
+def enviar_resumen_alertas(destinatarios):
+    """
+    Envía a `destinatarios` un correo con las alertas pendientes cuyo
+    producto sigue con stock bajo y marca todas las pendientes como
+    enviadas (las que ya se repusieron se descartan). Si el envío falla,
+    la transacción se revierte y quedan pendientes para el siguiente
+    intervalo. Devuelve (alertas atendidas, productos en el correo).
+    """
+    pendientes = AlertaStockBajo.objects.select_for_update().filter(fecha_envio__isnull=True)
+    ids_alertas = list(pendientes.values_list('id_alerta', flat=True))
+    if not ids_alertas:
+        return 0, 0
+
+    # Se informa el stock actual: pudo seguir bajando desde el cruce
+    productos = list(Producto.objects.filter(
+        alertas_stock__id_alerta__in=ids_alertas,
+        stock__lte=F('stock_minimo')
+    ).order_by('stock', 'nombre').values_list(
+        'id_producto', 'codigo_barras', 'nombre', 'stock', 'stock_minimo'
+    ))
+    if productos:
+        send_mail(
+            f'Stock bajo: {len(productos)} productos',
+            componer_resumen(productos),
+            None,
+            destinatarios
+        )
+
+    AlertaStockBajo.objects.filter(id_alerta__in=ids_alertas).update(fecha_envio=timezone.now())
+    return len(ids_alertas), len(productos)
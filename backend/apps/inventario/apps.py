@@ -3,4 +3,9 @@ from django.apps import AppConfig
 class InventarioConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.inventario'
-    verbose_name = 'Inventario'
\ No newline at end of file
+    verbose_name = 'Inventario'
+
+    def ready(self):
+        # Invalidación de cachés y alertas por edición directa de productos;
+        # no hay receptores por movimiento de inventario (ver alertas.py)
+        from . import signals
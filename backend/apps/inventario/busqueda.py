@@ -0,0 +1,151 @@
+# apps/inventario/busqueda.py
+"""
+Búsqueda de productos por nombre y código de barras.
+
+- PostgreSQL: índices GIN con gin_trgm_ops (extensión pg_trgm) sobre
+  nombre y codigo_barras. El filtro usa ILIKE y el operador %> de
+  similitud por palabra, ambos servidos por el índice, y el orden es
+  por word_similarity, así que tolera errores de escritura.
+- SQLite (desarrollo): tabla FTS5 con tokenizador trigram mantenida por
+  triggers. Los candidatos se buscan con un OR de los trigramas del
+  término, ordenados por bm25, y se descartan los que comparten menos
+  de SIMILITUD_MINIMA de los trigramas.
+- Otros motores o SQLite sin FTS5: icontains, sin índice.
+
+Ambas tablas/índices se crean en la migración 0004_busqueda_productos.
+"""
+from django.db import connection
+from django.db.models import Case, F, FloatField, Q, Value, When
+
+from .models import Producto
+
+TABLA_FTS = 'Producto_busqueda'
+MAX_RESULTADOS = 50
+SIMILITUD_MINIMA = 0.5
+_CANDIDATOS_FTS = 500
+
+_fts_disponible = None
+
+
+def trigramas(texto):
+    texto = texto.lower()
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def _filtro_simple(termino):
+    return Q(nombre__icontains=termino) | Q(codigo_barras__icontains=termino)
+
+
+def _buscar_postgresql(queryset, termino):
+    from django.contrib.postgres.lookups import TrigramWordSimilar
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    return queryset.filter(
+        _filtro_simple(termino) | TrigramWordSimilar(F('nombre'), Value(termino))
+    ).annotate(
+        relevancia=Case(
+            When(codigo_barras=termino, then=Value(2.0)),
+            When(codigo_barras__startswith=termino, then=Value(1.5)),
+            default=TrigramWordSimilarity(Value(termino), F('nombre')),
+            output_field=FloatField()
+        )
+    ).order_by('-relevancia', 'id_producto')
+
+
+def _hay_fts():
+    global _fts_disponible
+    if _fts_disponible is None:
+        _fts_disponible = TABLA_FTS in connection.introspection.table_names()
+    return _fts_disponible
+
+
+def _frase_fts(texto):
+    return '"{}"'.format(texto.replace('"', '""'))
+
+
+def _candidatos_fts(consulta, por_rango):
+    # Sin ORDER BY el LIMIT corta en cuanto hay suficientes coincidencias;
+    # bm25 solo hace falta para elegir entre coincidencias parciales
+    orden = 'ORDER BY rank ' if por_rango else ''
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid, nombre, codigo_barras FROM "{TABLA_FTS}" '
+            f'WHERE "{TABLA_FTS}" MATCH %s {orden}LIMIT %s',
+            [consulta, _CANDIDATOS_FTS]
+        )
+        return cursor.fetchall()
+
+
+def _ids_sqlite(termino):
+    """
+    Devuelve los id_producto ordenados por relevancia usando la tabla FTS5.
+    Primero busca el término como subcadena (todos sus trigramas); solo si
+    no alcanza para una página completa prueba con cualquiera de sus
+    trigramas, que es lo que tolera errores de escritura.
+    """
+    buscados = trigramas(termino)
+    candidatos = _candidatos_fts(_frase_fts(termino), por_rango=False)
+    if len(candidatos) < MAX_RESULTADOS:
+        vistos = {fila[0] for fila in candidatos}
+        candidatos += [
+            fila for fila in _candidatos_fts(
+                ' OR '.join(_frase_fts(t) for t in sorted(buscados)), por_rango=True
+            )
+            if fila[0] not in vistos
+        ]
+
+    minusculas = termino.lower()
+    puntuados = []
+    for posicion, (id_producto, nombre, codigo) in enumerate(candidatos):
+        # Igual que en PostgreSQL: el código de barras solo coincide como
+        # subcadena; la tolerancia a errores se aplica al nombre
+        codigo = (codigo or '').lower()
+        if codigo == minusculas:
+            similitud = 2.0
+        elif codigo.startswith(minusculas):
+            similitud = 1.5
+        elif minusculas in codigo or minusculas in (nombre or '').lower():
+            similitud = 1.0
+        else:
+            similitud = len(buscados & trigramas(nombre or '')) / len(buscados)
+        if similitud >= SIMILITUD_MINIMA:
+            # A igual similitud, los nombres más cortos se parecen más
+            puntuados.append((-similitud, len(nombre or ''), posicion, id_producto))
+    puntuados.sort()
+    return [fila[-1] for fila in puntuados[:MAX_RESULTADOS]]
+
+
+def _buscar_sqlite(queryset, termino):
+    ids = _ids_sqlite(termino)
+    if not ids:
+        return queryset.none()
+    return queryset.filter(id_producto__in=ids).annotate(
+        relevancia=Case(
+            *[When(id_producto=id_producto, then=Value(-posicion)) for posicion, id_producto in enumerate(ids)],
+            output_field=FloatField()
+        )
+    ).order_by('-relevancia')
+
+
+def buscar_productos(termino, queryset=None):
+    """
+    Filtra `queryset` (Producto.objects.all() por defecto) por el término y
+    lo ordena por relevancia. Un order_by posterior perdería ese orden,
+    por eso la vista entrega los resultados como una sola página.
+    """
+    if queryset is None:
+        queryset = Producto.objects.all()
+    termino = termino.strip()
+    if not termino:
+        return queryset
+
+    # Un código de barras completo se resuelve con el índice único
+    exacto = queryset.filter(codigo_barras=termino)
+    if exacto.exists():
+        return exacto
+
+    if connection.vendor == 'postgresql':
+        return _buscar_postgresql(queryset, termino)
+    if connection.vendor == 'sqlite' and len(termino) >= 3 and _hay_fts():
+        return _buscar_sqlite(queryset, termino)
+    return queryset.filter(_filtro_simple(termino)).order_by('id_producto')
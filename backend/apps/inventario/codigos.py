@@ -0,0 +1,128 @@
+# apps/inventario/codigos.py
+"""
+Búsqueda por código de barras para el punto de venta.
+
+Las respuestas se guardan en un LRU acotado dentro de cada proceso. Cada
+entrada recuerda la versión del producto (utils.obtener_versiones con el
+nombre 'producto_<id>') con la que se construyó; ajustar_stock_lote,
+fijar_stock y las señales de Producto incrementan esa versión al
+confirmar, así que un acierto solo cuesta el diccionario en memoria y una
+lectura de la versión en la caché compartida. TTL_ENTRADA acota además la
+vida de cada entrada por si la caché configurada no es compartida entre
+procesos (LocMemCache).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from .models import Producto
+from .utils import obtener_versiones
+
+CAPACIDAD = 5000
+TTL_ENTRADA = 60
+CAMPOS = ('id_producto', 'nombre', 'precio', 'stock', 'estado')
+
+
+def nombre_version_producto(id_producto):
+    return f'producto_{id_producto}'
+
+
+class CacheLRU:
+    """
+    LRU con capacidad fija, seguro entre hilos, con contadores de aciertos
+    y fallos.
+    """
+
+    def __init__(self, capacidad):
+        self.capacidad = capacidad
+        self._datos = OrderedDict()
+        self._candado = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave):
+        with self._candado:
+            valor = self._datos.get(clave)
+            if valor is not None:
+                self._datos.move_to_end(clave)
+            return valor
+
+    def guardar(self, clave, valor):
+        with self._candado:
+            self._datos[clave] = valor
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+
+    def contar(self, acierto):
+        with self._candado:
+            if acierto:
+                self.aciertos += 1
+            else:
+                self.fallos += 1
+
+    def eliminar(self, clave):
+        with self._candado:
+            self._datos.pop(clave, None)
+
+    def limpiar(self):
+        with self._candado:
+            self._datos.clear()
+            self.aciertos = self.fallos = 0
+
+    def estadisticas(self):
+        with self._candado:
+            return {
+                'entradas': len(self._datos),
+                'capacidad': self.capacidad,
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+            }
+
+
+cache_codigos = CacheLRU(CAPACIDAD)
+
+
+def _representar(fila):
+    return {
+        'id_producto': fila['id_producto'],
+        'nombre': fila['nombre'],
+        'precio': str(fila['precio']),
+        'stock': fila['stock'],
+        'estado': fila['estado'],
+    }
+
+
+def buscar_por_codigo(codigo_barras):
+    """
+    Devuelve {id_producto, nombre, precio, stock, estado} del producto con
+    ese código de barras exacto, o None si no existe.
+    """
+    entrada = cache_codigos.obtener(codigo_barras)
+    if entrada is not None:
+        id_producto, version, caduca, datos = entrada
+        nombre = nombre_version_producto(id_producto)
+        if caduca > time.monotonic() and obtener_versiones(nombre)[nombre] == version:
+            cache_codigos.contar(acierto=True)
+            return datos
+        cache_codigos.eliminar(codigo_barras)
+
+    cache_codigos.contar(acierto=False)
+    productos = Producto.objects.filter(codigo_barras=codigo_barras).values(*CAMPOS)
+    id_producto = productos.values_list('id_producto', flat=True).first()
+    if id_producto is None:
+        return None
+
+    # La versión se lee antes que la fila que se guarda: si el producto
+    # cambia entre ambas lecturas la entrada nace obsoleta y no se reutiliza
+    nombre = nombre_version_producto(id_producto)
+    version = obtener_versiones(nombre)[nombre]
+    fila = productos.filter(pk=id_producto).first()
+    if fila is None:
+        return None
+    datos = _representar(fila)
+    cache_codigos.guardar(
+        codigo_barras,
+        (fila['id_producto'], version, time.monotonic() + TTL_ENTRADA, datos)
+    )
+    return datos
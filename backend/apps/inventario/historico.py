@@ -0,0 +1,125 @@
+# apps/inventario/historico.py
+"""
+Stock de los productos en un instante pasado.
+
+registrar_corte() guarda el stock de todos los productos en CorteStock
+(una sola sentencia INSERT ... SELECT, pensada para ejecutarse cada
+noche con el comando registrar_corte_stock). stock_al(momento) parte del
+corte más reciente anterior a `momento` y solo repasa los movimientos
+entre ese corte y `momento`, recorriendo el índice
+(fecha_movimiento, id_movimiento): el costo depende de los movimientos
+desde el último corte y no del historial completo.
+
+Cada movimiento guarda stock_nuevo, así que no se suman cantidades: el
+stock de un producto es el stock_nuevo de su último movimiento o, si no
+tuvo movimientos desde el corte, el valor del corte.
+"""
+from datetime import datetime, time
+
+from django.db import connection, transaction
+from django.db.models import F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import CorteStock, MovimientoInventario, Producto
+
+TAMANO_BLOQUE = 5000
+
+
+def interpretar_momento(valor):
+    """
+    Acepta AAAA-MM-DD (se toma el final de ese día) o una fecha y hora
+    ISO 8601. Devuelve un datetime con zona horaria o None si no es válido.
+    """
+    try:
+        momento = parse_datetime(valor)
+        if momento is None:
+            fecha = parse_date(valor)
+            if fecha is None:
+                return None
+            momento = datetime.combine(fecha, time.max)
+    except ValueError:
+        return None
+    if timezone.is_naive(momento):
+        momento = timezone.make_aware(momento)
+    return momento
+
+
+@transaction.atomic
+def registrar_corte(momento=None):
+    """
+    Copia el stock actual de todos los productos a CorteStock con
+    fecha_corte = momento (ahora por defecto). Devuelve (momento, filas).
+    """
+    momento = momento or timezone.now()
+    qn = connection.ops.quote_name
+    sql = (
+        f'INSERT INTO {qn(CorteStock._meta.db_table)} '
+        f'({qn(CorteStock._meta.get_field("fecha_corte").column)}, '
+        f'{qn(CorteStock._meta.get_field("id_producto").column)}, '
+        f'{qn(CorteStock._meta.get_field("stock").column)}) '
+        f'SELECT %s, {qn(Producto._meta.pk.column)}, '
+        f'{qn(Producto._meta.get_field("stock").column)} '
+        f'FROM {qn(Producto._meta.db_table)}'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [connection.ops.adapt_datetimefield_value(momento)])
+        filas = cursor.rowcount
+    return momento, filas
+
+
+def ultimo_corte(momento):
+    """
+    fecha_corte del corte más reciente anterior o igual a momento, o None.
+    """
+    return CorteStock.objects.filter(
+        fecha_corte__lte=momento
+    ).aggregate(ultimo=Max('fecha_corte'))['ultimo']
+
+
+def stock_al(momento, ids=None):
+    """
+    Devuelve {id_producto: stock} al instante `momento` para los
+    productos creados hasta entonces (o solo para `ids`).
+
+    Los productos creados después del corte que no tuvieron movimientos
+    hasta `momento` toman el stock_anterior de su primer movimiento
+    posterior o, si no tienen ninguno, su stock actual.
+    """
+    fecha_corte = ultimo_corte(momento)
+
+    cortes = CorteStock.objects.filter(fecha_corte=fecha_corte)
+    movimientos = MovimientoInventario.objects.filter(fecha_movimiento__lte=momento)
+    sin_corte = Producto.objects.filter(fecha_creacion__lte=momento)
+    if ids is not None:
+        cortes = cortes.filter(id_producto__in=ids)
+        movimientos = movimientos.filter(id_producto__in=ids)
+        sin_corte = sin_corte.filter(id_producto__in=ids)
+
+    stock = {}
+    if fecha_corte is not None:
+        stock.update(
+            cortes.values_list('id_producto_id', 'stock').iterator(chunk_size=TAMANO_BLOQUE)
+        )
+        movimientos = movimientos.filter(fecha_movimiento__gt=fecha_corte)
+        sin_corte = sin_corte.filter(fecha_creacion__gt=fecha_corte)
+
+    # En orden cronológico el último stock_nuevo de cada producto prevalece
+    stock.update(
+        movimientos.order_by('fecha_movimiento', 'id_movimiento').values_list(
+            'id_producto_id', 'stock_nuevo'
+        ).iterator(chunk_size=TAMANO_BLOQUE)
+    )
+
+    primer_posterior = MovimientoInventario.objects.filter(
+        id_producto=OuterRef('pk'),
+        fecha_movimiento__gt=momento
+    ).order_by('fecha_movimiento', 'id_movimiento').values('stock_anterior')[:1]
+    pendientes = sin_corte.annotate(
+        stock_historico=Coalesce(Subquery(primer_posterior), F('stock'))
+    ).values_list('id_producto', 'stock_historico')
+    for id_producto, valor in pendientes.iterator(chunk_size=TAMANO_BLOQUE):
+        stock.setdefault(id_producto, valor)
+
+    return stock
@@ -0,0 +1,121 @@
+# apps/inventario/kardex.py
+"""
+Kardex de un producto: sus movimientos en orden cronológico con entradas,
+salidas, saldo acumulado y valorización.
+
+El saldo se calcula en la base de datos con una suma acumulada
+(SUM(...) OVER (ORDER BY fecha_movimiento, id_movimiento)) de la
+diferencia stock_nuevo - stock_anterior de cada movimiento, partiendo del
+stock_anterior del primer movimiento. Los ajustes cuentan como entrada o
+salida por esa diferencia. Si el stock se cambió fuera de los movimientos
+(p. ej. editando el producto) el saldo deja de coincidir con stock_nuevo,
+que se incluye para que la auditoría vea el descuadre.
+
+La valorización usa el precio actual del producto: los movimientos no
+guardan costo unitario.
+"""
+from django.core import signing
+from django.db.models import Case, F, IntegerField, Sum, Value, When, Window
+from django.db.models.expressions import RowRange
+from rest_framework.exceptions import NotFound
+
+from myproject.pagination import KeysetPagination
+
+ORDEN_KARDEX = ('fecha_movimiento', 'id_movimiento')
+
+COLUMNAS_KARDEX = (
+    'id_movimiento', 'fecha_movimiento', 'tipo_movimiento', 'numero_documento',
+    'entrada', 'salida', 'saldo', 'stock_nuevo', 'valor_saldo',
+)
+
+
+def saldo_apertura(movimientos):
+    """
+    Stock previo al primer movimiento del queryset (0 si no hay ninguno).
+    """
+    return movimientos.order_by(*ORDEN_KARDEX).values_list(
+        'stock_anterior', flat=True
+    ).first() or 0
+
+
+def anotar_kardex(movimientos, saldo_inicial):
+    """
+    Agrega entrada, salida y saldo (suma acumulada desde saldo_inicial)
+    y devuelve los valores en el orden del kardex. El saldo solo cubre
+    las filas que deja pasar el WHERE: para continuar desde un cursor se
+    pasa como saldo_inicial el saldo de la última fila ya leída.
+    """
+    diferencia = F('stock_nuevo') - F('stock_anterior')
+    return movimientos.annotate(
+        entrada=Case(When(stock_nuevo__gt=F('stock_anterior'), then=diferencia), default=Value(0)),
+        salida=Case(When(stock_nuevo__lt=F('stock_anterior'), then=-diferencia), default=Value(0)),
+        saldo=Value(saldo_inicial) + Window(
+            Sum(diferencia),
+            order_by=[F(campo).asc() for campo in ORDEN_KARDEX],
+            frame=RowRange(start=None, end=0),
+            output_field=IntegerField()
+        ),
+    ).order_by(*ORDEN_KARDEX).values(*COLUMNAS_KARDEX[:-1])
+
+
+def iterar_kardex(movimientos, precio, tamano_bloque):
+    """
+    Filas completas del kardex como tuplas en el orden de COLUMNAS_KARDEX,
+    leídas por bloques en una sola consulta, para exportar en streaming.
+    """
+    filas = anotar_kardex(movimientos, saldo_apertura(movimientos)).values_list(
+        *COLUMNAS_KARDEX[:-1]
+    )
+    for fila in filas.iterator(chunk_size=tamano_bloque):
+        yield fila + (fila[6] * precio,)
+
+
+class KardexPagination(KeysetPagination):
+    """
+    Paginación por cursor del kardex. El cursor guarda, además de
+    (fecha_movimiento, id_movimiento), el saldo de la última fila: cada
+    página solo recorre y suma sus propios movimientos en lugar de
+    recalcular el saldo desde el primero.
+
+    Como el saldo viaja en el cursor, este va firmado (django.core.signing)
+    con una sal que incluye la ruta del producto: un cursor editado o
+    tomado del kardex de otro producto se rechaza.
+    """
+    campo_saldo = ('saldo', False, IntegerField())
+
+    def _sal(self):
+        return f'inventario.kardex:{self.request.path}'
+
+    def encode_cursor(self, fila, campos):
+        return signing.dumps(super().encode_cursor(fila, campos), salt=self._sal())
+
+    def leer_cursor(self, codificado, campos):
+        try:
+            codificado = signing.loads(codificado, salt=self._sal())
+        except signing.BadSignature:
+            raise NotFound(self.invalid_cursor_message)
+        return super().leer_cursor(codificado, campos)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size_actual = self.get_page_size(request)
+        campos = self._campos(queryset, ORDEN_KARDEX)
+
+        valores = self.decode_cursor(request, campos + [self.campo_saldo])
+        if valores is None:
+            saldo = saldo_apertura(queryset)
+        else:
+            queryset = queryset.filter(self._filtro_keyset(campos, valores[:-1]))
+            saldo = valores[-1]
+
+        # La página se acota antes de la ventana: así la suma acumulada
+        # cubre solo sus filas aunque el motor no detenga la ventana en el LIMIT
+        pagina = queryset.order_by(*ORDEN_KARDEX).values('pk')[:self.page_size_actual + 1]
+        filas = list(anotar_kardex(queryset.model.objects.filter(pk__in=pagina), saldo))
+        self.hay_siguiente = len(filas) > self.page_size_actual
+        filas = filas[:self.page_size_actual]
+        self.siguiente_cursor = (
+            self.encode_cursor(filas[-1], campos + [self.campo_saldo])
+            if self.hay_siguiente else None
+        )
+        return filas
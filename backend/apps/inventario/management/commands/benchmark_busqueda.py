@@ -0,0 +1,90 @@
+# apps/inventario/management/commands/benchmark_busqueda.py
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.inventario.busqueda import buscar_productos
+from apps.inventario.models import Producto
+
+
+class _Rollback(Exception):
+    pass
+
+
+PALABRAS = [
+    'leche', 'pan', 'galletas', 'chocolate', 'arroz', 'frijol', 'aceite',
+    'azucar', 'cafe', 'refresco', 'jabon', 'detergente', 'atun', 'sopa',
+    'queso', 'yogur', 'cereal', 'harina', 'sal', 'salsa', 'tortilla',
+    'huevo', 'jamon', 'mantequilla', 'papel', 'agua', 'jugo', 'galleta',
+]
+MARCAS = ['lala', 'bimbo', 'gamesa', 'nestle', 'herdez', 'sabritas', 'kelloggs', 'zote']
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide la latencia de buscar_productos con un catálogo sintético. '
+        'Los productos se crean dentro de una transacción que se revierte.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--productos', type=int, default=100000)
+        parser.add_argument('--consultas', type=int, default=200)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Motor: {connection.vendor}')
+        try:
+            with transaction.atomic():
+                self._ejecutar(options['productos'], options['consultas'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _ejecutar(self, total, num_consultas):
+        aleatorio = random.Random(42)
+        inicio = time.perf_counter()
+        for desde in range(0, total, 10000):
+            Producto.objects.bulk_create([
+                Producto(
+                    codigo_barras=f'BUSQ{i:09d}',
+                    nombre=' '.join([
+                        aleatorio.choice(PALABRAS), aleatorio.choice(MARCAS),
+                        f'{aleatorio.randint(1, 2000)}g'
+                    ]),
+                    descripcion='',
+                    precio=Decimal('10.00'),
+                    stock=10
+                )
+                for i in range(desde, min(desde + 10000, total))
+            ])
+        self.stdout.write(f'{total} productos creados en {time.perf_counter() - inicio:.1f} s')
+
+        terminos = {
+            'palabra': [aleatorio.choice(PALABRAS) + ' ' + aleatorio.choice(MARCAS) for _ in range(num_consultas)],
+            'con error': [self._con_error(aleatorio, aleatorio.choice(PALABRAS + MARCAS)) for _ in range(num_consultas)],
+            'código': [f'BUSQ{aleatorio.randrange(total):09d}' for _ in range(num_consultas)],
+        }
+        self.stdout.write(f'{"consulta":<10} {"media ms":>10} {"p95 ms":>10} {"resultados":>11}')
+        for nombre, lista in terminos.items():
+            tiempos = []
+            resultados = 0
+            for termino in lista:
+                arranque = time.perf_counter()
+                resultados += len(list(
+                    buscar_productos(termino).values_list('id_producto', flat=True)[:50]
+                ))
+                tiempos.append((time.perf_counter() - arranque) * 1000)
+            tiempos.sort()
+            p95 = tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))]
+            self.stdout.write(
+                f'{nombre:<10} {sum(tiempos) / len(tiempos):>10.2f} {p95:>10.2f} '
+                f'{resultados / len(lista):>11.1f}'
+            )
+
+    def _con_error(self, aleatorio, palabra):
+        if len(palabra) < 4:
+            return palabra
+        i = aleatorio.randrange(1, len(palabra) - 1)
+        return palabra[:i] + palabra[i + 1] + palabra[i] + palabra[i + 2:]
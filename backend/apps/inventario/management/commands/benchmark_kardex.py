@@ -0,0 +1,110 @@
+# apps/inventario/management/commands/benchmark_kardex.py
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.inventario.kardex import ORDEN_KARDEX, KardexPagination
+from apps.inventario.models import MovimientoInventario, Producto
+from apps.inventario.views import ProductoViewSet
+from apps.usuarios.models import Usuario
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el kardex de un producto con muchos movimientos: primera '
+        'página, página al final del historial y exportación completa. '
+        'Los datos se crean dentro de una transacción que se revierte.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--movimientos', type=int, default=200000)
+        parser.add_argument('--limite', type=int, default=100)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Motor: {connection.vendor}')
+        try:
+            with transaction.atomic():
+                self._ejecutar(options['movimientos'], options['limite'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _ejecutar(self, total, limite):
+        aleatorio = random.Random(42)
+        usuario = Usuario.objects.create_user(
+            email='benchmark_kardex@example.com',
+            password='benchmark',
+            nombre_usuario='benchmark_kardex',
+            tipo_usuario='administrador'
+        )
+        producto = Producto.objects.create(
+            codigo_barras='KARDEX000001', nombre='Producto kardex',
+            descripcion='', precio=Decimal('12.50'), stock=0
+        )
+
+        inicio = timezone.now() - timedelta(seconds=total)
+        stock = 0
+        movimientos = []
+        for i in range(total):
+            cantidad = aleatorio.randint(1, 5)
+            salida = stock >= cantidad and aleatorio.random() < 0.5
+            nuevo = stock - cantidad if salida else stock + cantidad
+            movimientos.append(MovimientoInventario(
+                id_producto_id=producto.pk, id_usuario_id=usuario.pk,
+                tipo_movimiento=MovimientoInventario.SALIDA if salida else MovimientoInventario.ENTRADA,
+                cantidad=cantidad, stock_anterior=stock, stock_nuevo=nuevo,
+                fecha_movimiento=inicio + timedelta(seconds=i), descripcion=''
+            ))
+            stock = nuevo
+        MovimientoInventario.objects.bulk_create(movimientos, batch_size=10000)
+        Producto.objects.filter(pk=producto.pk).update(stock=stock)
+        self.stdout.write(f'{total} movimientos creados')
+
+        vista = ProductoViewSet.as_view({'get': 'kardex'})
+        fabrica = APIRequestFactory()
+
+        def pedir(**parametros):
+            peticion = fabrica.get(
+                f'/api/inventario/productos/{producto.pk}/kardex/',
+                {'limite': limite, **parametros}, HTTP_HOST='localhost'
+            )
+            force_authenticate(peticion, user=usuario)
+            arranque = time.perf_counter()
+            respuesta = vista(peticion, pk=producto.pk)
+            if parametros.get('formato'):
+                lineas = sum(1 for _ in respuesta.streaming_content)
+            else:
+                lineas = len(respuesta.data['results'])
+            return respuesta, lineas, time.perf_counter() - arranque
+
+        pedir()  # calentamiento: la primera petición carga la vista y el serializador
+        self.stdout.write(f'{"petición":<20} {"filas":>10} {"ms":>10}')
+        respuesta, filas, duracion = pedir()
+        self.stdout.write(f'{"primera página":<20} {filas:>10} {duracion * 1000:>10.1f}')
+
+        # Cursor hacia la última página sin recorrer las anteriores
+        paginador = KardexPagination()
+        anterior = MovimientoInventario.objects.filter(id_producto=producto.pk).order_by(
+            '-fecha_movimiento', '-id_movimiento'
+        ).values('fecha_movimiento', 'id_movimiento', saldo=F('stock_nuevo'))[limite]
+        cursor = paginador.encode_cursor(
+            anterior,
+            paginador._campos(MovimientoInventario.objects.all(), ORDEN_KARDEX) + [paginador.campo_saldo]
+        )
+        respuesta, filas, duracion = pedir(cursor=cursor)
+        assert respuesta.data['results'][-1]['saldo'] == stock
+        self.stdout.write(f'{"última página":<20} {filas:>10} {duracion * 1000:>10.1f}')
+
+        respuesta, filas, duracion = pedir(formato='csv')
+        self.stdout.write(f'{"exportación csv":<20} {filas:>10} {duracion * 1000:>10.1f}')
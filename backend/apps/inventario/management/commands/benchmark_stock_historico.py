@@ -0,0 +1,124 @@
+# apps/inventario/management/commands/benchmark_stock_historico.py
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.inventario.historico import stock_al
+from apps.inventario.models import CorteStock, MovimientoInventario, Producto
+from apps.usuarios.models import Usuario
+
+
+class _Rollback(Exception):
+    pass
+
+
+DIAS = 90
+DIA_CORTE = 60
+DIA_CONSULTA = 75
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide stock_al sobre un historial sintético de movimientos, '
+        'repasando el historial completo y partiendo de un corte. Los '
+        'datos se crean dentro de una transacción que se revierte.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--productos', type=int, default=100000)
+        parser.add_argument('--movimientos', type=int, default=500000)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Motor: {connection.vendor}')
+        try:
+            with transaction.atomic():
+                self._ejecutar(options['productos'], options['movimientos'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _ejecutar(self, total_productos, total_movimientos):
+        aleatorio = random.Random(42)
+        inicio = timezone.now() - timedelta(days=DIAS + 1)
+        usuario = Usuario.objects.create_user(
+            email='benchmark_historico@example.com',
+            password='benchmark',
+            nombre_usuario='benchmark_historico',
+            tipo_usuario='administrador'
+        )
+
+        arranque = time.perf_counter()
+        ids = []
+        for desde in range(0, total_productos, 10000):
+            ids += [producto.pk for producto in Producto.objects.bulk_create([
+                Producto(
+                    codigo_barras=f'HIST{i:09d}', nombre=f'Producto {i}',
+                    descripcion='', precio=Decimal('10.00'), stock=100
+                )
+                for i in range(desde, min(desde + 10000, total_productos))
+            ])]
+        if not all(ids):
+            ids = list(Producto.objects.filter(
+                codigo_barras__startswith='HIST'
+            ).order_by('id_producto').values_list('id_producto', flat=True))
+        Producto.objects.filter(id_producto__in=ids).update(fecha_creacion=inicio)
+
+        # Paseo aleatorio por producto; se guarda el stock al día del corte
+        segundos = DIAS * 86400
+        instantes = sorted(aleatorio.randrange(segundos) for _ in range(total_movimientos))
+        stock = dict.fromkeys(ids, 100)
+        al_corte = None
+        movimientos = []
+        for segundo in instantes:
+            if al_corte is None and segundo > DIA_CORTE * 86400:
+                al_corte = dict(stock)
+            id_producto = aleatorio.choice(ids)
+            cantidad = aleatorio.randint(1, 5)
+            salida = stock[id_producto] >= cantidad and aleatorio.random() < 0.6
+            nuevo = stock[id_producto] + (-cantidad if salida else cantidad)
+            movimientos.append(MovimientoInventario(
+                id_producto_id=id_producto, id_usuario_id=usuario.pk,
+                tipo_movimiento=MovimientoInventario.SALIDA if salida else MovimientoInventario.ENTRADA,
+                cantidad=cantidad, stock_anterior=stock[id_producto], stock_nuevo=nuevo,
+                fecha_movimiento=inicio + timedelta(seconds=segundo), descripcion=''
+            ))
+            stock[id_producto] = nuevo
+        MovimientoInventario.objects.bulk_create(movimientos, batch_size=10000)
+        Producto.objects.bulk_update(
+            [Producto(id_producto=id_producto, stock=valor) for id_producto, valor in stock.items()],
+            ['stock'], batch_size=10000
+        )
+        self.stdout.write(
+            f'{total_productos} productos y {total_movimientos} movimientos creados '
+            f'en {time.perf_counter() - arranque:.1f} s'
+        )
+
+        consulta = inicio + timedelta(days=DIA_CONSULTA)
+        arranque = time.perf_counter()
+        completo = stock_al(consulta)
+        duracion_completo = time.perf_counter() - arranque
+
+        CorteStock.objects.bulk_create([
+            CorteStock(fecha_corte=inicio + timedelta(days=DIA_CORTE), id_producto_id=id_producto, stock=valor)
+            for id_producto, valor in (al_corte or stock).items()
+        ], batch_size=10000)
+        arranque = time.perf_counter()
+        desde_corte = stock_al(consulta)
+        duracion_corte = time.perf_counter() - arranque
+
+        assert completo == desde_corte, 'stock_al difiere con y sin corte'
+        self.stdout.write(f'{"origen":<16} {"movimientos":>12} {"segundos":>10}')
+        self.stdout.write(
+            f'{"sin corte":<16} {sum(1 for s in instantes if s <= DIA_CONSULTA * 86400):>12} '
+            f'{duracion_completo:>10.2f}'
+        )
+        self.stdout.write(
+            f'{"corte día " + str(DIA_CORTE):<16} '
+            f'{sum(1 for s in instantes if DIA_CORTE * 86400 < s <= DIA_CONSULTA * 86400):>12} '
+            f'{duracion_corte:>10.2f}'
+        )
@@ -0,0 +1,84 @@
+# apps/inventario/management/commands/benchmark_valorizacion.py
+import random
+import time
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.inventario.models import Categoria, Producto
+from apps.inventario.valorizacion import (
+    calcular_detalle_categoria,
+    calcular_valorizacion,
+    obtener_valorizacion,
+)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara la valorización del inventario leyendo todos los productos '
+        'con la consulta agrupada de valorizacion.py y su versión cacheada. '
+        'Los productos se crean dentro de una transacción que se revierte.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--productos', type=int, default=500000)
+        parser.add_argument('--categorias', type=int, default=50)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Motor: {connection.vendor}')
+        try:
+            with transaction.atomic():
+                self._ejecutar(options['productos'], options['categorias'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _medir(self, nombre, funcion):
+        arranque = time.perf_counter()
+        resultado = funcion()
+        self.stdout.write(f'{nombre:<28} {(time.perf_counter() - arranque) * 1000:>10.1f}')
+        return resultado
+
+    def _ejecutar(self, total, num_categorias):
+        aleatorio = random.Random(42)
+        categorias = [
+            categoria.pk for categoria in Categoria.objects.bulk_create([
+                Categoria(nombre=f'Categoría {i}') for i in range(num_categorias)
+            ])
+        ]
+        if not all(categorias):
+            categorias = list(Categoria.objects.order_by('-id').values_list('id', flat=True)[:num_categorias])
+        for desde in range(0, total, 10000):
+            Producto.objects.bulk_create([
+                Producto(
+                    codigo_barras=f'VAL{i:09d}', nombre=f'Producto {i}', descripcion='',
+                    precio=Decimal(aleatorio.randint(100, 50000)) / 100,
+                    stock=aleatorio.randint(0, 200),
+                    categoria_id=aleatorio.choice(categorias),
+                    estado='activo' if aleatorio.random() < 0.9 else 'inactivo'
+                )
+                for i in range(desde, min(desde + 10000, total))
+            ])
+        self.stdout.write(f'{total} productos en {num_categorias} categorías creados')
+
+        def todos_los_productos():
+            # Lo que hacía el cliente: descargar cada producto y sumar
+            valor = Decimal('0.00')
+            for stock, precio in Producto.objects.values_list('stock', 'precio').iterator(chunk_size=2000):
+                valor += stock * precio
+            return valor
+
+        cache.clear()
+        self.stdout.write(f'{"cálculo":<28} {"ms":>10}')
+        esperado = self._medir('todos los productos', todos_los_productos)
+        reporte = self._medir('consulta agrupada', calcular_valorizacion)
+        assert reporte['total']['valor'] == esperado, (reporte['total']['valor'], esperado)
+        self._medir('detalle de una categoría', lambda: calcular_detalle_categoria(categorias[0], 50))
+        obtener_valorizacion()
+        self._medir('reporte cacheado', obtener_valorizacion)
@@ -0,0 +1,19 @@
+# apps/inventario/management/commands/depurar_eliminaciones_catalogo.py
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.inventario.models import EliminacionCatalogo
+from apps.inventario.sincronizacion import RETENCION_ELIMINACIONES
+
+
+class Command(BaseCommand):
+    help = (
+        'Borra los registros de EliminacionCatalogo más antiguos que la '
+        'retención de la sincronización; las terminales con un token más '
+        'viejo reciben el catálogo completo.'
+    )
+
+    def handle(self, *args, **options):
+        limite = timezone.now() - RETENCION_ELIMINACIONES
+        borrados, _ = EliminacionCatalogo.objects.filter(fecha_eliminacion__lt=limite).delete()
+        self.stdout.write(self.style.SUCCESS(f'{borrados} eliminaciones depuradas'))
@@ -0,0 +1,24 @@
+# apps/inventario/management/commands/enviar_alertas_stock.py
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.inventario.alertas import destinatarios_alertas, enviar_resumen_alertas
+
+
+class Command(BaseCommand):
+    help = (
+        'Envía un solo correo con los productos que cruzaron su stock mínimo '
+        'desde el envío anterior. Pensado para ejecutarse cada cierto '
+        'intervalo (cron); el intervalo define la frecuencia del resumen.'
+    )
+
+    def handle(self, *args, **options):
+        destinatarios = destinatarios_alertas()
+        if not destinatarios:
+            raise CommandError(
+                'No hay destinatarios: defina INVENTARIO_DESTINATARIOS_ALERTAS '
+                'o un administrador activo con email'
+            )
+        alertas, productos = enviar_resumen_alertas(destinatarios)
+        self.stdout.write(self.style.SUCCESS(
+            f'{alertas} alertas atendidas, {productos} productos en el resumen'
+        ))
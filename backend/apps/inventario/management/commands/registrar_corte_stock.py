@@ -0,0 +1,45 @@
+# apps/inventario/management/commands/registrar_corte_stock.py
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.inventario.historico import registrar_corte
+from apps.inventario.models import CorteStock
+
+
+class Command(BaseCommand):
+    help = (
+        'Guarda el stock actual de todos los productos en CorteStock. '
+        'Pensado para ejecutarse cada noche (cron); las consultas de stock '
+        'histórico parten del corte anterior más cercano.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias-retencion', type=int, default=None,
+            help='Borra los cortes más antiguos que estos días, salvo el último de cada mes'
+        )
+
+    def handle(self, *args, **options):
+        momento, filas = registrar_corte()
+        self.stdout.write(self.style.SUCCESS(f'Corte {momento.isoformat()}: {filas} productos'))
+
+        if options['dias_retencion'] is not None:
+            borrados = self._depurar(timezone.now() - timedelta(days=options['dias_retencion']))
+            self.stdout.write(self.style.SUCCESS(f'{borrados} filas de cortes antiguos depuradas'))
+
+    def _depurar(self, limite):
+        fechas = CorteStock.objects.filter(fecha_corte__lt=limite).order_by(
+            'fecha_corte'
+        ).values_list('fecha_corte', flat=True).distinct()
+
+        # Se conserva el último corte de cada mes para los cierres mensuales
+        ultimos = {}
+        for fecha in fechas:
+            local = timezone.localtime(fecha)
+            ultimos[(local.year, local.month)] = fecha
+        borrados, _ = CorteStock.objects.filter(fecha_corte__lt=limite).exclude(
+            fecha_corte__in=ultimos.values()
+        ).delete()
+        return borrados
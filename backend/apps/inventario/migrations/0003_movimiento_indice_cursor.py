@@ -0,0 +1,21 @@
+# Generated by Django 4.2.9 on 2026-10-18 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='movimientoinventario',
+            name='Movimiento__fecha_m_309951_idx',
+        ),
+        migrations.AddIndex(
+            model_name='movimientoinventario',
+            index=models.Index(fields=['fecha_movimiento', 'id_movimiento'], name='Movimiento__fecha_m_9e744e_idx'),
+        ),
+    ]
@@ -0,0 +1,81 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+SQL_POSTGRESQL = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS producto_nombre_trgm '
+    'ON "Producto" USING gin (nombre gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS producto_codigo_barras_trgm '
+    'ON "Producto" USING gin (codigo_barras gin_trgm_ops)',
+]
+
+REVERTIR_POSTGRESQL = [
+    'DROP INDEX IF EXISTS producto_codigo_barras_trgm',
+    'DROP INDEX IF EXISTS producto_nombre_trgm',
+]
+
+# Tabla FTS5 de contenido externo: solo guarda el índice de trigramas y
+# lee nombre/codigo_barras de "Producto". Los triggers la mantienen al día
+# y no se disparan con los cambios de stock.
+SQL_SQLITE = [
+    'CREATE VIRTUAL TABLE "Producto_busqueda" USING fts5('
+    'nombre, codigo_barras, content=\'Producto\', content_rowid=\'id_producto\', '
+    'tokenize=\'trigram\')',
+    'CREATE TRIGGER producto_busqueda_insertar AFTER INSERT ON "Producto" BEGIN '
+    'INSERT INTO "Producto_busqueda"(rowid, nombre, codigo_barras) '
+    'VALUES (new.id_producto, new.nombre, new.codigo_barras); END',
+    'CREATE TRIGGER producto_busqueda_eliminar AFTER DELETE ON "Producto" BEGIN '
+    'INSERT INTO "Producto_busqueda"("Producto_busqueda", rowid, nombre, codigo_barras) '
+    'VALUES (\'delete\', old.id_producto, old.nombre, old.codigo_barras); END',
+    'CREATE TRIGGER producto_busqueda_actualizar AFTER UPDATE OF nombre, codigo_barras '
+    'ON "Producto" BEGIN '
+    'INSERT INTO "Producto_busqueda"("Producto_busqueda", rowid, nombre, codigo_barras) '
+    'VALUES (\'delete\', old.id_producto, old.nombre, old.codigo_barras); '
+    'INSERT INTO "Producto_busqueda"(rowid, nombre, codigo_barras) '
+    'VALUES (new.id_producto, new.nombre, new.codigo_barras); END',
+    'INSERT INTO "Producto_busqueda"("Producto_busqueda") VALUES (\'rebuild\')',
+]
+
+REVERTIR_SQLITE = [
+    'DROP TRIGGER IF EXISTS producto_busqueda_actualizar',
+    'DROP TRIGGER IF EXISTS producto_busqueda_eliminar',
+    'DROP TRIGGER IF EXISTS producto_busqueda_insertar',
+    'DROP TABLE IF EXISTS "Producto_busqueda"',
+]
+
+
+def _ejecutar(schema_editor, sentencias):
+    for sql in sentencias:
+        schema_editor.execute(sql)
+
+
+def crear_indices_busqueda(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _ejecutar(schema_editor, SQL_POSTGRESQL)
+    elif vendor == 'sqlite':
+        try:
+            _ejecutar(schema_editor, SQL_SQLITE)
+        except OperationalError:
+            # SQLite sin FTS5 o anterior a 3.34 (sin tokenizador trigram):
+            # la búsqueda usa icontains
+            _ejecutar(schema_editor, REVERTIR_SQLITE)
+
+
+def eliminar_indices_busqueda(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _ejecutar(schema_editor, REVERTIR_POSTGRESQL)
+    elif vendor == 'sqlite':
+        _ejecutar(schema_editor, REVERTIR_SQLITE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0003_movimiento_indice_cursor'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices_busqueda, eliminar_indices_busqueda),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.9 on 2026-10-18 17:24
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0004_busqueda_productos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EliminacionCatalogo',
+            fields=[
+                ('id_eliminacion', models.AutoField(primary_key=True, serialize=False)),
+                ('modelo', models.CharField(choices=[('producto', 'Producto'), ('categoria', 'Categoría')], max_length=10)),
+                ('id_objeto', models.IntegerField()),
+                ('fecha_eliminacion', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Eliminación de Catálogo',
+                'verbose_name_plural': 'Eliminaciones de Catálogo',
+                'db_table': 'Eliminacion_Catalogo',
+            },
+        ),
+        migrations.AddField(
+            model_name='categoria',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['fecha_actualizacion'], name='Producto_fecha_a_8beaeb_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.9 on 2026-10-18 17:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0005_sincronizacion_catalogo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CorteStock',
+            fields=[
+                ('id_corte', models.BigAutoField(primary_key=True, serialize=False)),
+                ('fecha_corte', models.DateTimeField()),
+                ('stock', models.IntegerField()),
+                ('id_producto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cortes_stock', to='inventario.producto')),
+            ],
+            options={
+                'verbose_name': 'Corte de Stock',
+                'verbose_name_plural': 'Cortes de Stock',
+                'db_table': 'Corte_Stock',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='cortestock',
+            constraint=models.UniqueConstraint(fields=('fecha_corte', 'id_producto'), name='corte_stock_fecha_producto_unico'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.9 on 2026-10-18 17:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0006_cortes_stock'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='movimientoinventario',
+            index=models.Index(fields=['id_producto', 'fecha_movimiento', 'id_movimiento'], name='Movimiento__id_prod_ba0e0e_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.9 on 2026-10-18 17:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0007_indice_kardex'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['categoria', 'estado', 'stock', 'precio'], name='Producto_categor_254346_idx'),
+        ),
+    ]
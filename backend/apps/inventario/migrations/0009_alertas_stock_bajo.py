@@ -0,0 +1,43 @@
+# Generated by Django 4.2.9 on 2026-10-18 17:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0008_indice_valorizacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertaStockBajo',
+            fields=[
+                ('id_alerta', models.BigAutoField(primary_key=True, serialize=False)),
+                ('stock', models.IntegerField()),
+                ('stock_minimo', models.IntegerField()),
+                ('fecha_alerta', models.DateTimeField(default=django.utils.timezone.now)),
+                ('fecha_envio', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Alerta de Stock Bajo',
+                'verbose_name_plural': 'Alertas de Stock Bajo',
+                'db_table': 'Alerta_Stock_Bajo',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(condition=models.Q(('stock__lte', models.F('stock_minimo'))), fields=['estado', 'id_producto'], name='producto_stock_bajo_idx'),
+        ),
+        migrations.AddField(
+            model_name='alertastockbajo',
+            name='id_producto',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alertas_stock', to='inventario.producto'),
+        ),
+        migrations.AddConstraint(
+            model_name='alertastockbajo',
+            constraint=models.UniqueConstraint(condition=models.Q(('fecha_envio__isnull', True)), fields=('id_producto',), name='alerta_stock_pendiente_unica'),
+        ),
+    ]
@@ -1,5 +1,5 @@
 # apps/inventario/models.py
-from django.db import models
+from django.db import models, transaction
 from django.core.exceptions import ValidationError
 from decimal import Decimal
 from django.utils import timezone
@@ -7,6 +7,7 @@ from django.utils import timezone
 class Categoria(models.Model):
     nombre = models.CharField(max_length=100)
     descripcion = models.TextField(blank=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         db_table = 'Categoria'
@@ -40,6 +41,16 @@ class Producto(models.Model):
         if self.precio < Decimal('0.00'):
             raise ValidationError('El precio no puede ser negativo')
 
+    _original = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        valores = dict(zip(field_names, values))
+        if 'stock' in valores and 'stock_minimo' in valores:
+            instance._original = (valores['stock'], valores['stock_minimo'])
+        return instance
+
     def necesita_reposicion(self):
         return self.stock <= self.stock_minimo
 
@@ -48,6 +59,17 @@ class Producto(models.Model):
         indexes = [
             models.Index(fields=['codigo_barras']),
             models.Index(fields=['nombre']),
+            models.Index(fields=['fecha_actualizacion']),
+            # Valorización por categoría y estado (valorizacion.py): con
+            # stock y precio en el índice el agregado no lee la tabla
+            models.Index(fields=['categoria', 'estado', 'stock', 'precio']),
+            # Índice parcial: solo contiene los productos con stock bajo,
+            # así stock_bajo y el dashboard no recorren la tabla completa
+            models.Index(
+                fields=['estado', 'id_producto'],
+                condition=models.Q(stock__lte=models.F('stock_minimo')),
+                name='producto_stock_bajo_idx'
+            ),
         ]
 
 class MovimientoInventario(models.Model):
@@ -84,30 +106,134 @@ class MovimientoInventario(models.Model):
     numero_documento = models.CharField(max_length=50, blank=True, null=True)
 
     def save(self, *args, **kwargs):
-        # Guardar el stock anterior
-        self.stock_anterior = self.id_producto.stock
-        
-        # Actualizar el stock del producto
-        if self.tipo_movimiento == self.ENTRADA:
-            self.id_producto.stock += self.cantidad
-        elif self.tipo_movimiento == self.SALIDA:
-            self.id_producto.stock -= self.cantidad
-        elif self.tipo_movimiento == self.AJUSTE:
-            self.id_producto.stock = self.cantidad
-
-        # Guardar el nuevo stock
-        self.stock_nuevo = self.id_producto.stock
-        
-        # Validar que el stock no sea negativo
-        if self.id_producto.stock < 0:
-            raise ValidationError('No hay suficiente stock disponible')
-            
-        self.id_producto.save()
-        super().save(*args, **kwargs)
+        from .services import ajustar_stock, fijar_stock
+
+        if not self._state.adding:
+            # El stock solo se modifica al registrar el movimiento
+            return super().save(*args, **kwargs)
+
+        cantidad = self._meta.get_field('cantidad').to_python(self.cantidad)
+        if cantidad is None:
+            raise ValidationError('cantidad es obligatoria')
+        # Un ajuste fija el stock, por lo que admite 0
+        if cantidad < 0 or (cantidad == 0 and self.tipo_movimiento != self.AJUSTE):
+            raise ValidationError('cantidad debe ser mayor que cero')
+
+        with transaction.atomic():
+            # UPDATE condicional: stock_anterior/stock_nuevo salen de la
+            # propia sentencia y no de una lectura previa en Python
+            if self.tipo_movimiento == self.ENTRADA:
+                self.stock_anterior, self.stock_nuevo = ajustar_stock(self.id_producto_id, cantidad)
+            elif self.tipo_movimiento == self.SALIDA:
+                self.stock_anterior, self.stock_nuevo = ajustar_stock(self.id_producto_id, -cantidad)
+            elif self.tipo_movimiento == self.AJUSTE:
+                self.stock_anterior, self.stock_nuevo = fijar_stock(self.id_producto_id, cantidad)
+
+            # Mantener sincronizada la instancia de producto en memoria
+            if MovimientoInventario.id_producto.is_cached(self):
+                self.id_producto.stock = self.stock_nuevo
+
+            super().save(*args, **kwargs)
 
     class Meta:
         db_table = 'Movimiento_Inventario'
         indexes = [
-            models.Index(fields=['fecha_movimiento']),
+            # Cubre el orden de la paginación por cursor y los filtros por fecha
+            models.Index(fields=['fecha_movimiento', 'id_movimiento']),
+            # Kardex: movimientos de un producto en orden cronológico
+            models.Index(fields=['id_producto', 'fecha_movimiento', 'id_movimiento']),
             models.Index(fields=['tipo_movimiento']),
-        ]
\ No newline at end of file
+        ]
+
+
+class EliminacionCatalogo(models.Model):
+    """
+    Registro de productos y categorías eliminados, para que las terminales
+    que sincronizan el catálogo por diferencias también borren sus copias.
+    """
+    PRODUCTO = 'producto'
+    CATEGORIA = 'categoria'
+
+    id_eliminacion = models.AutoField(primary_key=True)
+    modelo = models.CharField(
+        max_length=10,
+        choices=[
+            (PRODUCTO, 'Producto'),
+            (CATEGORIA, 'Categoría')
+        ]
+    )
+    id_objeto = models.IntegerField()
+    fecha_eliminacion = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        db_table = 'Eliminacion_Catalogo'
+        verbose_name = 'Eliminación de Catálogo'
+        verbose_name_plural = 'Eliminaciones de Catálogo'
+
+    def __str__(self):
+        return f"{self.modelo} {self.id_objeto} - {self.fecha_eliminacion}"
+
+
+class CorteStock(models.Model):
+    """
+    Stock de cada producto en un instante (corte nocturno). Para conocer
+    el stock en una fecha pasada se parte del corte anterior más cercano
+    y solo se repasan los movimientos posteriores (ver historico.py).
+    """
+    id_corte = models.BigAutoField(primary_key=True)
+    fecha_corte = models.DateTimeField()
+    id_producto = models.ForeignKey(
+        Producto,
+        on_delete=models.CASCADE,
+        related_name='cortes_stock'
+    )
+    stock = models.IntegerField()
+
+    class Meta:
+        db_table = 'Corte_Stock'
+        verbose_name = 'Corte de Stock'
+        verbose_name_plural = 'Cortes de Stock'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['fecha_corte', 'id_producto'],
+                name='corte_stock_fecha_producto_unico'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.id_producto_id} - {self.fecha_corte}: {self.stock}"
+
+
+class AlertaStockBajo(models.Model):
+    """
+    Cruce del stock mínimo pendiente de notificar. Los servicios de stock
+    la registran en la misma transacción del cambio, solo cuando el stock
+    pasa de estar por encima del mínimo a estar en o por debajo de él. El
+    comando enviar_alertas_stock envía un resumen con todas las pendientes
+    y las marca como enviadas. Un producto tiene a lo sumo una pendiente.
+    """
+    id_alerta = models.BigAutoField(primary_key=True)
+    id_producto = models.ForeignKey(
+        Producto,
+        on_delete=models.CASCADE,
+        related_name='alertas_stock'
+    )
+    stock = models.IntegerField()
+    stock_minimo = models.IntegerField()
+    fecha_alerta = models.DateTimeField(default=timezone.now)
+    fecha_envio = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'Alerta_Stock_Bajo'
+        verbose_name = 'Alerta de Stock Bajo'
+        verbose_name_plural = 'Alertas de Stock Bajo'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['id_producto'],
+                condition=models.Q(fecha_envio__isnull=True),
+                name='alerta_stock_pendiente_unica'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.id_producto_id}: {self.stock}/{self.stock_minimo} - {self.fecha_alerta}"
@@ -0,0 +1,164 @@
+# apps/inventario/services.py
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import Case, When, IntegerField
+from django.utils import timezone
+
+from .models import Producto
+from .alertas import cruza_minimo, registrar_alertas
+from .codigos import nombre_version_producto
+from .utils import cache_stock, incrementar_version
+
+
+def _sql_ajuste_stock(deltas, ahora):
+    """
+    Construye un UPDATE ... RETURNING que suma a cada producto su delta
+    solo si el stock resultante no queda negativo. Devuelve también
+    stock_minimo para detectar cruces del umbral sin otra lectura.
+    """
+    qn = connection.ops.quote_name
+    tabla = qn(Producto._meta.db_table)
+    pk = qn(Producto._meta.pk.column)
+    stock = qn(Producto._meta.get_field('stock').column)
+    fecha = qn(Producto._meta.get_field('fecha_actualizacion').column)
+    minimo = qn(Producto._meta.get_field('stock_minimo').column)
+
+    ids = sorted(deltas)
+    caso = f'CASE {pk} ' + ' '.join(['WHEN %s THEN %s'] * len(ids)) + ' END'
+    params_caso = [valor for id_producto in ids for valor in (id_producto, deltas[id_producto])]
+    marcadores = ', '.join(['%s'] * len(ids))
+
+    sql = (
+        f'UPDATE {tabla} SET {stock} = {stock} + ({caso}), {fecha} = %s '
+        f'WHERE {pk} IN ({marcadores}) AND {stock} + ({caso}) >= 0 '
+        f'RETURNING {pk}, {stock}, {minimo}'
+    )
+    params = params_caso + [connection.ops.adapt_datetimefield_value(ahora)] + ids + params_caso
+    return sql, params
+
+
+def _soporta_update_returning():
+    """
+    Indica si el motor acepta UPDATE ... RETURNING. No se usa
+    features.can_return_columns_from_insert porque describe INSERT ...
+    RETURNING, que no siempre va de la mano (MariaDB lo tiene para INSERT
+    pero no para UPDATE). PostgreSQL lo admite siempre y SQLite desde 3.35.
+    """
+    if connection.vendor == 'postgresql':
+        return True
+    if connection.vendor == 'sqlite':
+        return connection.Database.sqlite_version_info >= (3, 35)
+    return False
+
+
+def _ajustar_sin_returning(deltas, ahora):
+    """
+    Alternativa para motores sin UPDATE ... RETURNING: bloquea las filas
+    (select_for_update, en orden de pk), calcula el stock resultante y
+    actualiza solo las que no quedan negativas. Con las filas bloqueadas
+    los valores calculados son los que quedan en la tabla.
+    """
+    actuales = Producto.objects.select_for_update().filter(
+        id_producto__in=deltas
+    ).order_by('id_producto').values_list('id_producto', 'stock', 'stock_minimo')
+    filas = [
+        (id_producto, stock + deltas[id_producto], stock_minimo)
+        for id_producto, stock, stock_minimo in actuales
+        if stock + deltas[id_producto] >= 0
+    ]
+    if filas:
+        Producto.objects.filter(id_producto__in=[fila[0] for fila in filas]).update(
+            stock=Case(
+                *[When(id_producto=id_producto, then=stock) for id_producto, stock, _ in filas],
+                output_field=IntegerField()
+            ),
+            fecha_actualizacion=ahora
+        )
+    return filas
+
+
+@transaction.atomic
+def ajustar_stock_lote(deltas):
+    """
+    Aplica varios cambios de stock en una sola sentencia
+    UPDATE ... SET stock = stock + delta WHERE stock + delta >= 0.
+
+    deltas: {id_producto: delta} (negativo para salidas).
+    Devuelve {id_producto: (stock_anterior, stock_nuevo)} a partir de los
+    valores que devuelve la propia sentencia, sin lecturas previas.
+    Si algún producto no existe o quedaría con stock negativo se lanza
+    ValidationError y no se aplica ningún cambio.
+    """
+    deltas = {id_producto: delta for id_producto, delta in deltas.items() if delta}
+    if not deltas:
+        return {}
+
+    ahora = timezone.now()
+    if _soporta_update_returning():
+        sql, params = _sql_ajuste_stock(deltas, ahora)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            filas = cursor.fetchall()
+    else:
+        filas = _ajustar_sin_returning(deltas, ahora)
+
+    resultado = {}
+    cruces = {}
+    for id_producto, stock, stock_minimo in filas:
+        resultado[id_producto] = (stock - deltas[id_producto], stock)
+        if cruza_minimo(stock - deltas[id_producto], stock, stock_minimo):
+            cruces[id_producto] = (stock, stock_minimo)
+
+    rechazados = set(deltas) - set(resultado)
+    if rechazados:
+        nombres = dict(
+            Producto.objects.filter(id_producto__in=rechazados)
+            .values_list('id_producto', 'nombre')
+        )
+        inexistentes = rechazados - set(nombres)
+        if inexistentes:
+            raise ValidationError(
+                f'Productos inexistentes: {", ".join(str(i) for i in sorted(inexistentes))}'
+            )
+        raise ValidationError(
+            f'Stock insuficiente para {", ".join(nombres[i] for i in sorted(nombres))}'
+        )
+
+    registrar_alertas(cruces)
+    incrementar_version('inventario', *map(nombre_version_producto, resultado))
+    cache_stock.guardar({id_producto: nuevo for id_producto, (_, nuevo) in resultado.items()})
+    return resultado
+
+
+def ajustar_stock(id_producto, delta):
+    """
+    Suma delta al stock de un producto de forma atómica.
+    Devuelve (stock_anterior, stock_nuevo).
+    """
+    if not delta:
+        stock = Producto.objects.values_list('stock', flat=True).get(id_producto=id_producto)
+        return stock, stock
+    return ajustar_stock_lote({id_producto: delta})[id_producto]
+
+
+@transaction.atomic
+def fijar_stock(id_producto, valor):
+    """
+    Establece el stock de un producto (ajuste de inventario).
+    Devuelve (stock_anterior, stock_nuevo).
+    """
+    if valor < 0:
+        raise ValidationError('El stock no puede ser negativo')
+
+    stock_anterior, stock_minimo = Producto.objects.select_for_update().values_list(
+        'stock', 'stock_minimo'
+    ).get(id_producto=id_producto)
+    Producto.objects.filter(id_producto=id_producto).update(
+        stock=valor,
+        fecha_actualizacion=timezone.now()
+    )
+    if cruza_minimo(stock_anterior, valor, stock_minimo):
+        registrar_alertas({id_producto: (valor, stock_minimo)})
+    incrementar_version('inventario', nombre_version_producto(id_producto))
+    cache_stock.guardar({id_producto: valor})
+    return stock_anterior, valor
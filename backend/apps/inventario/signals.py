@@ -1,8 +1,47 @@
-from django.db.models.signals import post_save
+# apps/inventario/signals.py
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from .models import Categoria, Producto, EliminacionCatalogo
+from .alertas import cruza_minimo, registrar_alertas
+from .codigos import nombre_version_producto
+from .utils import cache_stock, incrementar_version
 
-@receiver(post_save, sender=MovimientoInventario)
-def notificar_stock_bajo(sender, instance, **kwargs):
-    if instance.id_producto.necesita_reposicion():
-        # Enviar notificación
-        pass
\ No newline at end of file
+@receiver(post_save, sender=Producto)
+def detectar_stock_bajo(sender, instance, created, raw=False, **kwargs):
+    # Ediciones directas de stock o stock_minimo; los movimientos y las
+    # ventas registran sus cruces en services.ajustar_stock_lote/fijar_stock
+    if raw:
+        return
+    if created:
+        cruza = instance.necesita_reposicion()
+    elif instance._original is not None:
+        stock_anterior, minimo_anterior = instance._original
+        cruza = cruza_minimo(stock_anterior, instance.stock, instance.stock_minimo, minimo_anterior)
+    else:
+        cruza = False
+    if cruza:
+        registrar_alertas({instance.pk: (instance.stock, instance.stock_minimo)})
+    instance._original = (instance.stock, instance.stock_minimo)
+
+@receiver([post_save, post_delete], sender=Producto)
+@receiver([post_save, post_delete], sender=Categoria)
+def invalidar_cache_inventario(sender, instance, **kwargs):
+    # Ediciones directas (admin, API); los cambios de stock de los
+    # servicios invalidan desde ajustar_stock_lote/fijar_stock
+    if sender is Producto:
+        incrementar_version('inventario', nombre_version_producto(instance.pk))
+        if kwargs['signal'] is post_delete:
+            cache_stock.invalidar([instance.pk])
+        else:
+            cache_stock.guardar({instance.pk: instance.stock})
+    else:
+        incrementar_version('inventario', 'categorias')
+
+@receiver(post_delete, sender=Producto)
+@receiver(post_delete, sender=Categoria)
+def registrar_eliminacion_catalogo(sender, instance, **kwargs):
+    # Las terminales que sincronizan por diferencias necesitan saber qué borrar
+    EliminacionCatalogo.objects.create(
+        modelo=EliminacionCatalogo.PRODUCTO if sender is Producto else EliminacionCatalogo.CATEGORIA,
+        id_objeto=instance.pk
+    )
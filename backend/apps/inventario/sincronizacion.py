@@ -0,0 +1,88 @@
+# apps/inventario/sincronizacion.py
+"""
+Sincronización incremental del catálogo para las terminales de venta.
+
+La primera llamada (sin token) devuelve el catálogo completo y un token
+con el instante en que empezó la lectura. Las siguientes devuelven solo
+los productos y categorías con fecha_actualizacion posterior al token y
+los ids eliminados desde entonces (EliminacionCatalogo).
+
+fecha_actualizacion se asigna antes de confirmar la transacción, así que
+un cambio puede hacerse visible con una fecha algo anterior al token que
+ya se entregó. Por eso cada consulta incremental repite la ventana
+MARGEN anterior al token: los registros repetidos se aplican igual en la
+terminal (se reemplazan por id).
+"""
+from datetime import timedelta
+
+from django.core import signing
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from myproject.lectura import ProyeccionValores
+
+from .models import Categoria, EliminacionCatalogo, Producto
+from .serializers import CategoriaSerializer, ProductoSerializer
+
+MARGEN = timedelta(minutes=1)
+# Las eliminaciones más antiguas se depuran; un token anterior obliga a
+# descargar el catálogo completo
+RETENCION_ELIMINACIONES = timedelta(days=30)
+_SAL_TOKEN = 'inventario.sincronizacion'
+
+
+class TokenInvalido(Exception):
+    pass
+
+
+def generar_token(momento):
+    return signing.dumps(momento.isoformat(), salt=_SAL_TOKEN)
+
+
+def leer_token(token):
+    try:
+        momento = parse_datetime(signing.loads(token, salt=_SAL_TOKEN))
+    except (signing.BadSignature, TypeError, ValueError):
+        raise TokenInvalido()
+    if momento is None:
+        raise TokenInvalido()
+    return momento
+
+
+def _filas(serializer, queryset):
+    proyeccion = ProyeccionValores(serializer)
+    return proyeccion.representar(proyeccion.valores(queryset.order_by('pk')))
+
+
+def cambios_catalogo(token=None):
+    """
+    Devuelve {token, completo, productos, categorias, eliminados}.
+    La terminal aplica primero productos/categorías (reemplazo por id) y
+    después elimina los ids de `eliminados`.
+    """
+    ahora = timezone.now()
+    desde = leer_token(token) if token else None
+    completo = desde is None or desde < ahora - RETENCION_ELIMINACIONES
+
+    productos = Producto.objects.all()
+    categorias = Categoria.objects.all()
+    eliminados = {EliminacionCatalogo.PRODUCTO: [], EliminacionCatalogo.CATEGORIA: []}
+    if not completo:
+        limite = desde - MARGEN
+        productos = productos.filter(fecha_actualizacion__gt=limite)
+        categorias = categorias.filter(fecha_actualizacion__gt=limite)
+        for modelo, id_objeto in EliminacionCatalogo.objects.filter(
+            fecha_eliminacion__gt=limite
+        ).order_by('id_eliminacion').values_list('modelo', 'id_objeto'):
+            eliminados[modelo].append(id_objeto)
+
+    return {
+        'token': generar_token(ahora),
+        'completo': completo,
+        'productos': _filas(ProductoSerializer(), productos),
+        'categorias': _filas(CategoriaSerializer(), categorias),
+        'eliminados': {
+            'productos': eliminados[EliminacionCatalogo.PRODUCTO],
+            'categorias': eliminados[EliminacionCatalogo.CATEGORIA],
+        },
+    }
@@ -0,0 +1,245 @@
+# apps/inventario/tests.py
+import base64
+import json
+import threading
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models.signals import post_save
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from rest_framework.test import APIClient
+
+from apps.usuarios.models import Usuario
+
+from .models import Categoria, MovimientoInventario, Producto
+from .services import ajustar_stock_lote
+
+
+def crear_producto(nombre, stock, stock_minimo=0):
+    return Producto.objects.create(
+        nombre=nombre, descripcion='', precio='10.00', stock=stock, stock_minimo=stock_minimo
+    )
+
+
+class AjusteStockLoteTest(TestCase):
+
+    def setUp(self):
+        caches['compartida'].clear()
+        self.p1 = crear_producto('Producto 1', 5)
+        self.p2 = crear_producto('Producto 2', 2)
+
+    def stock(self, producto):
+        return Producto.objects.values_list('stock', flat=True).get(pk=producto.pk)
+
+    def test_aplica_los_deltas(self):
+        resultado = ajustar_stock_lote({self.p1.pk: -3, self.p2.pk: 4})
+        self.assertEqual(resultado, {self.p1.pk: (5, 2), self.p2.pk: (2, 6)})
+        self.assertEqual(self.stock(self.p1), 2)
+        self.assertEqual(self.stock(self.p2), 6)
+
+    def test_segunda_venta_no_sobrevende(self):
+        ajustar_stock_lote({self.p1.pk: -3})
+        with self.assertRaisesMessage(ValidationError, 'Stock insuficiente para Producto 1'):
+            ajustar_stock_lote({self.p1.pk: -3})
+        self.assertEqual(self.stock(self.p1), 2)
+
+    def test_rechazo_no_aplica_cambios_parciales(self):
+        with self.assertRaisesMessage(ValidationError, 'Stock insuficiente para Producto 2'):
+            ajustar_stock_lote({self.p1.pk: -1, self.p2.pk: -3})
+        self.assertEqual(self.stock(self.p1), 5)
+        self.assertEqual(self.stock(self.p2), 2)
+
+    def test_producto_inexistente(self):
+        with self.assertRaisesMessage(ValidationError, 'Productos inexistentes: 999'):
+            ajustar_stock_lote({self.p1.pk: -1, 999: -1})
+        self.assertEqual(self.stock(self.p1), 5)
+
+    def test_sin_returning(self):
+        with mock.patch('apps.inventario.services._soporta_update_returning', return_value=False):
+            resultado = ajustar_stock_lote({self.p1.pk: -5, self.p2.pk: 1})
+            self.assertEqual(resultado, {self.p1.pk: (5, 0), self.p2.pk: (2, 3)})
+            with self.assertRaises(ValidationError):
+                ajustar_stock_lote({self.p1.pk: -1, self.p2.pk: -1})
+        self.assertEqual(self.stock(self.p1), 0)
+        self.assertEqual(self.stock(self.p2), 3)
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class SobreventaConcurrenteTest(TransactionTestCase):
+    """
+    Varios hilos descuentan a la vez del mismo producto: el UPDATE
+    condicional acepta exactamente tantas salidas como stock había.
+    """
+
+    def test_no_sobrevende(self):
+        caches['compartida'].clear()
+        producto = crear_producto('Concurrente', 10)
+        aceptadas = []
+        rechazadas = []
+
+        def vender():
+            try:
+                for _ in range(5):
+                    try:
+                        ajustar_stock_lote({producto.pk: -1})
+                        aceptadas.append(1)
+                    except ValidationError:
+                        rechazadas.append(1)
+            finally:
+                connections.close_all()
+
+        hilos = [threading.Thread(target=vender) for _ in range(4)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(len(aceptadas), 10)
+        self.assertEqual(len(rechazadas), 10)
+        producto.refresh_from_db()
+        self.assertEqual(producto.stock, 0)
+
+
+class StockBajoTest(TestCase):
+
+    def setUp(self):
+        caches['compartida'].clear()
+        admin = Usuario.objects.create_user(
+            email='admin@axolpos.local', password=None, nombre_usuario='admin',
+            tipo_usuario='administrador', is_staff=True
+        )
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(admin)
+
+    def test_pagina_sin_consultas_por_fila(self):
+        for i in range(5):
+            categoria = Categoria.objects.create(nombre=f'Categoría {i}')
+            Producto.objects.create(
+                nombre=f'Bajo {i}', descripcion='', precio='10.00',
+                stock=1, stock_minimo=5, categoria=categoria
+            )
+        crear_producto('Suficiente', 50)
+
+        with self.assertNumQueries(1):
+            respuesta = self.cliente.get('/api/inventario/productos/stock_bajo/', {'limite': 3})
+        self.assertEqual(respuesta.status_code, 200, respuesta.content)
+        self.assertEqual([p['nombre'] for p in respuesta.data['results']], ['Bajo 0', 'Bajo 1', 'Bajo 2'])
+
+        respuesta = self.cliente.get(respuesta.data['next'])
+        self.assertEqual([p['nombre'] for p in respuesta.data['results']], ['Bajo 3', 'Bajo 4'])
+        self.assertIsNone(respuesta.data['next'])
+
+
+class GetCondicionalTest(TestCase):
+
+    def setUp(self):
+        for alias in ('compartida', 'default', 'stock'):
+            caches[alias].clear()
+        admin = Usuario.objects.create_user(
+            email='admin@axolpos.local', password=None, nombre_usuario='admin',
+            tipo_usuario='administrador', is_staff=True
+        )
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(admin)
+
+    def test_etag_cambia_en_el_mismo_segundo(self):
+        url = '/api/inventario/categorias/'
+        respuesta = self.cliente.get(url)
+        etag = respuesta['ETag']
+        self.assertNotIn('Last-Modified', respuesta)
+        self.assertEqual(self.cliente.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Categoria.objects.create(nombre='Nueva')
+        respuesta = self.cliente.get(
+            url, HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE='Fri, 31 Dec 2100 23:59:59 GMT'
+        )
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual([c['nombre'] for c in respuesta.data], ['Nueva'])
+
+
+class KardexCursorTest(TestCase):
+
+    def setUp(self):
+        caches['compartida'].clear()
+        self.admin = Usuario.objects.create_user(
+            email='admin@axolpos.local', password=None, nombre_usuario='admin',
+            tipo_usuario='administrador', is_staff=True
+        )
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.admin)
+        self.producto = crear_producto('Producto', 10)
+        self.otro = crear_producto('Otro', 10)
+        for cantidad in (5, 3, 2):
+            MovimientoInventario.objects.create(
+                id_producto=self.producto, id_usuario=self.admin,
+                tipo_movimiento=MovimientoInventario.ENTRADA, cantidad=cantidad, descripcion=''
+            )
+
+    def url(self, producto):
+        return f'/api/inventario/productos/{producto.pk}/kardex/'
+
+    def cursor(self):
+        respuesta = self.cliente.get(self.url(self.producto), {'limite': 2})
+        self.assertEqual(respuesta.status_code, 200, respuesta.content)
+        return parse_qs(urlsplit(respuesta.data['next']).query)['cursor'][0]
+
+    def test_sigue_el_cursor_firmado(self):
+        respuesta = self.cliente.get(self.url(self.producto), {'limite': 2, 'cursor': self.cursor()})
+        self.assertEqual([fila['saldo'] for fila in respuesta.data['results']], [20])
+
+    def test_rechaza_cursor_editado(self):
+        sin_firma = base64.urlsafe_b64encode(json.dumps(['2000-01-01T00:00:00+00:00', 1, 999]).encode()).decode()
+        for cursor in (sin_firma, self.cursor()[:-1] + 'x'):
+            with self.subTest(cursor=cursor):
+                respuesta = self.cliente.get(self.url(self.producto), {'cursor': cursor})
+                self.assertEqual(respuesta.status_code, 404)
+
+    def test_rechaza_cursor_de_otro_producto(self):
+        respuesta = self.cliente.get(self.url(self.otro), {'cursor': self.cursor()})
+        self.assertEqual(respuesta.status_code, 404)
+
+
+class RegistrarMovimientoTest(TestCase):
+
+    def setUp(self):
+        caches['compartida'].clear()
+        admin = Usuario.objects.create_user(
+            email='admin@axolpos.local', password=None, nombre_usuario='admin',
+            tipo_usuario='administrador', is_staff=True
+        )
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(admin)
+        self.producto = crear_producto('Producto', 10)
+        self.url = f'/api/inventario/productos/{self.producto.pk}/registrar_movimiento/'
+
+    def test_cantidad_invalida(self):
+        for datos in (
+            {'tipo_movimiento': MovimientoInventario.SALIDA},
+            {'tipo_movimiento': MovimientoInventario.ENTRADA, 'cantidad': 0},
+            {'tipo_movimiento': MovimientoInventario.AJUSTE, 'cantidad': -1},
+        ):
+            with self.subTest(datos=datos):
+                respuesta = self.cliente.post(self.url, datos, format='json')
+                self.assertEqual(respuesta.status_code, 400, respuesta.content)
+                self.assertIn('error', respuesta.data)
+        self.assertFalse(MovimientoInventario.objects.exists())
+
+    def test_ajuste_a_cero(self):
+        respuesta = self.cliente.post(
+            self.url, {'tipo_movimiento': MovimientoInventario.AJUSTE, 'cantidad': 0}, format='json'
+        )
+        self.assertEqual(respuesta.status_code, 200, respuesta.content)
+        self.producto.refresh_from_db()
+        self.assertEqual(self.producto.stock, 0)
+
+
+class SenalesTest(TestCase):
+
+    def test_sin_receptores_por_movimiento(self):
+        # Registrar un movimiento no debe disparar trabajo por fila: las
+        # alertas de stock bajo se registran en los servicios de stock
+        self.assertFalse(post_save.has_listeners(MovimientoInventario))
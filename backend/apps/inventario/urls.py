@@ -2,7 +2,12 @@
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ProductoViewSet, CategoriaViewSet, MovimientoInventarioViewSet
+from .views import (
+    ProductoViewSet,
+    CategoriaViewSet,
+    MovimientoInventarioViewSet,
+    SincronizacionCatalogoView,
+)
 
 # Creamos un enrutador para gestionar las URLs automáticamente
 router = DefaultRouter()
@@ -11,5 +16,6 @@ router.register(r'categorias', CategoriaViewSet)
 router.register(r'movimientos', MovimientoInventarioViewSet)
 
 urlpatterns = [
+    path('sincronizar/', SincronizacionCatalogoView.as_view(), name='sincronizar_catalogo'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
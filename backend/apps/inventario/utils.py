@@ -1,11 +1,130 @@
 # apps/inventario/utils.py 
 
-from django.core.cache import cache
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+
+
+class CacheStock:
+    """
+    Stock por producto en el alias de caché INVENTARIO_CACHE_STOCK.
+
+    Los caminos que modifican stock (services.ajustar_stock_lote,
+    services.fijar_stock y las señales de Producto) escriben el valor
+    nuevo al confirmar la transacción, así que una entrada solo se lee de
+    la base de datos la primera vez o tras expirar. El TIMEOUT del alias
+    acota el desfase si dos transacciones confirman en orden distinto al
+    de sus callbacks. La validación real del stock sigue siendo el UPDATE
+    condicional de ajustar_stock_lote.
+
+    Los contadores de aciertos y fallos son del proceso.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+        self._candado = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def _clave(self, id_producto):
+        return f'producto_stock_{id_producto}'
+
+    def obtener_varios(self, ids):
+        """
+        Devuelve {id_producto: stock} con una lectura a la caché y, para
+        los que falten, una sola consulta. Los ids inexistentes no aparecen.
+        """
+        from .models import Producto
+
+        claves = {self._clave(id_producto): id_producto for id_producto in set(ids)}
+        encontradas = self.backend.get_many(list(claves))
+        resultado = {claves[clave]: stock for clave, stock in encontradas.items()}
+        faltantes = [id_producto for clave, id_producto in claves.items() if clave not in encontradas]
+        with self._candado:
+            self.aciertos += len(resultado)
+            self.fallos += len(faltantes)
+        if faltantes:
+            leidos = dict(
+                Producto.objects.filter(id_producto__in=faltantes)
+                .values_list('id_producto', 'stock')
+            )
+            self.backend.set_many({self._clave(id_producto): stock for id_producto, stock in leidos.items()})
+            resultado.update(leidos)
+        return resultado
+
+    def obtener(self, id_producto):
+        return self.obtener_varios([id_producto]).get(id_producto)
+
+    def guardar(self, stocks):
+        """
+        Escribe {id_producto: stock} al confirmar la transacción en curso.
+        """
+        if stocks:
+            transaction.on_commit(lambda: self.backend.set_many(
+                {self._clave(id_producto): stock for id_producto, stock in stocks.items()}
+            ))
+
+    def invalidar(self, ids):
+        ids = list(ids)
+        if ids:
+            transaction.on_commit(lambda: self.backend.delete_many(
+                [self._clave(id_producto) for id_producto in ids]
+            ))
+
+    def estadisticas(self):
+        total = self.aciertos + self.fallos
+        return {
+            'alias': self.alias,
+            'backend': type(self.backend).__name__,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': round(self.aciertos / total, 4) if total else None,
+        }
+
+
+cache_stock = CacheStock(getattr(settings, 'INVENTARIO_CACHE_STOCK', 'default'))
 
 def get_producto_stock(producto_id):
-    cache_key = f'producto_stock_{producto_id}'
-    stock = cache.get(cache_key)
-    if stock is None:
-        stock = Producto.objects.get(id=producto_id).stock
-        cache.set(cache_key, stock, timeout=300)  # 5 minutos
-    return stock
\ No newline at end of file
+    return cache_stock.obtener(producto_id)
+
+def get_productos_stock(ids):
+    return cache_stock.obtener_varios(ids)
+
+def _clave_version(nombre):
+    return f'version_{nombre}'
+
+def obtener_versiones(*nombres):
+    """
+    Devuelve {nombre: version} para construir llaves de caché que quedan
+    obsoletas en cuanto cambia alguno de los datos de los que dependen.
+    La versión es el instante del último cambio en nanosegundos (o el de
+    la primera lectura si la llave no existía), así que también sirve como
+    fecha de última modificación.
+    """
+    claves = {_clave_version(nombre): nombre for nombre in nombres}
+    encontradas = cache.get_many(list(claves))
+    faltantes = {clave: time.time_ns() for clave in claves if clave not in encontradas}
+    if faltantes:
+        cache.set_many(faltantes, timeout=None)
+        encontradas.update(faltantes)
+    return {claves[clave]: version for clave, version in encontradas.items()}
+
+def incrementar_version(*nombres):
+    """
+    Invalida todas las entradas de caché que dependen de `nombres`.
+    Se aplica al confirmar la transacción para que ningún lector vuelva a
+    cachear datos anteriores al cambio.
+    """
+    def incrementar():
+        # Un valor basado en el reloj no repite versiones anteriores aunque
+        # la llave haya sido desalojada; todas se escriben en una operación
+        ahora = time.time_ns()
+        cache.set_many({_clave_version(nombre): ahora for nombre in nombres}, timeout=None)
+    transaction.on_commit(incrementar)
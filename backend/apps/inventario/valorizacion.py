@@ -0,0 +1,126 @@
+# apps/inventario/valorizacion.py
+"""
+Valor del inventario (stock * precio) por categoría y por estado.
+
+Todo el reporte sale de una consulta agrupada por (categoría, estado) y
+los totales se acumulan en Python sobre esas pocas filas. El resultado se
+cachea bajo la versión 'inventario', que incrementan los cambios de stock
+(services.ajustar_stock_lote, services.fijar_stock) y las ediciones de
+productos y categorías (precio, estado, nombre), así que nunca se sirve
+un valor anterior al último cambio.
+
+El índice (categoria, estado, stock, precio) de Producto cubre todas las
+columnas del agrupado, así que el reporte y el detalle de una categoría
+se resuelven recorriendo solo el índice.
+"""
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+
+from .models import Categoria, Producto
+from .utils import obtener_versiones
+
+CACHE_TIMEOUT = 300
+
+VALOR = ExpressionWrapper(
+    F('stock') * F('precio'),
+    output_field=DecimalField(max_digits=20, decimal_places=2)
+)
+
+
+CENTAVO = Decimal('0.01')
+
+
+def _acumular(destino, fila):
+    destino['productos'] += fila['productos']
+    destino['unidades'] += fila['unidades'] or 0
+    # SQLite suma en coma flotante; se redondea cada grupo al centavo
+    destino['valor'] += (fila['valor'] or Decimal('0.00')).quantize(CENTAVO)
+
+
+def _vacio(**campos):
+    return {**campos, 'productos': 0, 'unidades': 0, 'valor': Decimal('0.00')}
+
+
+def _agrupado(productos):
+    return productos.order_by().values('categoria', 'estado').annotate(
+        productos=Count('id_producto'),
+        unidades=Sum('stock'),
+        valor=Sum(VALOR)
+    )
+
+
+def calcular_valorizacion():
+    """
+    Total general, por categoría y por estado, con una sola consulta
+    agrupada más la de nombres de categorías.
+    """
+    filas = list(_agrupado(Producto.objects.all()))
+    nombres = dict(Categoria.objects.values_list('id', 'nombre'))
+
+    total = _vacio()
+    por_categoria = {}
+    por_estado = {}
+    for fila in filas:
+        _acumular(total, fila)
+        _acumular(por_categoria.setdefault(fila['categoria'], _vacio(
+            categoria=fila['categoria'], nombre=nombres.get(fila['categoria'])
+        )), fila)
+        _acumular(por_estado.setdefault(fila['estado'], _vacio(estado=fila['estado'])), fila)
+
+    return {
+        'total': total,
+        'por_categoria': sorted(por_categoria.values(), key=lambda c: c['valor'], reverse=True),
+        'por_estado': sorted(por_estado.values(), key=lambda e: e['estado']),
+    }
+
+
+def productos_categoria(categoria):
+    """
+    Productos de una categoría (None: sin categoría) con su valor.
+    """
+    return Producto.objects.filter(categoria=categoria).annotate(valor=VALOR)
+
+
+def calcular_detalle_categoria(categoria, limite):
+    """
+    Desglose de una categoría por estado y sus `limite` productos de
+    mayor valor.
+    """
+    productos = productos_categoria(categoria)
+    total = _vacio(categoria=categoria)
+    por_estado = []
+    for fila in _agrupado(productos):
+        _acumular(total, fila)
+        por_estado.append(_vacio(estado=fila['estado']))
+        _acumular(por_estado[-1], fila)
+
+    return {
+        'total': total,
+        'por_estado': sorted(por_estado, key=lambda e: e['estado']),
+        'productos': list(productos.order_by('-valor', 'id_producto').values(
+            'id_producto', 'codigo_barras', 'nombre', 'estado', 'stock', 'precio', 'valor'
+        )[:limite]),
+    }
+
+
+def obtener_valorizacion(categoria=None, limite=50):
+    """
+    Reporte general (categoria=None) o detalle de una categoría, desde la
+    caché mientras no cambie la versión 'inventario'.
+    """
+    version = obtener_versiones('inventario')['inventario']
+    if categoria is None:
+        cache_key = f'valorizacion_{version}'
+    else:
+        cache_key = f'valorizacion_{categoria}_{limite}_{version}'
+
+    reporte = cache.get(cache_key)
+    if reporte is None:
+        if categoria is None:
+            reporte = calcular_valorizacion()
+        else:
+            reporte = calcular_detalle_categoria(categoria, limite)
+        cache.set(cache_key, reporte, CACHE_TIMEOUT)
+    return reporte
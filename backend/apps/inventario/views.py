@@ -1,17 +1,25 @@
 # apps/inventario/views.py 
-from django.db.models import Q
 from django.db import transaction
 from django.core.exceptions import ValidationError
+from django.db.models import F
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from .models import (
     Producto,
     Categoria,
     MovimientoInventario
 )
+from .busqueda import buscar_productos
+from .historico import interpretar_momento, stock_al
+from .kardex import COLUMNAS_KARDEX, KardexPagination, iterar_kardex
+from .valorizacion import obtener_valorizacion, productos_categoria
+from .codigos import buscar_por_codigo
+from .utils import cache_stock
+from .sincronizacion import cambios_catalogo, TokenInvalido
 from .serializers import (
     ProductoSerializer,
     CategoriaSerializer,
@@ -22,14 +30,24 @@ from apps.usuarios.permissions import (
     EsCajero,
     AccionesInventarioPermission
 )
+from myproject.exportacion import FORMATOS, TAMANO_BLOQUE, respuesta_exportacion
+from myproject.lectura import LecturaRapidaMixin
+from myproject.mixins import GetCondicionalMixin, PlanConsultasMixin
+from myproject.pagination import KeysetPagination
 
-class ProductoViewSet(viewsets.ModelViewSet):
+class ProductoViewSet(GetCondicionalMixin, PlanConsultasMixin, LecturaRapidaMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar productos.
     Proporciona operaciones CRUD y acciones adicionales para productos.
     """
     queryset = Producto.objects.all()
     serializer_class = ProductoSerializer
+    pagination_class = KeysetPagination
+    orden_cursor = ('id_producto',)
+    versiones_condicionales = ('inventario',)
+    plan_consultas = {
+        'default': {'select_related': ('categoria',)},
+    }
     
     def get_permissions(self):
         """
@@ -37,7 +55,7 @@ class ProductoViewSet(viewsets.ModelViewSet):
         - Crear/Eliminar/Actualización completa: solo administradores
         - Ver/Actualización parcial (stock): cajeros y administradores
         """
-        if self.action in ['create', 'destroy', 'update']:
+        if self.action in ['create', 'destroy', 'update', 'estadisticas_cache_stock', 'stock_historico', 'kardex', 'valorizacion']:
             permission_classes = [EsAdministrador]
         else:
             permission_classes = [AccionesInventarioPermission]
@@ -47,15 +65,7 @@ class ProductoViewSet(viewsets.ModelViewSet):
         """
         Filtra productos según parámetros de búsqueda
         """
-        queryset = Producto.objects.all()
-        
-        # Búsqueda por nombre o código
-        busqueda = self.request.query_params.get('buscar', None)
-        if busqueda:
-            queryset = queryset.filter(
-                Q(nombre__icontains=busqueda) |
-                Q(codigo_barras__icontains=busqueda)
-            )
+        queryset = super().get_queryset()
         
         # Filtrar por categoría
         categoria = self.request.query_params.get('categoria', None)
@@ -67,6 +77,12 @@ class ProductoViewSet(viewsets.ModelViewSet):
         if estado:
             queryset = queryset.filter(estado=estado)
 
+        # Búsqueda por nombre o código, ordenada por relevancia
+        busqueda = self.request.query_params.get('buscar', None)
+        if busqueda and busqueda.strip() and self.action == 'list':
+            self.pagina_unica = True
+            queryset = buscar_productos(busqueda, queryset)
+
         return queryset
 
     def perform_update(self, serializer):
@@ -81,17 +97,167 @@ class ProductoViewSet(viewsets.ModelViewSet):
                 )
         serializer.save()
 
+    @action(detail=False, methods=['get'], url_path=r'codigo/(?P<codigo_barras>[^/]+)')
+    def por_codigo(self, request, codigo_barras=None):
+        """
+        Búsqueda exacta por código de barras para el escáner de la caja.
+        Devuelve solo id_producto, nombre, precio, stock y estado desde la
+        caché LRU del proceso (ver codigos.py).
+        """
+        producto = buscar_por_codigo(codigo_barras)
+        if producto is None:
+            return Response(
+                {'error': 'Producto no encontrado'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(producto)
+
     @action(detail=False, methods=['get'])
-    @transaction.atomic
-    def stock_bajo(self, request):
+    def stock(self, request):
         """
-        Lista productos con stock bajo el mínimo
+        Stock actual de varios productos (?ids=1,2,3), p. ej. los del
+        carrito, desde la caché de stock.
         """
-        productos = Producto.objects.filter(
-            stock__lte=models.F('stock_minimo')
+        try:
+            ids = [int(valor) for valor in request.query_params.get('ids', '').split(',') if valor.strip()]
+        except ValueError:
+            return Response(
+                {'error': 'ids debe ser una lista de enteros separada por comas'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not ids:
+            return Response(
+                {'error': 'Se requiere el parámetro ids'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({
+            str(id_producto): stock
+            for id_producto, stock in cache_stock.obtener_varios(ids).items()
+        })
+
+    @action(detail=False, methods=['get'], url_path='stock/cache')
+    def estadisticas_cache_stock(self, request):
+        """
+        Aciertos y fallos de la caché de stock en este proceso.
+        """
+        return Response(cache_stock.estadisticas())
+
+    @action(detail=False, methods=['get'], url_path='stock/historico')
+    def stock_historico(self, request):
+        """
+        Stock de todos los productos en una fecha pasada (?fecha=AAAA-MM-DD
+        al cierre del día, o fecha y hora ISO 8601), reconstruido desde el
+        último corte anterior (ver historico.py).
+        ?formato=csv o ndjson devuelve la lista en streaming.
+        """
+        momento = interpretar_momento(request.query_params.get('fecha', ''))
+        if momento is None:
+            return Response(
+                {'error': 'Se requiere fecha con formato AAAA-MM-DD o ISO 8601'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        formato = request.query_params.get('formato', 'json')
+        if formato != 'json' and formato not in FORMATOS:
+            return Response(
+                {'error': f'formato solo admite: json, {", ".join(FORMATOS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        stock = stock_al(momento)
+        columnas = ('id_producto', 'codigo_barras', 'nombre', 'stock')
+        filas = (
+            (id_producto, codigo_barras, nombre, stock[id_producto])
+            for id_producto, codigo_barras, nombre in Producto.objects.filter(
+                fecha_creacion__lte=momento
+            ).order_by('id_producto').values_list(
+                *columnas[:3]
+            ).iterator(chunk_size=TAMANO_BLOQUE)
+            if id_producto in stock
         )
-        serializer = self.get_serializer(productos, many=True)
-        return Response(serializer.data)
+        if formato != 'json':
+            return respuesta_exportacion(
+                formato, columnas, filas, f'stock_{momento:%Y%m%d_%H%M%S}'
+            )
+        return Response({
+            'fecha': momento,
+            'productos': [dict(zip(columnas, fila)) for fila in filas]
+        })
+
+    @action(detail=True, methods=['get'])
+    def kardex(self, request, pk=None):
+        """
+        Kardex del producto: movimientos con entrada, salida, saldo
+        acumulado (calculado en la base de datos) y valorización al precio
+        actual. Paginado por cursor (?cursor=, ?limite=); ?formato=csv o
+        ndjson devuelve el kardex completo en streaming.
+        """
+        producto = self.get_object()
+        formato = request.query_params.get('formato', 'json')
+        if formato != 'json' and formato not in FORMATOS:
+            return Response(
+                {'error': f'formato solo admite: json, {", ".join(FORMATOS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        movimientos = MovimientoInventario.objects.filter(id_producto=producto.pk)
+        if formato != 'json':
+            return respuesta_exportacion(
+                formato,
+                COLUMNAS_KARDEX,
+                iterar_kardex(movimientos, producto.precio, TAMANO_BLOQUE),
+                f'kardex_{producto.codigo_barras}'
+            )
+
+        paginador = KardexPagination()
+        filas = paginador.paginate_queryset(movimientos, request, view=self)
+        for fila in filas:
+            fila['valor_saldo'] = fila['saldo'] * producto.precio
+        return paginador.get_paginated_response(filas)
+
+    @action(detail=False, methods=['get'])
+    def valorizacion(self, request):
+        """
+        Valor del inventario (stock * precio) total, por categoría y por
+        estado. Con ?categoria=<id> devuelve el detalle de esa categoría
+        por estado y sus productos de mayor valor (?limite=, 50 por
+        defecto); con ?formato=csv o ndjson además, todos sus productos en
+        streaming. Ver valorizacion.py.
+        """
+        try:
+            categoria = request.query_params.get('categoria')
+            categoria = int(categoria) if categoria else None
+            limite = max(1, min(int(request.query_params.get('limite', 50)), 500))
+        except ValueError:
+            return Response(
+                {'error': 'categoria y limite deben ser enteros'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        formato = request.query_params.get('formato', 'json')
+        if formato == 'json':
+            return Response(obtener_valorizacion(categoria, limite))
+        if formato not in FORMATOS or categoria is None:
+            return Response(
+                {'error': f'formato {", ".join(FORMATOS)} requiere categoria'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        columnas = ('id_producto', 'codigo_barras', 'nombre', 'estado', 'stock', 'precio', 'valor')
+        filas = productos_categoria(categoria).order_by('id_producto').values_list(
+            *columnas
+        ).iterator(chunk_size=TAMANO_BLOQUE)
+        return respuesta_exportacion(formato, columnas, filas, f'valorizacion_categoria_{categoria}')
+
+    @action(detail=False, methods=['get'])
+    def stock_bajo(self, request):
+        """
+        Lista productos con stock bajo el mínimo, paginados por cursor
+        """
+        # Misma condición que el índice parcial producto_stock_bajo_idx
+        productos = self.get_queryset().filter(stock__lte=F('stock_minimo'))
+        pagina = self.paginate_queryset(productos)
+        serializer = self.get_serializer(pagina, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['post'])
     @transaction.atomic
@@ -104,7 +270,7 @@ class ProductoViewSet(viewsets.ModelViewSet):
         try:
             movimiento = MovimientoInventario.objects.create(
                 id_producto=producto,
-                id_usuario=request.user,
+                id_usuario_id=request.user.pk,
                 tipo_movimiento=request.data.get('tipo_movimiento'),
                 cantidad=request.data.get('cantidad'),
                 descripcion=request.data.get('descripcion', ''),
@@ -122,7 +288,7 @@ class ProductoViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-class CategoriaViewSet(viewsets.ModelViewSet):
+class CategoriaViewSet(GetCondicionalMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar categorías.
     Solo administradores pueden crear/modificar/eliminar categorías.
@@ -130,6 +296,7 @@ class CategoriaViewSet(viewsets.ModelViewSet):
     queryset = Categoria.objects.all()
     serializer_class = CategoriaSerializer
     permission_classes = [EsAdministrador]
+    versiones_condicionales = ('categorias',)
 
     def get_permissions(self):
         """
@@ -141,19 +308,26 @@ class CategoriaViewSet(viewsets.ModelViewSet):
             permission_classes = [EsAdministrador]
         return [permission() for permission in permission_classes]
 
-class MovimientoInventarioViewSet(viewsets.ModelViewSet):
+class MovimientoInventarioViewSet(PlanConsultasMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar movimientos de inventario.
     """
     queryset = MovimientoInventario.objects.all()
     serializer_class = MovimientoInventarioSerializer
     permission_classes = [AccionesInventarioPermission]
+    pagination_class = KeysetPagination
+    orden_cursor = ('-fecha_movimiento', '-id_movimiento')
+    plan_consultas = {
+        'default': {
+            'select_related': ('id_producto__categoria', 'id_usuario__persona'),
+        },
+    }
 
     def get_queryset(self):
         """
         Filtra movimientos según el rol del usuario
         """
-        queryset = MovimientoInventario.objects.all()
+        queryset = super().get_queryset()
         
         # Filtros por fecha
         fecha_inicio = self.request.query_params.get('fecha_inicio')
@@ -171,4 +345,20 @@ class MovimientoInventarioViewSet(viewsets.ModelViewSet):
         return queryset
 
     def perform_create(self, serializer):
-        serializer.save(id_usuario=self.request.user)
\ No newline at end of file
+        serializer.save(id_usuario_id=self.request.user.pk)
+
+class SincronizacionCatalogoView(APIView):
+    """
+    Catálogo para las terminales: completo sin ?token= y, con el token de
+    la respuesta anterior, solo lo que cambió desde entonces.
+    """
+    permission_classes = [EsCajero]
+
+    def get(self, request):
+        try:
+            return Response(cambios_catalogo(request.query_params.get('token')))
+        except TokenInvalido:
+            return Response(
+                {'error': 'Token de sincronización inválido'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
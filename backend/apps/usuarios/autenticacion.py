@@ -0,0 +1,234 @@
+# apps/usuarios/autenticacion.py
+"""
+Autenticación JWT sin consulta a la base de datos.
+
+Los tokens llevan tipo_usuario, is_active e is_staff como claims, así que
+los permisos (EsAdministrador, EsCajero, VentasPermission, ...) deciden
+con request.user = UsuarioToken sin cargar la fila de Usuario.
+
+Revocación: lista de denegación en la tabla RevocacionToken, con la caché
+solo como lectura previa (read-through).
+- revocar_usuario(id) rechaza todos los tokens del usuario emitidos antes
+  de ese momento (cambio de rol, desactivación, eliminación).
+- revocar_token(token) rechaza un token concreto por su jti (logout,
+  rotación del refresh).
+Las revocaciones se escriben en la tabla y luego en la caché. Una lectura
+que no encuentra la llave en caché consulta la tabla y guarda el
+resultado: el positivo hasta que vence la revocación, el negativo solo
+CACHE_NEGATIVA segundos. Así una entrada desalojada o una caché que no se
+comparte vuelven a la tabla en lugar de aceptar un token revocado.
+El refresh vuelve a leer el usuario, así que tras revocar a un usuario
+activo basta con renovar el access para obtener los claims actuales.
+"""
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import RevocacionToken, Usuario
+
+# Segundos que se recuerda en caché que un token o usuario no está revocado
+CACHE_NEGATIVA = 30
+
+def _clave_usuario(id_usuario):
+    return f'jwt_revocado_usuario_{id_usuario}'
+
+
+def _clave_token(jti):
+    return f'jwt_revocado_token_{jti}'
+
+
+def agregar_claims(token, usuario):
+    for campo in Usuario.CAMPOS_TOKEN:
+        token[campo] = getattr(usuario, campo)
+    # iat tiene resolución de segundos; 'emitido' permite distinguir un
+    # refresh hecho en el mismo segundo que la revocación
+    token['emitido'] = time.time()
+    return token
+
+
+def _vencimiento(segundos_epoch):
+    return datetime.fromtimestamp(segundos_epoch, tz=dt_timezone.utc)
+
+
+def revocar_usuario(id_usuario):
+    """
+    Invalida los tokens del usuario emitidos hasta ahora. Dura lo que un
+    refresh: después ya no queda ningún token anterior válido.
+    """
+    ahora = time.time()
+    duracion = int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+    RevocacionToken.objects.create(
+        id_usuario=id_usuario,
+        revocado_desde=ahora,
+        expira=_vencimiento(ahora + duracion)
+    )
+    cache.set(_clave_usuario(id_usuario), ahora, timeout=duracion)
+
+
+def revocar_token(token):
+    """
+    Invalida un token concreto hasta su expiración.
+    """
+    ahora = time.time()
+    restante = int(token['exp'] - ahora)
+    if restante > 0:
+        jti = token[api_settings.JTI_CLAIM]
+        RevocacionToken.objects.bulk_create([RevocacionToken(
+            id_usuario=token[api_settings.USER_ID_CLAIM],
+            jti=jti,
+            revocado_desde=ahora,
+            expira=_vencimiento(token['exp'])
+        )], ignore_conflicts=True)
+        cache.set(_clave_token(jti), True, timeout=restante)
+
+
+def _leer_revocaciones(jti, id_usuario, por_usuario):
+    """
+    Lee de la tabla si el jti está revocado y el corte más reciente del
+    usuario (0 si no tiene), y los deja en caché.
+    """
+    condicion = Q(jti=jti)
+    if por_usuario:
+        condicion |= Q(id_usuario=id_usuario, jti__isnull=True)
+    filas = RevocacionToken.objects.filter(
+        condicion, expira__gt=timezone.now()
+    ).values_list('jti', 'revocado_desde', 'expira')
+
+    token_revocado = False
+    revocado_desde = 0
+    vence_usuario = None
+    for jti_fila, desde, expira in filas:
+        if jti_fila is not None:
+            token_revocado = True
+        elif desde > revocado_desde:
+            revocado_desde, vence_usuario = desde, expira
+
+    ahora = timezone.now()
+    valores = {_clave_token(jti): token_revocado}
+    if por_usuario:
+        valores[_clave_usuario(id_usuario)] = revocado_desde
+    cache.set_many(valores, timeout=CACHE_NEGATIVA)
+    if vence_usuario is not None:
+        cache.set(
+            _clave_usuario(id_usuario), revocado_desde,
+            timeout=max(1, int((vence_usuario - ahora).total_seconds()))
+        )
+    return token_revocado, revocado_desde
+
+
+def esta_revocado(token, por_usuario=True):
+    """
+    Consulta las dos listas en una sola lectura a la caché y, si falta
+    alguna, en una sola consulta a la tabla. Con por_usuario=False solo se
+    mira el jti: un refresh emitido antes de revocar al usuario sigue
+    sirviendo para obtener claims actualizados.
+    """
+    jti = token.get(api_settings.JTI_CLAIM)
+    id_usuario = token.get(api_settings.USER_ID_CLAIM)
+    clave_token = _clave_token(jti)
+    clave_usuario = _clave_usuario(id_usuario)
+    claves = [clave_token, clave_usuario] if por_usuario else [clave_token]
+    revocados = cache.get_many(claves)
+    if len(revocados) < len(claves):
+        token_revocado, revocado_desde = _leer_revocaciones(jti, id_usuario, por_usuario)
+    else:
+        token_revocado = revocados[clave_token]
+        revocado_desde = revocados.get(clave_usuario, 0)
+    if token_revocado:
+        return True
+    return por_usuario and bool(revocado_desde) and token.get('emitido', 0) <= revocado_desde
+
+
+class UsuarioToken(TokenUser):
+    """
+    Usuario construido solo con los claims del token. Tiene los atributos
+    que leen los permisos y las vistas; usuario carga la fila completa
+    cuando hace falta (una consulta, solo la primera vez).
+    """
+
+    @property
+    def id_usuario(self):
+        return self.id
+
+    @cached_property
+    def tipo_usuario(self):
+        return self.token.get('tipo_usuario')
+
+    @cached_property
+    def is_active(self):
+        return self.token.get('is_active', False)
+
+    @cached_property
+    def is_staff(self):
+        return self.token.get('is_staff', False)
+
+    @cached_property
+    def nombre_usuario(self):
+        return self.token.get('nombre_usuario', '')
+
+    @cached_property
+    def usuario(self):
+        return Usuario.objects.get(pk=self.pk)
+
+
+class JWTSinConsultaAuthentication(JWTStatelessUserAuthentication):
+    """
+    Valida firma y expiración, consulta la lista de denegación y devuelve
+    un UsuarioToken. Los tokens sin tipo_usuario (emitidos antes de
+    incluir los claims) se rechazan para que el cliente los renueve.
+    """
+
+    def get_user(self, validated_token):
+        if 'tipo_usuario' not in validated_token:
+            raise InvalidToken('El token no incluye el rol del usuario')
+        if esta_revocado(validated_token):
+            raise InvalidToken('El token fue revocado')
+        usuario = super().get_user(validated_token)
+        if not usuario.is_active:
+            raise InvalidToken('Usuario inactivo')
+        return usuario
+
+
+class TokenConClaimsSerializer(TokenObtainPairSerializer):
+
+    @classmethod
+    def get_token(cls, user):
+        return agregar_claims(super().get_token(user), user)
+
+
+class RefreshConClaimsSerializer(TokenRefreshSerializer):
+    """
+    Renueva los claims desde la base de datos (una consulta por refresh)
+    y revoca el refresh anterior al rotarlo.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if esta_revocado(refresh, por_usuario=False):
+            raise InvalidToken('El token fue revocado')
+
+        usuario = Usuario.objects.filter(
+            pk=refresh[api_settings.USER_ID_CLAIM], is_active=True
+        ).first()
+        if usuario is None:
+            raise InvalidToken('Usuario inactivo o inexistente')
+        agregar_claims(refresh, usuario)
+
+        data = {'access': str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                revocar_token(refresh)
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        return data
@@ -0,0 +1,76 @@
+# apps/usuarios/management/commands/benchmark_autenticacion.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from apps.inventario.views import CategoriaViewSet
+from apps.usuarios.autenticacion import JWTSinConsultaAuthentication, TokenConClaimsSerializer
+from apps.usuarios.models import Usuario
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara peticiones por segundo de un GET autenticado con '
+        'JWTAuthentication (carga Usuario) y JWTSinConsultaAuthentication '
+        '(claims del token). El usuario se crea dentro de una transacción '
+        'que se revierte.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--peticiones', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._ejecutar(options['peticiones'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _ejecutar(self, total):
+        usuario = Usuario.objects.create_user(
+            email='benchmark_autenticacion@example.com',
+            password='benchmark',
+            nombre_usuario='benchmark_autenticacion',
+            tipo_usuario='cajero'
+        )
+        acceso = str(TokenConClaimsSerializer.get_token(usuario).access_token)
+        fabrica = APIRequestFactory()
+
+        self.stdout.write(f'{"autenticación":<32} {"consultas":>10} {"pet/s":>10}')
+        for clase in (JWTAuthentication, JWTSinConsultaAuthentication):
+            vista = CategoriaViewSet.as_view({'get': 'list'}, authentication_classes=[clase])
+
+            # Con If-None-Match la vista responde 304 sin consultar
+            # categorías: lo que queda es el costo de autenticar
+            respuesta = vista(fabrica.get(
+                '/api/inventario/categorias/',
+                HTTP_AUTHORIZATION=f'Bearer {acceso}', HTTP_HOST='localhost'
+            ))
+            etag = respuesta['ETag']
+
+            def peticion():
+                return vista(fabrica.get(
+                    '/api/inventario/categorias/',
+                    HTTP_AUTHORIZATION=f'Bearer {acceso}',
+                    HTTP_IF_NONE_MATCH=etag,
+                    HTTP_HOST='localhost'
+                ))
+
+            with CaptureQueriesContext(connection) as consultas:
+                assert peticion().status_code == 304
+            inicio = time.perf_counter()
+            for _ in range(total):
+                peticion()
+            duracion = time.perf_counter() - inicio
+            self.stdout.write(
+                f'{clase.__name__:<32} {len(consultas):>10} {total / duracion:>10.0f}'
+            )
@@ -0,0 +1,16 @@
+# apps/usuarios/management/commands/depurar_revocaciones.py
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.usuarios.models import RevocacionToken
+
+
+class Command(BaseCommand):
+    help = (
+        'Borra las revocaciones de tokens ya vencidas: los tokens que '
+        'cubrían expiraron y se rechazan por su propia fecha.'
+    )
+
+    def handle(self, *args, **options):
+        borradas, _ = RevocacionToken.objects.filter(expira__lte=timezone.now()).delete()
+        self.stdout.write(self.style.SUCCESS(f'{borradas} revocaciones depuradas'))
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.9 on 2026-10-18 18:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevocacionToken',
+            fields=[
+                ('id_revocacion', models.BigAutoField(primary_key=True, serialize=False)),
+                ('id_usuario', models.IntegerField()),
+                ('jti', models.CharField(blank=True, max_length=255, null=True, unique=True)),
+                ('revocado_desde', models.FloatField()),
+                ('expira', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Revocación de token',
+                'verbose_name_plural': 'Revocaciones de tokens',
+                'db_table': 'Revocacion_Token',
+                'indexes': [models.Index(fields=['id_usuario', 'revocado_desde'], name='revocacion_usuario_idx')],
+            },
+        ),
+    ]
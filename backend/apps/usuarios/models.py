@@ -35,6 +35,22 @@ class Usuario(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['nombre_usuario', 'tipo_usuario']
 
+    # Campos que viajan como claims en los JWT (ver autenticacion.py); la
+    # señal revocar_tokens_usuario compara sus valores al guardar
+    CAMPOS_TOKEN = ('tipo_usuario', 'is_active', 'is_staff', 'nombre_usuario')
+    _claims_originales = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        valores = dict(zip(field_names, values))
+        if all(campo in valores for campo in cls.CAMPOS_TOKEN):
+            instance._claims_originales = tuple(valores[campo] for campo in cls.CAMPOS_TOKEN)
+        return instance
+
+    def claims_token(self):
+        return tuple(getattr(self, campo) for campo in self.CAMPOS_TOKEN)
+
     class Meta:
         db_table = 'Usuario'  # Link to your SQL table
         verbose_name = 'Usuario'
@@ -58,3 +74,28 @@ class Persona(models.Model):
         return f"{self.nombre} {self.apellido}"
 
 
+
+class RevocacionToken(models.Model):
+    """
+    Lista de denegación de JWT (ver autenticacion.py). Con jti, revoca ese
+    token; sin jti, todos los tokens del usuario emitidos hasta
+    revocado_desde. id_usuario no es llave foránea para que la revocación
+    sobreviva a la eliminación del usuario. Las filas vencidas las borra
+    el comando depurar_revocaciones.
+    """
+    id_revocacion = models.BigAutoField(primary_key=True)
+    id_usuario = models.IntegerField()
+    jti = models.CharField(max_length=255, unique=True, null=True, blank=True)
+    revocado_desde = models.FloatField()  # segundos epoch, como el claim 'emitido'
+    expira = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = 'Revocacion_Token'
+        verbose_name = 'Revocación de token'
+        verbose_name_plural = 'Revocaciones de tokens'
+        indexes = [
+            models.Index(fields=['id_usuario', 'revocado_desde'], name='revocacion_usuario_idx'),
+        ]
+
+    def __str__(self):
+        return self.jti or f'usuario {self.id_usuario}'
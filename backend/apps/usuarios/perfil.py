@@ -0,0 +1,58 @@
+# apps/usuarios/perfil.py
+"""
+Perfil del usuario actual (/api/usuarios/me/).
+
+La respuesta se arma con una sola consulta (Usuario + Persona) y se
+cachea bajo una llave con la versión 'perfil_<id>'; las señales de
+Usuario y Persona incrementan esa versión al confirmar.
+"""
+from django.core.cache import cache
+
+from apps.inventario.utils import obtener_versiones
+
+from .models import Usuario
+from .serializers import PersonaSerializer, UsuarioSerializer
+
+CACHE_TIMEOUT = 300
+
+
+def nombre_version_perfil(id_usuario):
+    return f'perfil_{id_usuario}'
+
+
+def _permisos(tipo_usuario):
+    return {
+        'es_administrador': tipo_usuario == 'administrador',
+        'es_cajero': tipo_usuario in ['administrador', 'cajero'],
+        'puede_gestionar_inventario': tipo_usuario in ['administrador', 'cajero'],
+        'puede_gestionar_ventas': tipo_usuario in ['administrador', 'cajero'],
+        'puede_gestionar_clientes': True,  # Ajusta según tus necesidades
+    }
+
+
+def construir_perfil(usuario):
+    """
+    usuario debe venir con persona en select_related.
+    """
+    persona = getattr(usuario, 'persona', None)
+    return {
+        **UsuarioSerializer(usuario).data,
+        'persona': PersonaSerializer(persona).data if persona else None,
+        'permisos': _permisos(usuario.tipo_usuario),
+    }
+
+
+def obtener_perfil(id_usuario):
+    """
+    Devuelve el perfil desde la caché o None si el usuario no existe.
+    """
+    nombre = nombre_version_perfil(id_usuario)
+    cache_key = f'{nombre}_{obtener_versiones(nombre)[nombre]}'
+    perfil = cache.get(cache_key)
+    if perfil is None:
+        usuario = Usuario.objects.select_related('persona').filter(pk=id_usuario).first()
+        if usuario is None:
+            return None
+        perfil = construir_perfil(usuario)
+        cache.set(cache_key, perfil, CACHE_TIMEOUT)
+    return perfil
@@ -59,7 +59,7 @@ class VentasPermission(permissions.BasePermission):
 
         # Cajeros solo pueden ver y modificar sus propias ventas
         if request.user.tipo_usuario == 'cajero':
-            return obj.id_usuario == request.user.id and request.method in self.CAJERO_METHODS
+            return obj.id_usuario_id == request.user.pk and request.method in self.CAJERO_METHODS
 
         return False
 
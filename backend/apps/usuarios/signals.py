@@ -1,7 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
+from apps.inventario.utils import incrementar_version
+from .autenticacion import revocar_usuario
 from .models import Persona
+from .perfil import nombre_version_perfil
 
 Usuario = get_user_model()
 
@@ -12,4 +15,22 @@ def create_persona(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=Usuario)
 def save_persona(sender, instance, **kwargs):
-    instance.persona.save()
\ No newline at end of file
+    instance.persona.save()
+
+@receiver(post_save, sender=Usuario)
+def revocar_tokens_usuario(sender, instance, created, **kwargs):
+    # Los tokens emitidos llevan rol y estado como claims: si cambian,
+    # dejan de aceptarse y el cliente debe renovarlos
+    if not created and instance._claims_originales != instance.claims_token():
+        revocar_usuario(instance.pk)
+    instance._claims_originales = instance.claims_token()
+
+@receiver(post_delete, sender=Usuario)
+def revocar_tokens_usuario_eliminado(sender, instance, **kwargs):
+    revocar_usuario(instance.pk)
+
+@receiver([post_save, post_delete], sender=Usuario)
+@receiver([post_save, post_delete], sender=Persona)
+def invalidar_perfil(sender, instance, **kwargs):
+    id_usuario = instance.pk if sender is Usuario else instance.id_usuario_id
+    incrementar_version(nombre_version_perfil(id_usuario))
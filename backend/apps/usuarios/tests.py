@@ -0,0 +1,58 @@
+# apps/usuarios/tests.py
+from django.core.cache import caches
+from django.test import TestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .autenticacion import agregar_claims, esta_revocado, revocar_token, revocar_usuario
+from .models import Usuario
+
+
+def limpiar_caches():
+    for alias in ('compartida', 'default', 'stock'):
+        caches[alias].clear()
+
+
+class RevocacionTest(TestCase):
+
+    def setUp(self):
+        limpiar_caches()
+        self.usuario = Usuario.objects.create_user(
+            email='cajero@axolpos.local', password=None,
+            nombre_usuario='cajero', tipo_usuario='cajero'
+        )
+        self.refresh = agregar_claims(RefreshToken.for_user(self.usuario), self.usuario)
+        self.access = self.refresh.access_token
+
+    def test_token_no_revocado(self):
+        self.assertFalse(esta_revocado(self.access))
+        with self.assertNumQueries(0):
+            self.assertFalse(esta_revocado(self.access))
+
+    def test_revocacion_de_token_sobrevive_a_la_cache(self):
+        revocar_token(self.access)
+        self.assertTrue(esta_revocado(self.access))
+
+        limpiar_caches()
+        with self.assertNumQueries(1):
+            self.assertTrue(esta_revocado(self.access))
+        self.assertFalse(esta_revocado(self.refresh, por_usuario=False))
+
+    def test_revocacion_de_usuario_sobrevive_a_la_cache(self):
+        revocar_usuario(self.usuario.pk)
+        limpiar_caches()
+        self.assertTrue(esta_revocado(self.access))
+        # El refresh sigue sirviendo para obtener claims nuevos
+        self.assertFalse(esta_revocado(self.refresh, por_usuario=False))
+
+        nuevo = agregar_claims(RefreshToken.for_user(self.usuario), self.usuario)
+        self.assertFalse(esta_revocado(nuevo.access_token))
+
+    def test_revocar_despues_de_cachear_el_negativo(self):
+        self.assertFalse(esta_revocado(self.access))
+        revocar_token(self.access)
+        self.assertTrue(esta_revocado(self.access))
+
+    def test_revocacion_sobrevive_a_la_eliminacion(self):
+        self.usuario.delete()
+        limpiar_caches()
+        self.assertTrue(esta_revocado(self.access))
@@ -3,27 +3,37 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.inventario.utils import incrementar_version
+from .autenticacion import revocar_token
 from .models import Usuario, Persona
+from .perfil import nombre_version_perfil, obtener_perfil
 from .serializers import UsuarioSerializer, PersonaSerializer
+from myproject.mixins import GetCondicionalMixin, PlanConsultasMixin
 
 class IsOwnerOrAdmin(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj == request.user or request.user.is_staff
+        # request.user es un UsuarioToken: se compara por id
+        propietario = obj.id_usuario_id if isinstance(obj, Persona) else obj.pk
+        return propietario == request.user.pk or request.user.is_staff
 
-class UsuarioViewSet(viewsets.ModelViewSet):
+class UsuarioViewSet(PlanConsultasMixin, viewsets.ModelViewSet):
     queryset = Usuario.objects.all()
     serializer_class = UsuarioSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
+    plan_consultas = {
+        'default': {'select_related': ('persona',)},
+    }
 
     def get_queryset(self):
+        queryset = super().get_queryset()
         if self.request.user.is_staff:
-            return Usuario.objects.all()
-        return Usuario.objects.filter(id_usuario=self.request.user.id_usuario)
+            return queryset
+        return queryset.filter(id_usuario=self.request.user.id_usuario)
 
     @action(detail=False, methods=['get'])
     def me(self, request):
-        serializer = self.get_serializer(request.user)
+        serializer = self.get_serializer(self.get_queryset().get(pk=request.user.pk))
         return Response(serializer.data)
 
 class PersonaViewSet(viewsets.ModelViewSet):
@@ -34,51 +44,34 @@ class PersonaViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         if self.request.user.is_staff:
             return Persona.objects.all()
-        return Persona.objects.filter(usuario=self.request.user)
+        return Persona.objects.filter(id_usuario=self.request.user.pk)
 
 
-class CurrentUserView(APIView):
-    authentication_classes = [JWTAuthentication]
+class CurrentUserView(GetCondicionalMixin, APIView):
+    """
+    Perfil del usuario autenticado. Se sirve desde la caché (perfil.py)
+    con ETag, así que las recargas del frontend suelen terminar en 304.
+    """
     permission_classes = [permissions.IsAuthenticated]
 
-    def get(self, request):
-        try:
-            # Obtener el usuario actual con sus datos relacionados
-            usuario = request.user
-            
-            # Obtener los datos de persona relacionados
-            try:
-                persona = Persona.objects.get(usuario=usuario)
-                persona_serializer = PersonaSerializer(persona)
-                persona_data = persona_serializer.data
-            except ObjectDoesNotExist:
-                persona_data = None
+    def get_versiones_condicionales(self):
+        return (nombre_version_perfil(self.request.user.pk),)
 
-            # Serializar datos del usuario
-            usuario_serializer = UsuarioSerializer(usuario)
-            response_data = {
-                **usuario_serializer.data,
-                'persona': persona_data,
-                'permisos': {
-                    'es_administrador': usuario.tipo_usuario == 'administrador',
-                    'es_cajero': usuario.tipo_usuario in ['administrador', 'cajero'],
-                    'puede_gestionar_inventario': usuario.tipo_usuario in ['administrador', 'cajero'],
-                    'puede_gestionar_ventas': usuario.tipo_usuario in ['administrador', 'cajero'],
-                    'puede_gestionar_clientes': True,  # Ajusta según tus necesidades
-                }
-            }
+    def get(self, request):
+        return self.respuesta_condicional(request, self._perfil)
 
-            return Response(response_data, status=status.HTTP_200_OK)
-            
-        except Exception as e:
+    def _perfil(self, request):
+        perfil = obtener_perfil(request.user.pk)
+        if perfil is None:
             return Response(
-                {'error': 'Error al obtener datos del usuario', 'detail': str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {'error': 'Usuario no encontrado'},
+                status=status.HTTP_404_NOT_FOUND
             )
+        return Response(perfil)
 
     def patch(self, request):
         try:
-            usuario = request.user
+            usuario = Usuario.objects.select_related('persona').get(pk=request.user.pk)
             serializer = UsuarioSerializer(usuario, data=request.data, partial=True)
             
             if serializer.is_valid():
@@ -90,6 +83,9 @@ class CurrentUserView(APIView):
                     )
                 
                 serializer.save()
+                # Las señales ya lo hacen al guardar Usuario/Persona; se
+                # repite por si la actualización no tocó ninguno de los dos
+                incrementar_version(nombre_version_perfil(usuario.pk))
                 return Response(serializer.data)
             
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -102,7 +98,6 @@ class CurrentUserView(APIView):
 
 class LogoutView(APIView):
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
 
     def post(self, request):
         try:
@@ -113,8 +108,10 @@ class LogoutView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            token = RefreshToken(refresh_token)
-            token.blacklist()
+            # Lista de denegación en caché: ni el refresh ni el access
+            # actual vuelven a aceptarse
+            revocar_token(RefreshToken(refresh_token))
+            revocar_token(request.auth)
             
             return Response(
                 {"detail": "Sesión cerrada exitosamente"},
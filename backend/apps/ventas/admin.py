@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Cliente, Venta, DetalleVenta
+from .models import Cliente, Venta, DetalleVenta, ResumenVentaDiario
 
 class DetalleVentaInline(admin.TabularInline):
     model = DetalleVenta
@@ -23,6 +23,9 @@ class DetalleVentaAdmin(admin.ModelAdmin):
     list_filter = ('id_venta__fecha',)
     search_fields = ('id_venta__id_venta', 'id_producto__nombre')
 
-
-
-
+@admin.register(ResumenVentaDiario)
+class ResumenVentaDiarioAdmin(admin.ModelAdmin):
+    list_display = ('fecha', 'id_usuario', 'metodo_pago', 'estado', 'num_ventas', 'total', 'unidades')
+    list_filter = ('fecha', 'metodo_pago', 'estado')
+    date_hierarchy = 'fecha'
+    readonly_fields = ('fecha', 'id_usuario', 'metodo_pago', 'estado', 'num_ventas', 'total', 'unidades')
@@ -0,0 +1,76 @@
+# apps/ventas/management/commands/benchmark_checkout.py
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.inventario.models import Producto
+from apps.usuarios.models import Usuario
+from apps.ventas.services import registrar_venta
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide la latencia y el número de consultas de registrar_venta '
+        'para tickets de 1, 10, 100 y 500 líneas. Todos los datos se '
+        'crean dentro de una transacción que se revierte al terminar.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lineas', nargs='+', type=int, default=[1, 10, 100, 500])
+        parser.add_argument('--repeticiones', type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._ejecutar(options['lineas'], options['repeticiones'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _ejecutar(self, tamanos, repeticiones):
+        usuario = Usuario.objects.create_user(
+            email='benchmark@axolpos.local',
+            password=None,
+            nombre_usuario='benchmark_checkout',
+            tipo_usuario='cajero'
+        )
+        Producto.objects.bulk_create([
+            Producto(
+                codigo_barras=f'BENCH-{i:06d}',
+                nombre=f'Producto benchmark {i}',
+                descripcion='',
+                precio=Decimal('10.00'),
+                stock=10 ** 9
+            )
+            for i in range(max(tamanos))
+        ])
+        ids = list(
+            Producto.objects.filter(codigo_barras__startswith='BENCH-')
+            .order_by('id_producto').values_list('id_producto', flat=True)
+        )
+
+        self.stdout.write(f'{"líneas":>8} {"consultas":>10} {"media ms":>10} {"p95 ms":>10}')
+        for tamano in tamanos:
+            detalles = [
+                {'id_producto': id_producto, 'cantidad': 1, 'precio_unitario': Decimal('10.00')}
+                for id_producto in ids[:tamano]
+            ]
+            tiempos = []
+            for _ in range(repeticiones):
+                with CaptureQueriesContext(connection) as consultas:
+                    inicio = time.perf_counter()
+                    registrar_venta(usuario, detalles, metodo_pago='efectivo')
+                    tiempos.append((time.perf_counter() - inicio) * 1000)
+            tiempos.sort()
+            p95 = tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))]
+            self.stdout.write(
+                f'{tamano:>8} {len(consultas):>10} '
+                f'{sum(tiempos) / len(tiempos):>10.2f} {p95:>10.2f}'
+            )
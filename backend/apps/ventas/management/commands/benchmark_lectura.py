@@ -0,0 +1,107 @@
+# apps/ventas/management/commands/benchmark_lectura.py
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.inventario.models import Categoria, Producto
+from apps.inventario.views import ProductoViewSet
+from apps.usuarios.models import Usuario
+from apps.ventas.models import Venta, DetalleVenta
+from apps.ventas.views import VentaViewSet
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara filas por segundo del listado de productos y ventas con el '
+        'serializador completo y con la lectura rápida desde .values(). '
+        'Los datos se crean dentro de una transacción que se revierte.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=500)
+        parser.add_argument('--lineas', type=int, default=3)
+        parser.add_argument('--repeticiones', type=int, default=10)
+        parser.add_argument('--fields', default='', help='Campos dispersos, p. ej. id_producto,nombre')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._ejecutar(options)
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _ejecutar(self, options):
+        filas = min(options['filas'], 500)
+        usuario = Usuario.objects.create_user(
+            email='lectura@axolpos.local',
+            password=None,
+            nombre_usuario='benchmark_lectura',
+            tipo_usuario='administrador'
+        )
+        categoria = Categoria.objects.create(nombre='Benchmark lectura')
+        Producto.objects.bulk_create([
+            Producto(
+                codigo_barras=f'LECT-{i:06d}',
+                nombre=f'Producto {i}',
+                descripcion='',
+                precio=Decimal('10.00'),
+                stock=100,
+                categoria=categoria
+            )
+            for i in range(filas)
+        ])
+        productos = list(
+            Producto.objects.filter(codigo_barras__startswith='LECT-')
+            .values_list('id_producto', flat=True)
+        )
+        Venta.objects.bulk_create([
+            Venta(
+                id_usuario=usuario, fecha=timezone.localdate(),
+                total=Decimal('10.00') * options['lineas'],
+                metodo_pago='efectivo', estado='completada'
+            )
+            for _ in range(filas)
+        ])
+        ventas = list(
+            Venta.objects.filter(id_usuario=usuario).values_list('id_venta', flat=True)
+        )
+        DetalleVenta.objects.bulk_create([
+            DetalleVenta(
+                id_venta_id=id_venta,
+                id_producto_id=productos[(i + linea) % len(productos)],
+                cantidad=1, precio_unitario=Decimal('10.00'), subtotal=Decimal('10.00')
+            )
+            for i, id_venta in enumerate(ventas)
+            for linea in range(options['lineas'])
+        ])
+
+        parametros = {'limite': filas}
+        if options['fields']:
+            parametros['fields'] = options['fields']
+        fabrica = APIRequestFactory()
+
+        self.stdout.write(f'{"endpoint":<12} {"modo":<10} {"filas/s":>12} {"media ms":>10}')
+        for nombre, vista in (('productos', ProductoViewSet), ('ventas', VentaViewSet)):
+            for modo, rapida in (('serializer', False), ('values', True)):
+                accion = vista.as_view({'get': 'list'}, lectura_rapida=rapida)
+                tiempos = []
+                for _ in range(options['repeticiones']):
+                    peticion = fabrica.get('/', parametros, HTTP_HOST='localhost')
+                    force_authenticate(peticion, user=usuario)
+                    inicio = time.perf_counter()
+                    respuesta = accion(peticion)
+                    tiempos.append(time.perf_counter() - inicio)
+                media = sum(tiempos) / len(tiempos)
+                devueltas = len(respuesta.data['results'])
+                self.stdout.write(
+                    f'{nombre:<12} {modo:<10} {devueltas / media:>12.0f} {media * 1000:>10.2f}'
+                )
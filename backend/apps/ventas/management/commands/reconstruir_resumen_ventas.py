@@ -0,0 +1,74 @@
+# apps/ventas/management/commands/reconstruir_resumen_ventas.py
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Min, Max, Sum
+
+from apps.ventas.models import Venta, DetalleVenta, ResumenVentaDiario
+
+
+class Command(BaseCommand):
+    help = (
+        'Reconstruye ResumenVentaDiario a partir del historial de ventas, '
+        'procesando el rango de fechas en bloques de días.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', type=date.fromisoformat, help='Fecha inicial (YYYY-MM-DD)')
+        parser.add_argument('--hasta', type=date.fromisoformat, help='Fecha final (YYYY-MM-DD)')
+        parser.add_argument('--dias', type=int, default=31, help='Días por bloque')
+
+    def handle(self, *args, **options):
+        limites = Venta.objects.aggregate(primera=Min('fecha'), ultima=Max('fecha'))
+        desde = options['desde'] or limites['primera']
+        hasta = options['hasta'] or limites['ultima']
+        if desde is None or hasta is None:
+            self.stdout.write('No hay ventas registradas')
+            return
+        if desde > hasta:
+            raise CommandError('--desde debe ser anterior a --hasta')
+
+        filas = 0
+        inicio = desde
+        while inicio <= hasta:
+            fin = min(inicio + timedelta(days=options['dias'] - 1), hasta)
+            filas += self._reconstruir(inicio, fin)
+            self.stdout.write(f'{inicio} a {fin}: listo')
+            inicio = fin + timedelta(days=1)
+
+        self.stdout.write(self.style.SUCCESS(f'{filas} filas de resumen generadas'))
+
+    @transaction.atomic
+    def _reconstruir(self, inicio, fin):
+        campos = ('fecha', 'id_usuario', 'metodo_pago', 'estado')
+        ventas = (
+            Venta.objects.filter(fecha__range=(inicio, fin))
+            .values(*campos)
+            .annotate(num_ventas=Count('id_venta'), total=Sum('total'))
+            .order_by()
+        )
+        # Las unidades se agregan aparte para no multiplicar el total por el JOIN
+        unidades = {
+            tuple(fila[f'id_venta__{campo}'] for campo in campos): fila['unidades']
+            for fila in DetalleVenta.objects.filter(id_venta__fecha__range=(inicio, fin))
+            .values(*(f'id_venta__{campo}' for campo in campos))
+            .annotate(unidades=Sum('cantidad'))
+            .order_by()
+        }
+
+        ResumenVentaDiario.objects.filter(fecha__range=(inicio, fin)).delete()
+        resumenes = [
+            ResumenVentaDiario(
+                fecha=fila['fecha'],
+                id_usuario_id=fila['id_usuario'],
+                metodo_pago=fila['metodo_pago'],
+                estado=fila['estado'],
+                num_ventas=fila['num_ventas'],
+                total=fila['total'] or 0,
+                unidades=unidades.get(tuple(fila[campo] for campo in campos), 0)
+            )
+            for fila in ventas
+        ]
+        ResumenVentaDiario.objects.bulk_create(resumenes, batch_size=1000)
+        return len(resumenes)
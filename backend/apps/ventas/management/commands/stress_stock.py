@@ -0,0 +1,121 @@
+# apps/ventas/management/commands/stress_stock.py
+import multiprocessing
+import time
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, OperationalError
+
+from apps.inventario.models import Producto, MovimientoInventario
+from apps.usuarios.models import Usuario
+from apps.ventas.models import Venta
+from apps.ventas.services import registrar_venta
+
+
+def _vender(id_producto, id_usuario, ventas, cola):
+    """
+    Proceso hijo: registra `ventas` ventas de una unidad del mismo producto.
+    """
+    connections.close_all()
+    usuario = Usuario.objects.get(id_usuario=id_usuario)
+    detalles = [{'id_producto': id_producto, 'cantidad': 1, 'precio_unitario': Decimal('1.00')}]
+    exitosas = rechazadas = reintentos = 0
+
+    for _ in range(ventas):
+        while True:
+            try:
+                registrar_venta(usuario, detalles, metodo_pago='efectivo')
+                exitosas += 1
+            except ValidationError:
+                rechazadas += 1
+            except OperationalError:
+                # SQLite serializa las escrituras ("database is locked")
+                reintentos += 1
+                time.sleep(0.001)
+                continue
+            break
+
+    connections.close_all()
+    cola.put((exitosas, rechazadas, reintentos))
+
+
+class Command(BaseCommand):
+    help = (
+        'Prueba de estrés: varios procesos venden en paralelo el mismo '
+        'producto. Verifica que el stock nunca quede negativo y que '
+        'coincida con las ventas registradas, y reporta el throughput.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--procesos', type=int, default=8)
+        parser.add_argument('--ventas', type=int, default=2000, help='Ventas totales')
+        parser.add_argument('--stock', type=int, default=1500, help='Stock inicial del producto')
+        parser.add_argument('--conservar', action='store_true', help='No borrar los datos generados')
+
+    def handle(self, *args, **options):
+        procesos = options['procesos']
+        por_proceso = options['ventas'] // procesos
+        stock_inicial = options['stock']
+
+        usuario = Usuario.objects.create_user(
+            email='stress@axolpos.local',
+            password=None,
+            nombre_usuario='stress_stock',
+            tipo_usuario='cajero'
+        )
+        producto = Producto.objects.create(
+            codigo_barras='STRESS-0001',
+            nombre='Producto stress',
+            descripcion='',
+            precio=Decimal('1.00'),
+            stock=stock_inicial
+        )
+
+        try:
+            connections.close_all()
+            contexto = multiprocessing.get_context('fork')
+            cola = contexto.Queue()
+            hijos = [
+                contexto.Process(
+                    target=_vender,
+                    args=(producto.id_producto, usuario.id_usuario, por_proceso, cola)
+                )
+                for _ in range(procesos)
+            ]
+            inicio = time.perf_counter()
+            for hijo in hijos:
+                hijo.start()
+            resultados = [cola.get() for _ in hijos]
+            for hijo in hijos:
+                hijo.join()
+            duracion = time.perf_counter() - inicio
+
+            exitosas = sum(r[0] for r in resultados)
+            rechazadas = sum(r[1] for r in resultados)
+            reintentos = sum(r[2] for r in resultados)
+            producto.refresh_from_db()
+            minimo = MovimientoInventario.objects.filter(
+                id_producto=producto
+            ).order_by('stock_nuevo').values_list('stock_nuevo', flat=True).first()
+
+            self.stdout.write(f'Procesos:          {procesos}')
+            self.stdout.write(f'Ventas exitosas:   {exitosas}')
+            self.stdout.write(f'Ventas rechazadas: {rechazadas}')
+            self.stdout.write(f'Reintentos:        {reintentos}')
+            self.stdout.write(f'Stock final:       {producto.stock}')
+            self.stdout.write(f'Throughput:        {(exitosas + rechazadas) / duracion:.1f} ventas/s')
+
+            if producto.stock < 0 or (minimo is not None and minimo < 0):
+                raise CommandError('El stock quedó negativo')
+            if producto.stock != stock_inicial - exitosas:
+                raise CommandError(
+                    f'Actualizaciones perdidas: se esperaba stock {stock_inicial - exitosas}'
+                )
+            self.stdout.write(self.style.SUCCESS('Stock consistente'))
+        finally:
+            if not options['conservar']:
+                MovimientoInventario.objects.filter(id_producto=producto).delete()
+                Venta.objects.filter(id_usuario=usuario).delete()
+                producto.delete()
+                usuario.delete()
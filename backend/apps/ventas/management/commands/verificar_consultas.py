@@ -0,0 +1,189 @@
+# apps/ventas/management/commands/verificar_consultas.py
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.inventario.models import Categoria, Producto, MovimientoInventario
+from apps.inventario.views import ProductoViewSet, MovimientoInventarioViewSet
+from apps.usuarios.models import Usuario, Persona
+from apps.usuarios.views import UsuarioViewSet
+from apps.ventas.models import Cliente, Venta, DetalleVenta
+from apps.ventas.views import ClienteViewSet, VentaViewSet, DetalleVentaViewSet
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Comprueba que los endpoints de listado y detalle ejecutan el mismo '
+        'número de consultas sin importar cuántas filas devuelven. Los datos '
+        'se crean dentro de una transacción que se revierte al terminar.'
+    )
+
+    LINEAS_POR_VENTA = 3
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tamanos', nargs='+', type=int, default=[10, 50, 200])
+
+    def handle(self, *args, **options):
+        tamanos = sorted(options['tamanos'])
+        if tamanos[-1] > 500:
+            raise CommandError('El tamaño máximo es 500 (límite de página)')
+
+        try:
+            with transaction.atomic():
+                conteos = self._ejecutar(tamanos)
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+        self.stdout.write(
+            f'{"endpoint":<28}' + ''.join(f'{tamano:>8}' for tamano in tamanos)
+        )
+        variables = []
+        for nombre, por_tamano in conteos.items():
+            self.stdout.write(
+                f'{nombre:<28}' + ''.join(f'{por_tamano[t]:>8}' for t in tamanos)
+            )
+            if len(set(por_tamano.values())) > 1:
+                variables.append(nombre)
+
+        if variables:
+            raise CommandError(
+                f'El número de consultas crece con los datos en: {", ".join(variables)}'
+            )
+        self.stdout.write(self.style.SUCCESS('Número de consultas constante'))
+
+    def _endpoints(self):
+        venta = Venta.objects.order_by('id_venta').first()
+        producto = Producto.objects.order_by('id_producto').first()
+        movimiento = MovimientoInventario.objects.order_by('id_movimiento').first()
+        return [
+            ('ventas list', VentaViewSet, 'list', {}),
+            ('ventas retrieve', VentaViewSet, 'retrieve', {'pk': venta.pk}),
+            ('detalles list', DetalleVentaViewSet, 'list', {}),
+            ('productos list', ProductoViewSet, 'list', {}),
+            ('productos retrieve', ProductoViewSet, 'retrieve', {'pk': producto.pk}),
+            ('movimientos list', MovimientoInventarioViewSet, 'list', {}),
+            ('movimientos retrieve', MovimientoInventarioViewSet, 'retrieve', {'pk': movimiento.pk}),
+            ('clientes list', ClienteViewSet, 'list', {}),
+            ('usuarios list', UsuarioViewSet, 'list', {}),
+        ]
+
+    def _ejecutar(self, tamanos):
+        admin = Usuario.objects.create_user(
+            email='consultas@axolpos.local',
+            password=None,
+            nombre_usuario='verificar_consultas',
+            tipo_usuario='administrador',
+            is_staff=True
+        )
+        fabrica = APIRequestFactory()
+        conteos = {}
+
+        creadas = 0
+        for tamano in tamanos:
+            self._crear_datos(creadas, tamano)
+            creadas = tamano
+
+            for nombre, vista, accion, kwargs in self._endpoints():
+                peticion = fabrica.get('/', {'limite': tamano}, HTTP_HOST='localhost')
+                force_authenticate(peticion, user=admin)
+                with CaptureQueriesContext(connection) as consultas:
+                    respuesta = vista.as_view({'get': accion})(peticion, **kwargs)
+                if respuesta.status_code != 200:
+                    raise CommandError(f'{nombre}: respuesta {respuesta.status_code} {respuesta.data}')
+                conteos.setdefault(nombre, {})[tamano] = len(consultas)
+        return conteos
+
+    def _crear_datos(self, desde, hasta):
+        """
+        Crea las filas desde..hasta-1 de cada tabla, cada una con sus propias
+        relaciones para que cualquier acceso perezoso se note en el conteo.
+        """
+        rango = range(desde, hasta)
+        prefijo = 'CONSULTAS-'
+        Categoria.objects.bulk_create([
+            Categoria(nombre=f'{prefijo}{i}') for i in rango
+        ])
+        categorias = dict(
+            Categoria.objects.filter(nombre__startswith=prefijo)
+            .values_list('nombre', 'id')
+        )
+        Producto.objects.bulk_create([
+            Producto(
+                codigo_barras=f'{prefijo}{i:06d}',
+                nombre=f'Producto {i}',
+                descripcion='',
+                precio=Decimal('10.00'),
+                stock=1000,
+                categoria_id=categorias[f'{prefijo}{i}']
+            )
+            for i in rango
+        ])
+        productos = list(
+            Producto.objects.filter(codigo_barras__startswith=prefijo)
+            .order_by('id_producto').values_list('id_producto', flat=True)
+        )
+        Usuario.objects.bulk_create([
+            Usuario(
+                email=f'cajero{i}@axolpos.local',
+                nombre_usuario=f'{prefijo}{i}',
+                tipo_usuario='cajero'
+            )
+            for i in rango
+        ])
+        usuarios = list(
+            Usuario.objects.filter(nombre_usuario__startswith=prefijo)
+            .order_by('id_usuario').values_list('id_usuario', flat=True)
+        )
+        Persona.objects.bulk_create([
+            Persona(id_usuario_id=usuarios[i], nombre=f'Cajero {i}', apellido='')
+            for i in rango
+        ])
+        Cliente.objects.bulk_create([
+            Cliente(
+                nombre=f'Cliente {i}', apellido='', email=f'cliente{i}@axolpos.local',
+                telefono='', direccion=''
+            )
+            for i in rango
+        ])
+        clientes = list(
+            Cliente.objects.filter(email__startswith='cliente', email__endswith='@axolpos.local')
+            .order_by('id_cliente').values_list('id_cliente', flat=True)
+        )
+
+        hoy = timezone.localdate()
+        total = Decimal('10.00') * self.LINEAS_POR_VENTA
+        ventas = Venta.objects.bulk_create([
+            Venta(
+                id_usuario_id=usuarios[i], id_cliente_id=clientes[i], fecha=hoy,
+                total=total, metodo_pago='efectivo', estado='completada'
+            )
+            for i in rango
+        ])
+        if not all(venta.pk for venta in ventas):
+            ventas = list(Venta.objects.order_by('-id_venta')[:len(rango)])[::-1]
+        DetalleVenta.objects.bulk_create([
+            DetalleVenta(
+                id_venta_id=venta.pk,
+                id_producto_id=productos[(i + linea) % len(productos)],
+                cantidad=1, precio_unitario=Decimal('10.00'), subtotal=Decimal('10.00')
+            )
+            for i, venta in zip(rango, ventas)
+            for linea in range(self.LINEAS_POR_VENTA)
+        ])
+        MovimientoInventario.objects.bulk_create([
+            MovimientoInventario(
+                id_producto_id=productos[i], id_usuario_id=usuarios[i],
+                tipo_movimiento=MovimientoInventario.ENTRADA, cantidad=1,
+                stock_anterior=999, stock_nuevo=1000, descripcion=''
+            )
+            for i in rango
+        ])
@@ -0,0 +1,68 @@
+# apps/ventas/management/commands/verificar_totales.py
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import DecimalField, F, Sum, Value
+from django.db.models.functions import Coalesce
+
+from apps.ventas.models import Venta
+from apps.ventas.services import acumular_resumen, sumar_cambio_resumen
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara Venta.total con la suma de sus detalles en bloques por '
+        'id_venta y, con --reparar, corrige las diferencias con bulk_update '
+        'y ajusta ResumenVentaDiario por la diferencia.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reparar', action='store_true', help='Corregir los totales incorrectos')
+        parser.add_argument('--lote', type=int, default=5000, help='Ventas por bloque')
+
+    def handle(self, *args, **options):
+        lote = options['lote']
+        revisadas = incorrectas = 0
+        ultimo_id = 0
+
+        while True:
+            ventas = list(
+                Venta.objects.filter(id_venta__gt=ultimo_id)
+                .order_by('id_venta')
+                .annotate(calculado=Coalesce(
+                    Sum(F('detalles__cantidad') * F('detalles__precio_unitario')),
+                    Value(Decimal('0.00')),
+                    output_field=DecimalField(max_digits=10, decimal_places=2)
+                ))
+                .only('id_venta', *Venta.CAMPOS_RESUMEN)[:lote]
+            )
+            if not ventas:
+                break
+            ultimo_id = ventas[-1].id_venta
+            revisadas += len(ventas)
+
+            diferencias = [venta for venta in ventas if venta.total != venta.calculado]
+            incorrectas += len(diferencias)
+            for venta in diferencias:
+                self.stdout.write(
+                    f'Venta {venta.id_venta}: total {venta.total}, detalles {venta.calculado}'
+                )
+
+            if options['reparar'] and diferencias:
+                # bulk_update no dispara las señales que mantienen el
+                # resumen diario: se le suma la diferencia de cada venta
+                cambios = {}
+                for venta in diferencias:
+                    sumar_cambio_resumen(
+                        cambios, venta.clave_resumen(), 0, venta.calculado - venta.total, 0
+                    )
+                    venta.total = venta.calculado
+                with transaction.atomic():
+                    Venta.objects.bulk_update(diferencias, ['total'], batch_size=lote)
+                    acumular_resumen(cambios)
+
+        accion = 'corregidas' if options['reparar'] else 'con diferencias'
+        self.stdout.write(self.style.SUCCESS(
+            f'{revisadas} ventas revisadas, {incorrectas} {accion}'
+        ))
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.9 on 2026-10-18 17:06
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('ventas', '0003_venta_clave_idempotencia'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenVentaDiario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('metodo_pago', models.CharField(max_length=15)),
+                ('estado', models.CharField(max_length=20)),
+                ('num_ventas', models.IntegerField(default=0)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('unidades', models.IntegerField(default=0)),
+                ('id_usuario', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='resumenes_venta', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Resumen de Venta Diario',
+                'verbose_name_plural': 'Resúmenes de Venta Diarios',
+                'db_table': 'Resumen_Venta_Diario',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='resumenventadiario',
+            constraint=models.UniqueConstraint(fields=('fecha', 'id_usuario', 'metodo_pago', 'estado'), name='resumen_venta_diario_unico'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.9 on 2026-10-18 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ventas', '0004_resumenventadiario'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='venta',
+            index=models.Index(fields=['fecha', 'id_venta'], name='Venta_fecha_19dc96_idx'),
+        ),
+    ]
@@ -62,6 +62,34 @@ class Venta(models.Model):
         null=True,
         blank=True
     )
+    # Generada por la terminal para que reenviar una venta no la duplique
+    clave_idempotencia = models.CharField(max_length=64, unique=True, null=True, blank=True)
+
+    # (fecha, id_usuario, metodo_pago, estado, total) tal como están en la
+    # base de datos; las señales lo usan para mover la venta entre filas
+    # de ResumenVentaDiario. Si la venta se cargó con .only()/.defer() sin
+    # alguno de estos campos queda en None y las señales lo releen con
+    # leer_original() antes de guardar o borrar.
+    CAMPOS_RESUMEN = ('fecha', 'id_usuario_id', 'metodo_pago', 'estado', 'total')
+    _original = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        valores = dict(zip(field_names, values))
+        if all(campo in valores for campo in cls.CAMPOS_RESUMEN):
+            instance._original = tuple(valores[campo] for campo in cls.CAMPOS_RESUMEN)
+        return instance
+
+    def leer_original(self):
+        """
+        Lee de la base de datos los valores guardados de CAMPOS_RESUMEN
+        (None si la venta no existe).
+        """
+        return Venta.objects.filter(pk=self.pk).values_list(*self.CAMPOS_RESUMEN).first()
+
+    def clave_resumen(self):
+        return (self.fecha, self.id_usuario_id, self.metodo_pago, self.estado)
 
     def actualizar_total(self):
         self.total = self.detalles.aggregate(
@@ -72,6 +100,9 @@ class Venta(models.Model):
         db_table = 'Venta'
         verbose_name = 'Venta'
         verbose_name_plural = 'Ventas'
+        indexes = [
+            models.Index(fields=['fecha', 'id_venta']),
+        ]
 
     def __str__(self):
         return f"Venta {self.id_venta} - {self.id_cliente}"
@@ -93,6 +124,28 @@ class DetalleVenta(models.Model):
     precio_unitario = models.DecimalField(max_digits=10, decimal_places=2)
     subtotal = models.DecimalField(max_digits=10, decimal_places=2)
 
+    # (id_venta, subtotal, cantidad) tal como están en la base de datos; las
+    # señales lo usan para ajustar Venta.total por diferencia. Si el detalle
+    # se cargó con .only()/.defer() o se armó a mano con su pk queda en None
+    # y las señales lo releen con leer_original() antes de guardar o borrar.
+    CAMPOS_TOTAL = ('id_venta_id', 'subtotal', 'cantidad')
+    _original = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        valores = dict(zip(field_names, values))
+        if all(campo in valores for campo in cls.CAMPOS_TOTAL):
+            instance._original = tuple(valores[campo] for campo in cls.CAMPOS_TOTAL)
+        return instance
+
+    def leer_original(self):
+        """
+        Lee de la base de datos los valores guardados de CAMPOS_TOTAL
+        (None si el detalle no existe).
+        """
+        return DetalleVenta.objects.filter(pk=self.pk).values_list(*self.CAMPOS_TOTAL).first()
+
     def save(self, *args, **kwargs):
         self.subtotal = self.cantidad * self.precio_unitario
         super().save(*args, **kwargs)
@@ -103,4 +156,37 @@ class DetalleVenta(models.Model):
         verbose_name_plural = 'Detalles de Venta'
 
     def __str__(self):
-        return f"Detalle {self.id_detalle} - Venta {self.id_venta}"
\ No newline at end of file
+        return f"Detalle {self.id_detalle} - Venta {self.id_venta}"
+
+
+class ResumenVentaDiario(models.Model):
+    """
+    Acumulado de ventas por día, cajero, método de pago y estado.
+    Se mantiene en la misma transacción que el registro y la cancelación
+    de ventas; los reportes leen estas filas en lugar de Venta/Detalle_Venta.
+    """
+    fecha = models.DateField()
+    id_usuario = models.ForeignKey(
+        Usuario,
+        on_delete=models.PROTECT,
+        related_name='resumenes_venta'
+    )
+    metodo_pago = models.CharField(max_length=15)
+    estado = models.CharField(max_length=20)
+    num_ventas = models.IntegerField(default=0)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    unidades = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'Resumen_Venta_Diario'
+        verbose_name = 'Resumen de Venta Diario'
+        verbose_name_plural = 'Resúmenes de Venta Diarios'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['fecha', 'id_usuario', 'metodo_pago', 'estado'],
+                name='resumen_venta_diario_unico'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.fecha} - {self.id_usuario_id} - {self.metodo_pago} - {self.estado}"
@@ -4,6 +4,8 @@ from .models import Cliente, Venta, DetalleVenta
 from apps.usuarios.serializers import UsuarioSerializer
 from apps.inventario.serializers import ProductoSerializer
 from apps.inventario.models import Producto
+from .services import registrar_venta
+
 class ClienteSerializer(serializers.ModelSerializer):
     class Meta:
         model = Cliente
@@ -13,7 +15,6 @@ class DetalleVentaSerializer(serializers.ModelSerializer):
     producto = ProductoSerializer(source='id_producto', read_only=True)
     id_producto = serializers.PrimaryKeyRelatedField(
         write_only=True, 
-        source='id_producto',
         queryset=Producto.objects.all()
     )
 
@@ -22,10 +23,18 @@ class DetalleVentaSerializer(serializers.ModelSerializer):
         fields = ['id_detalle', 'producto', 'id_producto', 'cantidad', 'precio_unitario', 'subtotal']
         read_only_fields = ['id_detalle', 'subtotal']
 
+class LineaVentaSerializer(DetalleVentaSerializer):
+    """
+    Detalle anidado en VentaSerializer. El producto se recibe como entero
+    para no consultar la base de datos por cada línea durante la
+    validación; registrar_venta comprueba su existencia en un solo SELECT.
+    """
+    id_producto = serializers.IntegerField(write_only=True, min_value=1)
+
 class VentaSerializer(serializers.ModelSerializer):
     usuario = UsuarioSerializer(source='id_usuario', read_only=True)
     cliente = ClienteSerializer(source='id_cliente', read_only=True)
-    detalles = DetalleVentaSerializer(many=True, required=False)
+    detalles = LineaVentaSerializer(many=True, required=False)
     id_cliente = serializers.PrimaryKeyRelatedField(
         queryset=Cliente.objects.all(),
         required=False,
@@ -49,23 +58,21 @@ class VentaSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         detalles_data = validated_data.pop('detalles', [])
-        
-        # Crear la venta
-        venta = Venta.objects.create(**validated_data)
-        
-        # Crear los detalles
-        for detalle_data in detalles_data:
-            DetalleVenta.objects.create(
-                id_venta=venta,
-                **detalle_data
-            )
-        
-        # Recalcular el total
-        venta.total = sum(
-            detalle.subtotal 
-            for detalle in venta.detalles.all()
-        )
-        venta.save()
-        
-        return venta
+        usuario = validated_data.pop('id_usuario')
+        return registrar_venta(usuario, detalles_data, **validated_data)
 
+class VentaLoteItemSerializer(serializers.Serializer):
+    """
+    Venta capturada por una terminal sin conexión. Solo valida la forma de
+    los datos; la existencia de productos/clientes y el stock se validan
+    para todo el lote en registrar_ventas_lote.
+    """
+    clave_idempotencia = serializers.CharField(max_length=64)
+    id_cliente = serializers.IntegerField(required=False, allow_null=True)
+    fecha = serializers.DateField(required=False)
+    metodo_pago = serializers.ChoiceField(choices=Venta._meta.get_field('metodo_pago').choices)
+    estado = serializers.ChoiceField(
+        choices=Venta._meta.get_field('estado').choices,
+        required=False
+    )
+    detalles = LineaVentaSerializer(many=True)
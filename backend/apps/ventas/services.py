@@ -0,0 +1,448 @@
+# apps/ventas/services.py
+import logging
+import time
+
+from django.core.exceptions import ValidationError
+from django.db import transaction, IntegrityError
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from apps.inventario.models import Producto, MovimientoInventario
+from apps.inventario.services import ajustar_stock_lote
+from apps.inventario.utils import incrementar_version
+from .models import Cliente, Venta, DetalleVenta, ResumenVentaDiario
+
+logger = logging.getLogger(__name__)
+
+# Columnas de la exportación contable: una fila por línea de venta
+COLUMNAS_EXPORTACION_VENTAS = (
+    'id_venta', 'fecha', 'id_usuario', 'nombre_usuario', 'id_cliente',
+    'metodo_pago', 'estado', 'total', 'id_detalle', 'id_producto',
+    'codigo_barras', 'producto', 'cantidad', 'precio_unitario', 'subtotal',
+)
+_CAMPOS_EXPORTACION_VENTAS = (
+    'id_venta', 'fecha', 'id_usuario', 'id_usuario__nombre_usuario', 'id_cliente',
+    'metodo_pago', 'estado', 'total', 'detalles__id_detalle', 'detalles__id_producto',
+    'detalles__id_producto__codigo_barras', 'detalles__id_producto__nombre',
+    'detalles__cantidad', 'detalles__precio_unitario', 'detalles__subtotal',
+)
+
+
+def _agrupar_cantidades(detalles):
+    """
+    Suma las cantidades solicitadas por producto (un mismo producto
+    puede aparecer en varias líneas del ticket).
+    """
+    cantidades = {}
+    for detalle in detalles:
+        if detalle['cantidad'] <= 0:
+            raise ValidationError('La cantidad debe ser mayor a 0')
+        id_producto = detalle['id_producto']
+        cantidades[id_producto] = cantidades.get(id_producto, 0) + detalle['cantidad']
+    return cantidades
+
+
+def _bloquear_productos(ids):
+    """
+    Bloquea todas las filas de Producto afectadas en una sola consulta.
+    El orden por llave primaria evita interbloqueos entre cajas.
+    """
+    productos = Producto.objects.select_for_update().filter(
+        id_producto__in=ids
+    ).order_by('id_producto').only('id_producto', 'nombre', 'precio', 'stock')
+    return {producto.id_producto: producto for producto in productos}
+
+
+def _validar_existencia(ids, productos):
+    faltantes = set(ids) - set(productos)
+    if faltantes:
+        raise ValidationError(
+            f'Productos inexistentes: {", ".join(str(i) for i in sorted(faltantes))}'
+        )
+
+
+def _construir_lineas(detalles, productos):
+    lineas = []
+    for detalle in detalles:
+        producto = productos[detalle['id_producto']]
+        precio_unitario = detalle['precio_unitario']
+        lineas.append(DetalleVenta(
+            id_producto=producto,
+            cantidad=detalle['cantidad'],
+            precio_unitario=precio_unitario,
+            subtotal=detalle['cantidad'] * precio_unitario
+        ))
+    return lineas
+
+
+def _construir_movimientos(ventas_lineas, usuario, stock_actual, ahora):
+    """
+    Genera los movimientos de salida encadenando stock_anterior/stock_nuevo
+    en memoria a partir del stock previo de cada producto.
+    """
+    movimientos = []
+    for venta, lineas in ventas_lineas:
+        for linea in lineas:
+            id_producto = linea.id_producto.id_producto
+            stock_anterior = stock_actual[id_producto]
+            stock_actual[id_producto] = stock_anterior - linea.cantidad
+            movimientos.append(MovimientoInventario(
+                id_producto=linea.id_producto,
+                id_usuario_id=usuario.pk,
+                tipo_movimiento=MovimientoInventario.SALIDA,
+                cantidad=linea.cantidad,
+                stock_anterior=stock_anterior,
+                stock_nuevo=stock_actual[id_producto],
+                fecha_movimiento=ahora,
+                descripcion=f'Venta #{venta.id_venta}',
+                numero_documento=f'V-{venta.id_venta}'
+            ))
+    return movimientos
+
+
+def acumular_resumen(cambios):
+    """
+    Suma deltas a ResumenVentaDiario.
+
+    cambios: {(fecha, id_usuario, metodo_pago, estado): (ventas, total, unidades)}.
+    Cada clave cuesta un UPDATE (más un INSERT la primera vez en el día).
+    Todo cambio de ventas pasa por aquí, por lo que también invalida las
+    cachés que dependen de ellas.
+    """
+    incrementar_version('ventas')
+    for clave in sorted(cambios, key=str):
+        ventas, total, unidades = cambios[clave]
+        if not (ventas or total or unidades):
+            continue
+        fecha, id_usuario, metodo_pago, estado = clave
+        filtro = {
+            'fecha': fecha,
+            'id_usuario_id': id_usuario,
+            'metodo_pago': metodo_pago,
+            'estado': estado,
+        }
+        incremento = {
+            'num_ventas': F('num_ventas') + ventas,
+            'total': F('total') + total,
+            'unidades': F('unidades') + unidades,
+        }
+        if ResumenVentaDiario.objects.filter(**filtro).update(**incremento):
+            continue
+        try:
+            with transaction.atomic():
+                ResumenVentaDiario.objects.create(
+                    num_ventas=ventas, total=total, unidades=unidades, **filtro
+                )
+        except IntegrityError:
+            # Otra transacción creó la fila del día al mismo tiempo
+            ResumenVentaDiario.objects.filter(**filtro).update(**incremento)
+
+
+def sumar_cambio_resumen(cambios, clave, ventas, total, unidades):
+    actual = cambios.get(clave, (0, 0, 0))
+    cambios[clave] = (actual[0] + ventas, actual[1] + total, actual[2] + unidades)
+
+
+@transaction.atomic
+def registrar_venta(usuario, detalles, **datos_venta):
+    """
+    Registra una venta con sus detalles y movimientos de inventario.
+
+    El número de consultas es constante sin importar cuántas líneas
+    tenga el ticket: un SELECT ... FOR UPDATE de los productos, un UPDATE
+    condicional de stock, el INSERT de la venta, un INSERT masivo de
+    detalles y un INSERT masivo de movimientos.
+    """
+    if not detalles:
+        raise ValidationError('La venta debe tener al menos un producto')
+
+    cantidades = _agrupar_cantidades(detalles)
+    productos = _bloquear_productos(cantidades)
+    _validar_existencia(cantidades, productos)
+
+    # UPDATE condicional único: falla si algún producto quedaría en negativo
+    stock_resultante = ajustar_stock_lote({
+        id_producto: -cantidad for id_producto, cantidad in cantidades.items()
+    })
+
+    lineas = _construir_lineas(detalles, productos)
+
+    # El total se calcula en memoria, sin volver a consultar los detalles
+    datos_venta.setdefault('fecha', timezone.localdate())
+    venta = Venta(
+        id_usuario_id=usuario.pk,
+        total=sum(linea.subtotal for linea in lineas),
+        **datos_venta
+    )
+    venta._omitir_resumen = True
+    venta.save(force_insert=True)
+
+    # bulk_create no dispara las señales de DetalleVenta, por lo que
+    # el stock se descuenta una sola vez (en ajustar_stock_lote)
+    for linea in lineas:
+        linea.id_venta = venta
+    DetalleVenta.objects.bulk_create(lineas)
+
+    stock_actual = {
+        id_producto: stock_anterior
+        for id_producto, (stock_anterior, _) in stock_resultante.items()
+    }
+    MovimientoInventario.objects.bulk_create(
+        _construir_movimientos([(venta, lineas)], usuario, stock_actual, timezone.now())
+    )
+
+    acumular_resumen({
+        venta.clave_resumen(): (1, venta.total, sum(cantidades.values()))
+    })
+
+    return venta
+
+
+@transaction.atomic
+def registrar_ventas_lote(usuario, ventas):
+    """
+    Registra un lote de ventas capturadas sin conexión.
+
+    Cada venta trae una clave_idempotencia generada por la terminal: las
+    claves ya registradas se reportan como duplicadas y no se vuelven a
+    procesar, por lo que reenviar el mismo lote es seguro. Una clave
+    repetida dentro del lote se reporta como duplicada con el id_venta de
+    su primera aparición. Sin estado, la venta toma el default del modelo,
+    igual que en registrar_venta. El stock se
+    valida para todo el lote en memoria (en orden de llegada) sobre un
+    único SELECT ... FOR UPDATE, y la escritura se hace con un UPDATE de
+    stock y un INSERT masivo por tabla.
+
+    Devuelve una lista de resultados, uno por venta y en el mismo orden,
+    con estado 'creada', 'duplicada' o 'rechazada'.
+    """
+    claves = [venta['clave_idempotencia'] for venta in ventas]
+    existentes = dict(
+        Venta.objects.filter(clave_idempotencia__in=claves)
+        .values_list('clave_idempotencia', 'id_venta')
+    )
+
+    ids_productos = {
+        detalle['id_producto'] for venta in ventas for detalle in venta['detalles']
+    }
+    ids_clientes = {venta['id_cliente'] for venta in ventas if venta.get('id_cliente')}
+    productos = _bloquear_productos(ids_productos)
+    clientes = set(
+        Cliente.objects.filter(id_cliente__in=ids_clientes).values_list('id_cliente', flat=True)
+    )
+    disponible = {id_producto: producto.stock for id_producto, producto in productos.items()}
+
+    resultados = []
+    aceptadas = []
+    descuentos = {}
+    primeras = {}
+    repetidas = []
+    for datos in ventas:
+        clave = datos['clave_idempotencia']
+        resultado = {'clave_idempotencia': clave}
+        resultados.append(resultado)
+
+        if clave in existentes:
+            resultado.update(estado='duplicada', id_venta=existentes[clave])
+            continue
+        if clave in primeras:
+            resultado['estado'] = 'duplicada'
+            repetidas.append(resultado)
+            continue
+        primeras[clave] = resultado
+
+        try:
+            if not datos['detalles']:
+                raise ValidationError('La venta debe tener al menos un producto')
+            if datos.get('id_cliente') and datos['id_cliente'] not in clientes:
+                raise ValidationError(f'Cliente inexistente: {datos["id_cliente"]}')
+            cantidades = _agrupar_cantidades(datos['detalles'])
+            _validar_existencia(cantidades, productos)
+            for id_producto, cantidad in cantidades.items():
+                if disponible[id_producto] < cantidad:
+                    raise ValidationError(
+                        f'Stock insuficiente para {productos[id_producto].nombre}'
+                    )
+        except ValidationError as e:
+            resultado.update(estado='rechazada', error=' '.join(e.messages))
+            continue
+
+        for id_producto, cantidad in cantidades.items():
+            disponible[id_producto] -= cantidad
+            descuentos[id_producto] = descuentos.get(id_producto, 0) - cantidad
+
+        lineas = _construir_lineas(datos['detalles'], productos)
+        venta = Venta(
+            id_usuario_id=usuario.pk,
+            id_cliente_id=datos.get('id_cliente'),
+            fecha=datos.get('fecha') or timezone.localdate(),
+            total=sum(linea.subtotal for linea in lineas),
+            metodo_pago=datos['metodo_pago'],
+            clave_idempotencia=clave
+        )
+        if datos.get('estado'):
+            venta.estado = datos['estado']
+        aceptadas.append((venta, lineas, resultado))
+
+    if not aceptadas:
+        _completar_repetidas(repetidas, primeras)
+        return resultados
+
+    stock_resultante = ajustar_stock_lote(descuentos)
+
+    # bulk_create devuelve las llaves primarias en PostgreSQL y SQLite
+    Venta.objects.bulk_create([venta for venta, _, _ in aceptadas])
+
+    ventas_lineas = []
+    for venta, lineas, resultado in aceptadas:
+        resultado.update(estado='creada', id_venta=venta.id_venta, total=venta.total)
+        for linea in lineas:
+            linea.id_venta = venta
+        ventas_lineas.append((venta, lineas))
+
+    DetalleVenta.objects.bulk_create(
+        [linea for _, lineas in ventas_lineas for linea in lineas]
+    )
+
+    stock_actual = {
+        id_producto: stock_anterior
+        for id_producto, (stock_anterior, _) in stock_resultante.items()
+    }
+    MovimientoInventario.objects.bulk_create(
+        _construir_movimientos(ventas_lineas, usuario, stock_actual, timezone.now())
+    )
+
+    cambios = {}
+    for venta, lineas in ventas_lineas:
+        sumar_cambio_resumen(
+            cambios, venta.clave_resumen(),
+            1, venta.total, sum(linea.cantidad for linea in lineas)
+        )
+    acumular_resumen(cambios)
+
+    _completar_repetidas(repetidas, primeras)
+    return resultados
+
+
+def _completar_repetidas(repetidas, primeras):
+    # Las claves repetidas en el lote reportan la venta de su primera aparición
+    for resultado in repetidas:
+        resultado['id_venta'] = primeras[resultado['clave_idempotencia']].get('id_venta')
+
+
+@transaction.atomic
+def cancelar_ventas(usuario, ventas, motivo=''):
+    """
+    Cancela todas las ventas completadas del queryset `ventas` y revierte
+    su inventario en una sola transacción.
+
+    Las cantidades se agregan por producto en la base de datos y se
+    devuelven con un único UPDATE de stock; los movimientos de entrada
+    (uno por venta y producto) se insertan de forma masiva.
+    Devuelve la lista de id_venta canceladas.
+    """
+    canceladas = list(
+        ventas.select_for_update()
+        .filter(estado='completada')
+        .order_by('id_venta')
+        .values('id_venta', 'fecha', 'id_usuario', 'metodo_pago', 'total')
+    )
+    if not canceladas:
+        return []
+    ids = [venta['id_venta'] for venta in canceladas]
+
+    lineas = list(
+        DetalleVenta.objects.filter(id_venta__in=ids)
+        .values('id_venta', 'id_producto')
+        .annotate(cantidad=Sum('cantidad'))
+        .order_by('id_venta', 'id_producto')
+    )
+
+    incrementos = {}
+    for linea in lineas:
+        id_producto = linea['id_producto']
+        incrementos[id_producto] = incrementos.get(id_producto, 0) + linea['cantidad']
+    stock_resultante = ajustar_stock_lote(incrementos)
+
+    ahora = timezone.now()
+    stock_actual = {
+        id_producto: stock_anterior
+        for id_producto, (stock_anterior, _) in stock_resultante.items()
+    }
+    movimientos = []
+    for linea in lineas:
+        id_producto = linea['id_producto']
+        stock_anterior = stock_actual[id_producto]
+        stock_actual[id_producto] = stock_anterior + linea['cantidad']
+        movimientos.append(MovimientoInventario(
+            id_producto_id=id_producto,
+            id_usuario_id=usuario.pk,
+            tipo_movimiento=MovimientoInventario.ENTRADA,
+            cantidad=linea['cantidad'],
+            stock_anterior=stock_anterior,
+            stock_nuevo=stock_actual[id_producto],
+            fecha_movimiento=ahora,
+            descripcion=f'Reversión por cancelación de Venta #{linea["id_venta"]}',
+            numero_documento=f'RC-{linea["id_venta"]}'
+        ))
+    MovimientoInventario.objects.bulk_create(movimientos)
+
+    Venta.objects.filter(id_venta__in=ids).update(
+        estado='cancelada',
+        motivo_cancelacion=motivo,
+        fecha_cancelacion=ahora,
+        cancelado_por_id=usuario.pk
+    )
+
+    # Mover las ventas de la fila 'completada' a la fila 'cancelada'
+    unidades = {}
+    for linea in lineas:
+        unidades[linea['id_venta']] = unidades.get(linea['id_venta'], 0) + linea['cantidad']
+    cambios = {}
+    for venta in canceladas:
+        clave = (venta['fecha'], venta['id_usuario'], venta['metodo_pago'])
+        cantidad = unidades.get(venta['id_venta'], 0)
+        sumar_cambio_resumen(cambios, clave + ('completada',), -1, -venta['total'], -cantidad)
+        sumar_cambio_resumen(cambios, clave + ('cancelada',), 1, venta['total'], cantidad)
+    acumular_resumen(cambios)
+
+    return ids
+
+
+def iterar_ventas_con_detalles(ventas, tamano_bloque=1000):
+    """
+    Genera tuplas COLUMNAS_EXPORTACION_VENTAS para las ventas dadas y sus
+    líneas (una venta sin líneas produce una fila con las columnas de la
+    línea vacías).
+
+    Recorre las ventas por bloques con keyset sobre id_venta: cada bloque
+    son dos consultas (los ids siguientes y el JOIN venta-detalle de esos
+    ids), así que en memoria nunca hay más de un bloque y el costo de cada
+    bloque no depende de cuántos se hayan emitido antes. Al terminar
+    registra el rendimiento en el log.
+    """
+    inicio = time.perf_counter()
+    num_ventas = num_filas = 0
+    ultimo = 0
+    try:
+        while True:
+            ids = list(
+                ventas.filter(id_venta__gt=ultimo).order_by('id_venta')
+                .values_list('id_venta', flat=True)[:tamano_bloque]
+            )
+            if not ids:
+                break
+            filas = Venta.objects.filter(id_venta__in=ids).order_by(
+                'id_venta', 'detalles__id_detalle'
+            ).values_list(*_CAMPOS_EXPORTACION_VENTAS)
+            for fila in filas:
+                num_filas += 1
+                yield fila
+            num_ventas += len(ids)
+            ultimo = ids[-1]
+    finally:
+        segundos = time.perf_counter() - inicio
+        logger.info(
+            'Exportación de ventas: %d ventas, %d filas en %.2f s (%.0f filas/s)',
+            num_ventas, num_filas, segundos, num_filas / segundos if segundos else 0
+        )
@@ -1,8 +1,11 @@
 # apps/ventas/signals.py
-from django.db.models.signals import post_save, pre_save
+from django.db.models import F, Sum
+from django.db.models.signals import post_save, pre_save, post_delete, pre_delete
 from django.dispatch import receiver
-from .models import Venta, DetalleVenta
-from django.db import transaction
+from .models import Cliente, Venta, DetalleVenta
+from apps.inventario.services import ajustar_stock
+from apps.inventario.utils import incrementar_version
+from .services import acumular_resumen, sumar_cambio_resumen
 from django.core.exceptions import ValidationError
 
 @receiver(pre_save, sender=DetalleVenta)
@@ -15,12 +18,104 @@ def validar_stock(sender, instance, **kwargs):
 @receiver(post_save, sender=DetalleVenta)
 def actualizar_stock(sender, instance, created, **kwargs):
     if created:  # Solo cuando se crea un nuevo detalle
-        with transaction.atomic():
-            producto = instance.id_producto
-            producto.stock -= instance.cantidad
-            producto.save()
+        # Detalles creados uno a uno (API de detalles, admin): descuento
+        # atómico por el mismo camino que las ventas
+        _, stock_nuevo = ajustar_stock(instance.id_producto_id, -instance.cantidad)
+        if DetalleVenta.id_producto.is_cached(instance):
+            instance.id_producto.stock = stock_nuevo
+
+def _clave_resumen(id_venta):
+    return tuple(
+        Venta.objects.values_list('fecha', 'id_usuario', 'metodo_pago', 'estado').get(pk=id_venta)
+    )
+
+@receiver(pre_save, sender=DetalleVenta)
+def releer_original_detalle(sender, instance, raw=False, **kwargs):
+    # Detalle cargado con .only()/.defer() o armado a mano con su pk: se
+    # leen los valores guardados para no sumar dos veces el subtotal
+    if instance._original is None and instance.pk is not None and not raw:
+        instance._original = instance.leer_original()
+
+@receiver(post_save, sender=DetalleVenta)
+def ajustar_total_venta(sender, instance, created, **kwargs):
+    """
+    Ajusta Venta.total (y su resumen diario) por diferencia en lugar de
+    recalcular el agregado.
+    """
+    id_venta_anterior, subtotal_anterior, cantidad_anterior = instance._original or (None, 0, 0)
+    cambios = {}
+    if id_venta_anterior and id_venta_anterior != instance.id_venta_id:
+        Venta.objects.filter(pk=id_venta_anterior).update(total=F('total') - subtotal_anterior)
+        sumar_cambio_resumen(cambios, _clave_resumen(id_venta_anterior), 0, -subtotal_anterior, -cantidad_anterior)
+        subtotal_anterior = cantidad_anterior = 0
+
+    delta = instance.subtotal - subtotal_anterior
+    if delta:
+        Venta.objects.filter(pk=instance.id_venta_id).update(total=F('total') + delta)
+    if delta or instance.cantidad != cantidad_anterior:
+        sumar_cambio_resumen(
+            cambios, _clave_resumen(instance.id_venta_id),
+            0, delta, instance.cantidad - cantidad_anterior
+        )
+    acumular_resumen(cambios)
+    instance._original = (instance.id_venta_id, instance.subtotal, instance.cantidad)
+
+@receiver(pre_delete, sender=DetalleVenta)
+def releer_original_detalle_eliminado(sender, instance, **kwargs):
+    if instance._original is None:
+        instance._original = instance.leer_original()
+
+@receiver(post_delete, sender=DetalleVenta)
+def descontar_total_venta(sender, instance, **kwargs):
+    if not instance._original:
+        return
+    id_venta, subtotal, cantidad = instance._original
+    if Venta.objects.filter(pk=id_venta).update(total=F('total') - subtotal):
+        acumular_resumen({_clave_resumen(id_venta): (0, -subtotal, -cantidad)})
+
+@receiver(pre_save, sender=Venta)
+def releer_original_venta(sender, instance, raw=False, **kwargs):
+    # Venta cargada con .only()/.defer(): se leen los valores anteriores
+    # antes de sobrescribirlos para no saltarse el resumen
+    if (instance._original is None and not instance._state.adding
+            and not (raw or getattr(instance, '_omitir_resumen', False))):
+        instance._original = instance.leer_original()
 
 @receiver(post_save, sender=Venta)
-def actualizar_total_venta(sender, instance, **kwargs):
-    instance.actualizar_total()
-    instance.save()
\ No newline at end of file
+def actualizar_resumen_venta(sender, instance, created, raw=False, **kwargs):
+    """
+    Refleja en ResumenVentaDiario los cambios hechos fuera de los servicios
+    de venta (admin, PATCH de estado, etc.). Los servicios actualizan el
+    resumen por su cuenta y marcan la instancia con _omitir_resumen.
+    """
+    clave = instance.clave_resumen()
+    if not (raw or getattr(instance, '_omitir_resumen', False)):
+        if created:
+            # Las unidades se suman al guardar cada detalle
+            acumular_resumen({clave: (1, instance.total, 0)})
+        elif instance._original:
+            clave_anterior, total_anterior = instance._original[:4], instance._original[4]
+            if clave_anterior != clave:
+                unidades = instance.detalles.aggregate(unidades=Sum('cantidad'))['unidades'] or 0
+                cambios = {}
+                sumar_cambio_resumen(cambios, clave_anterior, -1, -total_anterior, -unidades)
+                sumar_cambio_resumen(cambios, clave, 1, instance.total, unidades)
+                acumular_resumen(cambios)
+            elif instance.total != total_anterior:
+                acumular_resumen({clave: (0, instance.total - total_anterior, 0)})
+    instance._original = clave + (instance.total,)
+
+@receiver(pre_delete, sender=Venta)
+def releer_original_venta_eliminada(sender, instance, **kwargs):
+    if instance._original is None:
+        instance._original = instance.leer_original()
+
+@receiver(post_delete, sender=Venta)
+def descontar_resumen_venta(sender, instance, **kwargs):
+    # Los detalles ya se borraron en cascada (y restaron total y unidades)
+    if instance._original:
+        acumular_resumen({instance._original[:4]: (-1, 0, 0)})
+
+@receiver([post_save, post_delete], sender=Cliente)
+def invalidar_cache_clientes(sender, instance, **kwargs):
+    incrementar_version('clientes')
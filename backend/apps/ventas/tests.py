@@ -0,0 +1,310 @@
+# apps/ventas/tests.py
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.inventario.models import Categoria, MovimientoInventario, Producto
+from apps.usuarios.models import Usuario
+
+from .models import Cliente, DetalleVenta, ResumenVentaDiario, Venta
+from .services import registrar_ventas_lote
+
+
+class DatosListadoTestCase(TestCase):
+    LINEAS_POR_VENTA = 3
+
+    def setUp(self):
+        for alias in ('compartida', 'default', 'stock'):
+            caches[alias].clear()
+        self.admin = Usuario.objects.create_user(
+            email='admin@axolpos.local', password=None, nombre_usuario='admin',
+            tipo_usuario='administrador', is_staff=True
+        )
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.admin)
+        self.creadas = 0
+
+    def crear_datos(self, hasta):
+        """
+        Agrega filas hasta `hasta`, cada una con su propio usuario (y su
+        persona, que crea la señal), cliente, categoría y producto para que
+        un acceso perezoso se note.
+        """
+        hoy = timezone.localdate()
+        for i in range(self.creadas, hasta):
+            categoria = Categoria.objects.create(nombre=f'Categoría {i}')
+            producto = Producto.objects.create(
+                codigo_barras=f'{i:06d}', nombre=f'Producto {i}', descripcion='',
+                precio=Decimal('10.00'), stock=1000, categoria=categoria
+            )
+            usuario = Usuario.objects.create_user(
+                email=f'cajero{i}@axolpos.local', password=None,
+                nombre_usuario=f'cajero{i}', tipo_usuario='cajero'
+            )
+            cliente = Cliente.objects.create(
+                nombre=f'Cliente {i}', apellido='', email=f'cliente{i}@axolpos.local',
+                telefono='', direccion=''
+            )
+            venta = Venta.objects.create(
+                id_usuario=usuario, id_cliente=cliente, fecha=hoy,
+                total=Decimal('10.00') * self.LINEAS_POR_VENTA,
+                metodo_pago='efectivo', estado='completada'
+            )
+            DetalleVenta.objects.bulk_create([
+                DetalleVenta(
+                    id_venta=venta, id_producto=producto, cantidad=1,
+                    precio_unitario=Decimal('10.00'), subtotal=Decimal('10.00')
+                )
+                for _ in range(self.LINEAS_POR_VENTA)
+            ])
+            MovimientoInventario.objects.create(
+                id_producto=producto, id_usuario=usuario,
+                tipo_movimiento=MovimientoInventario.ENTRADA, cantidad=1,
+                stock_anterior=999, stock_nuevo=1000, descripcion=''
+            )
+        self.creadas = hasta
+
+
+class ConsultasListadoTest(DatosListadoTestCase):
+    """
+    Los listados ejecutan el mismo número de consultas sin importar
+    cuántas filas (y relaciones distintas) serializan.
+    """
+
+    def assertConsultasConstantes(self, url, consultas):
+        for tamano in (2, 10):
+            self.crear_datos(tamano)
+            with self.subTest(url=url, filas=tamano), self.assertNumQueries(consultas):
+                respuesta = self.cliente.get(url, {'limite': 50})
+            self.assertEqual(respuesta.status_code, 200, respuesta.content)
+
+    def test_ventas(self):
+        self.assertConsultasConstantes('/api/ventas/ventas/', 2)
+
+    def test_detalle_venta(self):
+        self.crear_datos(1)
+        venta = Venta.objects.get()
+        with self.assertNumQueries(2):
+            respuesta = self.cliente.get(f'/api/ventas/ventas/{venta.pk}/')
+        self.assertEqual(respuesta.status_code, 200, respuesta.content)
+
+    def test_detalles(self):
+        self.assertConsultasConstantes('/api/ventas/detalles/', 1)
+
+    def test_clientes(self):
+        self.assertConsultasConstantes('/api/ventas/clientes/', 1)
+
+    def test_productos(self):
+        self.assertConsultasConstantes('/api/inventario/productos/', 1)
+
+    def test_movimientos(self):
+        self.assertConsultasConstantes('/api/inventario/movimientos/', 1)
+
+    def test_usuarios(self):
+        self.assertConsultasConstantes('/api/usuarios/usuarios/', 1)
+
+
+class PaginacionTest(DatosListadoTestCase):
+    """
+    Solo productos, movimientos, clientes y ventas se paginan por cursor;
+    los demás listados conservan la respuesta como lista.
+    """
+
+    def test_paginados_siguen_el_cursor(self):
+        self.crear_datos(3)
+        for url in (
+            '/api/ventas/ventas/', '/api/ventas/clientes/',
+            '/api/inventario/productos/', '/api/inventario/movimientos/',
+        ):
+            with self.subTest(url=url):
+                respuesta = self.cliente.get(url, {'limite': 2})
+                self.assertEqual(len(respuesta.data['results']), 2)
+                respuesta = self.cliente.get(respuesta.data['next'])
+                self.assertEqual(len(respuesta.data['results']), 1)
+                self.assertIsNone(respuesta.data['next'])
+
+    def test_no_paginados(self):
+        self.crear_datos(3)
+        for url in ('/api/ventas/detalles/', '/api/usuarios/usuarios/'):
+            with self.subTest(url=url):
+                self.assertIsInstance(self.cliente.get(url).data, list)
+
+
+class ResumenVentaDiferidaTest(TestCase):
+    """
+    Una venta cargada con .only() o .defer() sigue moviéndose entre filas
+    de ResumenVentaDiario al guardarla o borrarla.
+    """
+
+    def setUp(self):
+        caches['compartida'].clear()
+        self.usuario = Usuario.objects.create_user(
+            email='cajero@axolpos.local', password=None,
+            nombre_usuario='cajero', tipo_usuario='cajero'
+        )
+        self.venta = Venta.objects.create(
+            id_usuario=self.usuario, fecha=timezone.localdate(), total=Decimal('30.00'),
+            metodo_pago='efectivo', estado='completada'
+        )
+
+    def resumen(self):
+        return dict(ResumenVentaDiario.objects.values_list('estado', 'num_ventas'))
+
+    def test_guardar_venta_diferida(self):
+        venta = Venta.objects.only('id_venta', 'estado').get(pk=self.venta.pk)
+        venta.estado = 'cancelada'
+        venta.save()
+        self.assertEqual(self.resumen(), {'completada': 0, 'cancelada': 1})
+
+    def test_borrar_venta_diferida(self):
+        Venta.objects.defer('total').get(pk=self.venta.pk).delete()
+        self.assertEqual(self.resumen(), {'completada': 0})
+
+
+class TotalDetalleDiferidoTest(TestCase):
+    """
+    Un detalle cargado sin sus campos de total, o armado a mano con su pk,
+    ajusta Venta.total por diferencia y no suma dos veces el subtotal.
+    """
+
+    def setUp(self):
+        caches['compartida'].clear()
+        usuario = Usuario.objects.create_user(
+            email='cajero@axolpos.local', password=None,
+            nombre_usuario='cajero', tipo_usuario='cajero'
+        )
+        self.producto = Producto.objects.create(
+            nombre='Producto', descripcion='', precio=Decimal('10.00'), stock=10
+        )
+        self.venta = Venta.objects.create(
+            id_usuario=usuario, fecha=timezone.localdate(), total=Decimal('0.00'),
+            metodo_pago='efectivo', estado='completada'
+        )
+        self.detalle = DetalleVenta.objects.create(
+            id_venta=self.venta, id_producto=self.producto, cantidad=2,
+            precio_unitario=Decimal('10.00'), subtotal=Decimal('20.00')
+        )
+
+    def totales(self):
+        self.venta.refresh_from_db()
+        resumen = ResumenVentaDiario.objects.values_list('total', 'unidades').get()
+        return self.venta.total, resumen
+
+    def test_guardar_detalle_diferido(self):
+        detalle = DetalleVenta.objects.defer('subtotal').get(pk=self.detalle.pk)
+        detalle.cantidad = 3
+        detalle.save()
+        self.assertEqual(self.totales(), (Decimal('30.00'), (Decimal('30.00'), 3)))
+
+    def test_guardar_detalle_armado_a_mano(self):
+        DetalleVenta(
+            id_detalle=self.detalle.pk, id_venta=self.venta, id_producto=self.producto,
+            cantidad=1, precio_unitario=Decimal('10.00')
+        ).save()
+        self.assertEqual(self.totales(), (Decimal('10.00'), (Decimal('10.00'), 1)))
+
+    def test_borrar_detalle_diferido(self):
+        DetalleVenta.objects.only('id_detalle').get(pk=self.detalle.pk).delete()
+        self.assertEqual(self.totales(), (Decimal('0.00'), (Decimal('0.00'), 0)))
+
+
+class VerificarTotalesTest(TestCase):
+
+    def setUp(self):
+        caches['compartida'].clear()
+        usuario = Usuario.objects.create_user(
+            email='cajero@axolpos.local', password=None,
+            nombre_usuario='cajero', tipo_usuario='cajero'
+        )
+        producto = Producto.objects.create(
+            nombre='Producto', descripcion='', precio=Decimal('10.00'), stock=10
+        )
+        self.venta = Venta.objects.create(
+            id_usuario=usuario, fecha=timezone.localdate(), total=Decimal('0.00'),
+            metodo_pago='efectivo', estado='completada'
+        )
+        DetalleVenta.objects.create(
+            id_venta=self.venta, id_producto=producto, cantidad=2,
+            precio_unitario=Decimal('10.00'), subtotal=Decimal('20.00')
+        )
+        # Total desviado por una escritura que se saltó las señales
+        Venta.objects.filter(pk=self.venta.pk).update(total=Decimal('5.00'))
+        ResumenVentaDiario.objects.update(total=Decimal('5.00'))
+
+    def test_reparar_ajusta_el_resumen(self):
+        call_command('verificar_totales', '--reparar', stdout=StringIO())
+        self.venta.refresh_from_db()
+        self.assertEqual(self.venta.total, Decimal('20.00'))
+        self.assertEqual(
+            list(ResumenVentaDiario.objects.values_list('num_ventas', 'total', 'unidades')),
+            [(1, Decimal('20.00'), 2)]
+        )
+
+
+class VentasLoteTest(TestCase):
+
+    def setUp(self):
+        caches['compartida'].clear()
+        self.usuario = Usuario.objects.create_user(
+            email='cajero@axolpos.local', password=None,
+            nombre_usuario='cajero', tipo_usuario='cajero'
+        )
+        self.producto = Producto.objects.create(
+            nombre='Producto', descripcion='', precio=Decimal('10.00'), stock=10
+        )
+
+    def venta(self, clave, **datos):
+        return {
+            'clave_idempotencia': clave, 'metodo_pago': 'efectivo',
+            'detalles': [{'id_producto': self.producto.pk, 'cantidad': 1, 'precio_unitario': Decimal('10.00')}],
+            **datos,
+        }
+
+    def test_clave_repetida_en_el_lote(self):
+        resultados = registrar_ventas_lote(self.usuario, [self.venta('a'), self.venta('a')])
+        id_venta = Venta.objects.get().pk
+        self.assertEqual(
+            [(r['estado'], r['id_venta']) for r in resultados],
+            [('creada', id_venta), ('duplicada', id_venta)]
+        )
+        self.producto.refresh_from_db()
+        self.assertEqual(self.producto.stock, 9)
+
+    def test_estado_por_defecto_del_modelo(self):
+        registrar_ventas_lote(self.usuario, [self.venta('a'), self.venta('b', estado='completada')])
+        self.assertEqual(
+            dict(Venta.objects.values_list('clave_idempotencia', 'estado')),
+            {'a': 'pendiente', 'b': 'completada'}
+        )
+
+
+class CancelarLoteTest(TestCase):
+
+    def setUp(self):
+        caches['compartida'].clear()
+        admin = Usuario.objects.create_user(
+            email='admin@axolpos.local', password=None, nombre_usuario='admin',
+            tipo_usuario='administrador', is_staff=True
+        )
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(admin)
+        self.url = '/api/ventas/ventas/cancelar_lote/'
+
+    def test_ids_invalidos(self):
+        for ids in (['abc'], [0], [True], 'abc'):
+            with self.subTest(ids=ids):
+                respuesta = self.cliente.post(self.url, {'ids': ids}, format='json')
+                self.assertEqual(respuesta.status_code, 400, respuesta.content)
+                self.assertIn('error', respuesta.data)
+
+    def test_fechas_invalidas(self):
+        for filtro in ({'fecha_inicio': 'xx'}, {'fecha_fin': '2024-02-30'}, {'id_usuario': 'x'}):
+            with self.subTest(filtro=filtro):
+                respuesta = self.cliente.post(self.url, {'filtro': filtro}, format='json')
+                self.assertEqual(respuesta.status_code, 400, respuesta.content)
+                self.assertIn('error', respuesta.data)
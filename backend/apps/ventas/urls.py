@@ -1,7 +1,7 @@
 # apps/ventas/urls.py
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ClienteViewSet, VentaViewSet, DetalleVentaViewSet
+from .views import ClienteViewSet, VentaViewSet, DetalleVentaViewSet, EstadisticasDashboardView
 
 router = DefaultRouter()
 router.register(r'clientes', ClienteViewSet)
@@ -9,5 +9,6 @@ router.register(r'ventas', VentaViewSet)
 router.register(r'detalles', DetalleVentaViewSet)
 
 urlpatterns = [
+    path('dashboard/', EstadisticasDashboardView.as_view(), name='dashboard_estadisticas'),
     path('', include(router.urls)),
 ]
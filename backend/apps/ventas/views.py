@@ -1,28 +1,47 @@
 # apps/ventas/views.py
-from django.db.models import Sum, Avg, Q
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import Sum, Avg, Q, F, Count, Prefetch
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import transaction, IntegrityError
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
 
 from apps.inventario.models import (
     Producto, 
     MovimientoInventario,
 )
+from apps.inventario.utils import obtener_versiones
+from myproject.exportacion import FORMATOS, TAMANO_BLOQUE, respuesta_exportacion
+from myproject.lectura import LecturaRapidaMixin
+from myproject.mixins import PlanConsultasMixin
+from myproject.pagination import KeysetPagination
 
 from .models import (
     Cliente,    
     Venta,
     DetalleVenta,
+    ResumenVentaDiario,
 )
 from .serializers import (
     ClienteSerializer,
     VentaSerializer,
     DetalleVentaSerializer,
+    VentaLoteItemSerializer,
+)
+from .services import (
+    registrar_ventas_lote,
+    cancelar_ventas,
+    iterar_ventas_con_detalles,
+    COLUMNAS_EXPORTACION_VENTAS,
 )
 from apps.usuarios.permissions import (
     EsAdministrador,
@@ -39,7 +58,9 @@ class ClienteViewSet(viewsets.ModelViewSet):
     queryset = Cliente.objects.all()
     serializer_class = ClienteSerializer
     permission_classes = [IsAuthenticated, VentasPermission]
-    
+    pagination_class = KeysetPagination
+    orden_cursor = ('id_cliente',)
+
     def get_queryset(self):
         """
         Filtrar ventas basado en permisos de objeto
@@ -81,19 +102,36 @@ class ClienteViewSet(viewsets.ModelViewSet):
             
         return super().partial_update(request, *args, **kwargs)
 
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], permission_classes=[EsAdministrador])
     def exportar_clientes(self, request):
         """
         Endpoint para exportar datos de clientes.
         Solo accesible por administradores.
+        Por defecto (?formato=json) responde en memoria como siempre;
+        ?formato=csv o ndjson devuelve un StreamingHttpResponse que lee
+        los clientes por bloques.
         """
-        clientes = self.get_queryset()
-        serializer = self.get_serializer(clientes, many=True)
-        
-        return Response({
-            'mensaje': 'Exportación exitosa',
-            'data': serializer.data
-        })
+        formato = request.query_params.get('formato', 'json')
+        if formato == 'json':
+            clientes = self.get_queryset()
+            serializer = self.get_serializer(clientes, many=True)
+
+            return Response({
+                'mensaje': 'Exportación exitosa',
+                'data': serializer.data
+            })
+
+        if formato not in FORMATOS:
+            return Response(
+                {'error': f'formato solo admite: json, {", ".join(FORMATOS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        columnas = ClienteSerializer.Meta.fields
+        filas = self.get_queryset().order_by('id_cliente').values_list(
+            *columnas
+        ).iterator(chunk_size=TAMANO_BLOQUE)
+        return respuesta_exportacion(formato, columnas, filas, 'clientes')
 
     @action(detail=True, methods=['post'])
     @transaction.atomic
@@ -112,10 +150,32 @@ class ClienteViewSet(viewsets.ModelViewSet):
             'fecha_modificacion': cliente.fecha_modificacion
         })
 
-class VentaViewSet(viewsets.ModelViewSet):
+# Usuario -> persona, cliente y detalles -> producto -> categoría en
+# tres consultas, sin importar cuántas ventas o líneas se serialicen
+PLAN_VENTA_COMPLETA = {
+    'select_related': ('id_usuario__persona', 'id_cliente'),
+    'prefetch_related': (
+        Prefetch(
+            'detalles',
+            queryset=DetalleVenta.objects.select_related('id_producto__categoria')
+        ),
+    ),
+}
+
+class VentaViewSet(PlanConsultasMixin, LecturaRapidaMixin, viewsets.ModelViewSet):
     queryset = Venta.objects.all()
     serializer_class = VentaSerializer
     permission_classes = [IsAuthenticated, VentasPermission]  # Asegurarse que VentasPermission está bien definido
+    pagination_class = KeysetPagination
+    orden_cursor = ('-fecha', '-id_venta')
+    plan_consultas = {
+        'list': PLAN_VENTA_COMPLETA,
+        'retrieve': PLAN_VENTA_COMPLETA,
+        'create': PLAN_VENTA_COMPLETA,
+        'update': PLAN_VENTA_COMPLETA,
+        'partial_update': PLAN_VENTA_COMPLETA,
+    }
+    MAX_VENTAS_LOTE = 500
     
 
     def get_queryset(self):
@@ -124,87 +184,96 @@ class VentaViewSet(viewsets.ModelViewSet):
         """
         queryset = super().get_queryset()
         if self.request.user.tipo_usuario == 'cajero':
-            return queryset.filter(venta__id_usuario=self.request.user.id)
+            return queryset.filter(id_usuario=self.request.user.pk)
         return queryset
 
-    @transaction.atomic
     def create(self, request, *args, **kwargs):
-        print("Datos recibidos:", request.data)  # Debug
-        print("Usuario:", request.user)  # Debug
-        print("Método:", request.method)  # Debug
-        
+        """
+        Registra la venta mediante el motor de cobro (services.registrar_venta)
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
         try:
-            detalles = request.data.get('detalles', [])
-            self._validar_stock_disponible(detalles)
-            
-            data = request.data.copy()
-            data['id_usuario'] = request.user.id
-            
-            serializer = self.get_serializer(data=data)
-            serializer.is_valid(raise_exception=True)
             self.perform_create(serializer)
-            
-            venta = serializer.instance
-            self._procesar_movimientos_inventario(venta, detalles)
-            
-            headers = self.get_success_headers(serializer.data)
-            return Response(
-                serializer.data, 
-                status=status.HTTP_201_CREATED, 
-                headers=headers
-            )
-            
-        except Exception as e:
-            print("Error en create:", str(e))  # Debug
+        except ValidationError as e:
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-    def _validar_stock_disponible(self, detalles):
+        venta = self.get_queryset().get(pk=serializer.instance.pk)
+        data = self.get_serializer(venta).data
+        headers = self.get_success_headers(data)
+        return Response(
+            data,
+            status=status.HTTP_201_CREATED,
+            headers=headers
+        )
+
+    def perform_create(self, serializer):
         """
-        Valida que haya suficiente stock para todos los productos
-        antes de procesar la venta.
+        Guarda la venta con el usuario actual
         """
-        product_ids = [detalle['id_producto'] for detalle in detalles]
-        productos = Producto.objects.filter(id_producto__in=product_ids).select_related('inventario')
-        for producto in productos:
-            cantidad_solicitada = next(detalle['cantidad'] for detalle in detalles if detalle['id_producto'] == producto.id_producto)
-            if producto.stock < cantidad_solicitada:
-                raise ValidationError(f'Stock insuficiente para {producto.nombre}')
-
+        serializer.save(id_usuario=self.request.user)
 
-    def _procesar_movimientos_inventario(self, venta, detalles):
+    @action(detail=False, methods=['post'])
+    def lote(self, request):
         """
-        Crea los movimientos de inventario correspondientes
-        para cada producto en la venta.
+        Ingesta masiva de ventas capturadas sin conexión.
+        Recibe {'ventas': [...]} donde cada venta incluye una
+        clave_idempotencia; reenviar el mismo lote no duplica ventas.
         """
-        for detalle in detalles:
-            producto = Producto.objects.get(id_producto=detalle['id_producto'])
-            cantidad = detalle['cantidad']
-            
-            # Crear movimiento de salida en inventario
-            MovimientoInventario.objects.create(
-                id_producto=producto,
-                id_usuario=self.request.user,
-                tipo_movimiento=MovimientoInventario.SALIDA,
-                cantidad=cantidad,
-                descripcion=f'Venta #{venta.id}',
-                numero_documento=f'V-{venta.id}'
+        ventas = request.data.get('ventas')
+        if not isinstance(ventas, list) or not ventas:
+            return Response(
+                {'error': 'Se requiere una lista de ventas'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(ventas) > self.MAX_VENTAS_LOTE:
+            return Response(
+                {'error': f'El lote no puede tener más de {self.MAX_VENTAS_LOTE} ventas'},
+                status=status.HTTP_400_BAD_REQUEST
             )
 
-    @transaction.atomic
-    def perform_create(self, serializer):
-        """
-        Guarda la venta con el usuario actual
-        """
-        serializer.save(
-            id_usuario=self.request.user.id,
-            creado_por=self.request.user
-        )
+        # Una venta mal formada no bloquea al resto del lote
+        validas = []
+        resultados = []
+        for datos in ventas:
+            serializer = VentaLoteItemSerializer(data=datos)
+            if serializer.is_valid():
+                validas.append(serializer.validated_data)
+                resultados.append(None)
+            else:
+                resultados.append({
+                    'clave_idempotencia': datos.get('clave_idempotencia') if isinstance(datos, dict) else None,
+                    'estado': 'rechazada',
+                    'error': serializer.errors
+                })
+
+        try:
+            procesadas = iter(registrar_ventas_lote(request.user, validas))
+        except IntegrityError:
+            # Otra petición registró las mismas claves al mismo tiempo
+            return Response(
+                {'error': 'Lote procesado en paralelo, reintente el envío'},
+                status=status.HTTP_409_CONFLICT
+            )
+        except ValidationError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        resultados = [resultado or next(procesadas) for resultado in resultados]
+        return Response({
+            'creadas': sum(r['estado'] == 'creada' for r in resultados),
+            'duplicadas': sum(r['estado'] == 'duplicada' for r in resultados),
+            'rechazadas': sum(r['estado'] == 'rechazada' for r in resultados),
+            'resultados': resultados
+        })
 
     @action(detail=True, methods=['post'])
-    @transaction.atomic
     def cancelar(self, request, pk=None):
         """
         Cancela una venta y revierte los movimientos de inventario
@@ -212,66 +281,237 @@ class VentaViewSet(viewsets.ModelViewSet):
         venta = self.get_object()
         motivo = request.data.get('motivo', '')
         
+        # Validar que la venta esté en estado válido para cancelación
+        if venta.estado != 'completada':
+            return Response(
+                {'error': 'Solo se pueden cancelar ventas completadas'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
-            # Validar que la venta esté en estado válido para cancelación
-            if venta.estado != 'completada':
-                raise ValidationError('Solo se pueden cancelar ventas completadas')
-                
-            # Revertir movimientos de inventario
-            self._revertir_movimientos_inventario(venta)
-            
-            # Cancelar la venta
-            venta.estado = 'cancelada'
-            venta.motivo_cancelacion = motivo
-            venta.fecha_cancelacion = timezone.now()
-            venta.cancelado_por = request.user
-            venta.save()
-            
-            return Response({'status': 'Venta cancelada exitosamente'})
-            
+            cancelar_ventas(request.user, Venta.objects.filter(pk=venta.pk), motivo)
         except ValidationError as e:
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-    def _revertir_movimientos_inventario(self, venta):
+        return Response({'status': 'Venta cancelada exitosamente'})
+
+    @action(detail=False, methods=['post'], permission_classes=[EsAdministrador])
+    def cancelar_lote(self, request):
         """
-        Crea movimientos de entrada para revertir una venta cancelada
+        Cancela varias ventas completadas en una sola transacción.
+        Recibe {'ids': [...]} o {'filtro': {...}} con fecha_inicio,
+        fecha_fin, metodo_pago y/o id_usuario, además de 'motivo'.
         """
-        detalles = DetalleVenta.objects.filter(venta=venta)
-        
-        for detalle in detalles:
-            # Crear movimiento de entrada para revertir la salida
-            MovimientoInventario.objects.create(
-                id_producto=detalle.producto,
-                id_usuario=self.request.user,
-                tipo_movimiento=MovimientoInventario.ENTRADA,
-                cantidad=detalle.cantidad,
-                descripcion=f'Reversión por cancelación de Venta #{venta.id}',
-                numero_documento=f'RC-{venta.id}'
+        ids = request.data.get('ids')
+        filtro = request.data.get('filtro') or {}
+        motivo = request.data.get('motivo', '')
+
+        ventas = Venta.objects.all()
+        if ids:
+            if not isinstance(ids, list) or not all(
+                type(id_venta) is int and id_venta > 0 for id_venta in ids
+            ):
+                return Response(
+                    {'error': 'ids debe ser una lista de enteros positivos'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            ventas = ventas.filter(id_venta__in=ids)
+        elif filtro:
+            campos = {
+                'fecha_inicio': 'fecha__gte',
+                'fecha_fin': 'fecha__lte',
+                'metodo_pago': 'metodo_pago',
+                'id_usuario': 'id_usuario',
+            }
+            if not isinstance(filtro, dict):
+                return Response(
+                    {'error': 'filtro debe ser un objeto'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            desconocidos = set(filtro) - set(campos)
+            if desconocidos:
+                return Response(
+                    {'error': f'Filtros no soportados: {", ".join(sorted(desconocidos))}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            filtro = dict(filtro)
+            for campo in ('fecha_inicio', 'fecha_fin'):
+                if campo not in filtro:
+                    continue
+                try:
+                    filtro[campo] = parse_date(str(filtro[campo]))
+                except ValueError:
+                    filtro[campo] = None
+                if filtro[campo] is None:
+                    return Response(
+                        {'error': f'{campo} debe tener formato AAAA-MM-DD'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+            if 'id_usuario' in filtro and not (
+                type(filtro['id_usuario']) is int and filtro['id_usuario'] > 0
+            ):
+                return Response(
+                    {'error': 'id_usuario debe ser un entero positivo'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            ventas = ventas.filter(**{campos[campo]: valor for campo, valor in filtro.items()})
+        else:
+            return Response(
+                {'error': 'Se requiere una lista de ids o un filtro'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            canceladas = cancelar_ventas(request.user, ventas, motivo)
+        except (ValidationError, ValueError) as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response({
+            'canceladas': len(canceladas),
+            'ids': canceladas
+        })
+
+    @action(detail=False, methods=['get'], permission_classes=[EsAdministrador])
+    def exportar(self, request):
+        """
+        Exportación contable de ventas con sus líneas, en streaming.
+        Parámetros: fecha_inicio y fecha_fin (obligatorios, AAAA-MM-DD),
+        estado (opcional) y formato (csv por defecto o ndjson).
+        """
+        formato = request.query_params.get('formato', 'csv')
+        if formato not in FORMATOS:
+            return Response(
+                {'error': f'formato solo admite: {", ".join(FORMATOS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            fecha_inicio = date.fromisoformat(request.query_params['fecha_inicio'])
+            fecha_fin = date.fromisoformat(request.query_params['fecha_fin'])
+        except (KeyError, ValueError):
+            return Response(
+                {'error': 'Se requieren fecha_inicio y fecha_fin con formato AAAA-MM-DD'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        ventas = Venta.objects.filter(fecha__range=(fecha_inicio, fecha_fin))
+        estado = request.query_params.get('estado')
+        if estado:
+            ventas = ventas.filter(estado=estado)
+
+        return respuesta_exportacion(
+            formato,
+            COLUMNAS_EXPORTACION_VENTAS,
+            iterar_ventas_con_detalles(ventas, TAMANO_BLOQUE),
+            f'ventas_{fecha_inicio}_{fecha_fin}'
+        )
+
+    @action(detail=False, methods=['get'])
+    def resumen(self, request):
+        """
+        Reporte de ventas leído de ResumenVentaDiario.
+        Parámetros: fecha_inicio, fecha_fin y agrupar (lista separada por
+        comas de fecha, id_usuario, metodo_pago, estado).
+        """
+        agrupar = [
+            campo for campo in request.query_params.get('agrupar', 'fecha').split(',')
+            if campo
+        ]
+        permitidos = {'fecha', 'id_usuario', 'metodo_pago', 'estado'}
+        if not agrupar or set(agrupar) - permitidos:
+            return Response(
+                {'error': f'agrupar solo admite: {", ".join(sorted(permitidos))}'},
+                status=status.HTTP_400_BAD_REQUEST
             )
 
-class DetalleVentaViewSet(viewsets.ModelViewSet):
+        resumenes = ResumenVentaDiario.objects.all()
+        if request.user.tipo_usuario == 'cajero':
+            resumenes = resumenes.filter(id_usuario=request.user.id_usuario)
+        fecha_inicio = request.query_params.get('fecha_inicio')
+        fecha_fin = request.query_params.get('fecha_fin')
+        if fecha_inicio:
+            resumenes = resumenes.filter(fecha__gte=fecha_inicio)
+        if fecha_fin:
+            resumenes = resumenes.filter(fecha__lte=fecha_fin)
+        estado = request.query_params.get('estado')
+        if estado:
+            resumenes = resumenes.filter(estado=estado)
+
+        filas = resumenes.values(*agrupar).annotate(
+            num_ventas=Sum('num_ventas'),
+            total=Sum('total'),
+            unidades=Sum('unidades')
+        ).order_by(*agrupar)
+        return Response(list(filas))
+
+class DetalleVentaViewSet(PlanConsultasMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar detalles de venta.
     """
     queryset = DetalleVenta.objects.all()
     serializer_class = DetalleVentaSerializer
     permission_classes = [VentasPermission]
+    plan_consultas = {
+        'default': {'select_related': ('id_producto__categoria',)},
+    }
     http_method_names = ['get', 'post', 'put', 'patch', 'delete', 'head', 'options']
 
     def get_queryset(self):
         """
         Filtra detalles de venta según el rol del usuario
         """
-        queryset = DetalleVenta.objects.all()
+        queryset = super().get_queryset()
         if not self.request.user.tipo_usuario == 'administrador':
-            queryset = queryset.filter(venta__id_usuario=self.request.user.id)
+            queryset = queryset.filter(id_venta__id_usuario=self.request.user.pk)
         return queryset
 
     def perform_create(self, serializer):
         """
         Guarda el usuario que crea el detalle de venta
         """
-        serializer.save(creado_por=self.request.user)
\ No newline at end of file
+        serializer.save(creado_por=self.request.user)
+
+
+class EstadisticasDashboardView(APIView):
+    """
+    Números del dashboard calculados con agregados (y no descargando las
+    tablas completas). El resultado se cachea por poco tiempo bajo una
+    llave que cambia cuando cambian ventas, clientes o inventario.
+    """
+    permission_classes = [EsCajero]
+    CACHE_TIMEOUT = 60
+
+    def get(self, request):
+        hoy = timezone.localdate()
+        versiones = obtener_versiones('ventas', 'clientes', 'inventario')
+        cache_key = 'dashboard_{}_{ventas}_{clientes}_{inventario}'.format(hoy, **versiones)
+
+        estadisticas = cache.get(cache_key)
+        if estadisticas is None:
+            ventas = ResumenVentaDiario.objects.filter(fecha=hoy).exclude(
+                estado='cancelada'
+            ).aggregate(
+                ventas_hoy=Sum('num_ventas'),
+                ingresos_hoy=Sum('total')
+            )
+            productos = Producto.objects.aggregate(
+                productos_activos=Count('id_producto', filter=Q(estado='activo')),
+                productos_stock_bajo=Count(
+                    'id_producto',
+                    filter=Q(estado='activo', stock__lte=F('stock_minimo'))
+                )
+            )
+            estadisticas = {
+                'ventas_hoy': ventas['ventas_hoy'] or 0,
+                'ingresos_hoy': ventas['ingresos_hoy'] or Decimal('0.00'),
+                'total_clientes': Cliente.objects.count(),
+                **productos
+            }
+            cache.set(cache_key, estadisticas, self.CACHE_TIMEOUT)
+
+        return Response(estadisticas)
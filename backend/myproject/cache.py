@@ -0,0 +1,241 @@
+# backend/myproject/cache.py
+"""
+Caché de dos niveles: L1 en memoria de cada proceso delante de una L2
+compartida (Redis; archivos en disco solo en desarrollo).
+
+Cada escritura graba en L2 el valor y, junto a él, una generación propia
+de esa llave (el instante en nanosegundos). La L1 guarda el valor con la
+generación que tenía al leerlo y lo sirve sin consultar L2 durante
+INTERVALO_GENERACION segundos; pasado ese tiempo revalida leyendo solo la
+generación de la llave y, si cambió, relee el valor. Una escritura en un
+worker deja de verse obsoleta en los demás tras ese intervalo, y solo
+para las llaves escritas: el resto de la L1 sigue sirviéndose. Las
+lecturas que fallan en L1 la rellenan sin escribir en L2.
+
+get_many revalida y rellena todas sus llaves con una sola lectura a L2.
+
+CACHES = {
+    'compartida': {...},  # L2
+    'default': {
+        'BACKEND': 'myproject.cache.CacheDosNiveles',
+        'LOCATION': 'default',
+        'OPTIONS': {'L2': 'compartida', 'L1_TIMEOUT': 60},
+    },
+}
+
+clear() vacía L2 completa, incluidas las llaves de otros alias que la
+compartan, y cambia la época del alias: cada proceso la revisa como mucho
+una vez por intervalo y, si cambió, vacía su L1.
+"""
+import threading
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+
+# Época vista por cada L1, compartida por los hilos del proceso
+_epocas = {}
+_candado = threading.Lock()
+_AUSENTE = object()
+
+
+class CacheDosNiveles(BaseCache):
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        opciones = params.get('OPTIONS', {})
+        self.nombre = location or 'default'
+        self.alias_l2 = opciones['L2']
+        self.l1_timeout = opciones.get('L1_TIMEOUT', 60)
+        self.intervalo_generacion = opciones.get('INTERVALO_GENERACION', 1.0)
+        self.l1 = LocMemCache(f'dos_niveles_{self.nombre}', {
+            'TIMEOUT': self.l1_timeout,
+            'OPTIONS': {'MAX_ENTRIES': opciones.get('L1_MAX_ENTRIES', 1000)},
+        })
+        self._clave_epoca = f'__epoca__:{self.nombre}'
+
+    @property
+    def l2(self):
+        return caches[self.alias_l2]
+
+    # Generaciones
+
+    def _clave_generacion(self, key):
+        return f'{key}:generacion'
+
+    def _revisar_epoca(self):
+        ahora = time.monotonic()
+        with _candado:
+            estado = _epocas.setdefault(self.nombre, {'epoca': None, 'revisado': 0.0})
+            if ahora - estado['revisado'] < self.intervalo_generacion:
+                return
+            estado['revisado'] = ahora
+        epoca = self.l2.get(self._clave_epoca)
+        with _candado:
+            if epoca != estado['epoca']:
+                estado['epoca'] = epoca
+                self.l1.clear()
+
+    def _timeout_generacion(self, timeout):
+        # La generación debe sobrevivir a cualquier copia en L1 del valor
+        segundos = self._segundos(timeout)
+        if segundos is None:
+            return None
+        return max(segundos, self.l1_timeout + self.intervalo_generacion)
+
+    def _escribir(self, datos, timeout):
+        """
+        Escribe {llave: valor} en L2 junto con una generación nueva por
+        llave y los deja en la L1 local. Devuelve las llaves fallidas.
+        """
+        generacion = time.time_ns()
+        generaciones = {self._clave_generacion(key): generacion for key in datos}
+        if self._segundos(timeout) == self._timeout_generacion(timeout):
+            fallidas = self.l2.set_many({**datos, **generaciones}, timeout=self._segundos(timeout))
+        else:
+            fallidas = self.l2.set_many(datos, timeout=self._segundos(timeout))
+            self.l2.set_many(generaciones, timeout=self._timeout_generacion(timeout))
+        ahora = time.monotonic()
+        self.l1.set_many(
+            {key: (generacion, valor, ahora) for key, valor in datos.items()},
+            timeout=self._timeout_l1(timeout)
+        )
+        return [key for key in fallidas if key in datos]
+
+    def _invalidar(self, keys):
+        # Una generación nueva sin valor: los demás procesos releen y no
+        # encuentran la llave
+        generacion = time.time_ns()
+        self.l2.set_many(
+            {self._clave_generacion(key): generacion for key in keys},
+            timeout=self.l1_timeout + self.intervalo_generacion
+        )
+
+    # Timeouts
+
+    def _segundos(self, timeout):
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def _timeout_l1(self, timeout):
+        segundos = self._segundos(timeout)
+        return self.l1_timeout if segundos is None else min(segundos, self.l1_timeout)
+
+    # Lectura
+
+    def _leer(self, keys):
+        """
+        Devuelve {llave: valor} de las llaves presentes, desde L1 si la
+        entrada se revalidó hace menos de INTERVALO_GENERACION segundos y
+        si no con una sola lectura a L2 (generaciones y valores faltantes).
+        """
+        self._revisar_epoca()
+        ahora = time.monotonic()
+        entradas = self.l1.get_many(keys)
+
+        resultado = {}
+        por_revalidar = {}
+        for key in keys:
+            entrada = entradas.get(key)
+            if entrada is None:
+                continue
+            generacion, valor, revisado = entrada
+            if ahora - revisado < self.intervalo_generacion:
+                resultado[key] = valor
+            else:
+                por_revalidar[key] = (generacion, valor)
+
+        faltantes = [key for key in keys if key not in resultado and key not in por_revalidar]
+        if not por_revalidar and not faltantes:
+            return resultado
+
+        pedidas = [self._clave_generacion(key) for key in (*por_revalidar, *faltantes)] + faltantes
+        de_l2 = self.l2.get_many(pedidas)
+
+        rellenos = {}
+        cambiadas = []
+        for key, (generacion, valor) in por_revalidar.items():
+            if de_l2.get(self._clave_generacion(key)) == generacion:
+                resultado[key] = valor
+                rellenos[key] = (generacion, valor, ahora)
+            else:
+                cambiadas.append(key)
+
+        # Las llaves cuya generación cambió se releen en una segunda lectura
+        if cambiadas:
+            de_l2.update(self.l2.get_many(cambiadas))
+        for key in faltantes + cambiadas:
+            if key in de_l2:
+                resultado[key] = de_l2[key]
+                rellenos[key] = (de_l2.get(self._clave_generacion(key)), de_l2[key], ahora)
+            else:
+                self.l1.delete(key)
+        if rellenos:
+            self.l1.set_many(rellenos, timeout=self.l1_timeout)
+        return resultado
+
+    # Interfaz de BaseCache
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._leer([key]).get(key, default)
+
+    def get_many(self, keys, version=None):
+        claves = {self.make_and_validate_key(key, version=version): key for key in keys}
+        return {claves[clave]: valor for clave, valor in self._leer(list(claves)).items()}
+
+    def has_key(self, key, version=None):
+        return self.get(key, _AUSENTE, version=version) is not _AUSENTE
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._escribir({key: value}, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        datos = {self.make_and_validate_key(key, version=version): value for key, value in data.items()}
+        if not datos:
+            return []
+        return self._escribir(datos, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        clave = self.make_and_validate_key(key, version=version)
+        agregada = self.l2.add(clave, value, timeout=self._segundos(timeout))
+        if agregada:
+            self._escribir({clave: value}, timeout)
+        return agregada
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self.l2.touch(self._clave_generacion(key), timeout=self._timeout_generacion(timeout))
+        return self.l2.touch(key, timeout=self._segundos(timeout))
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        valor = self.l2.incr(key, delta)
+        generacion = time.time_ns()
+        self.l2.set(
+            self._clave_generacion(key), generacion,
+            timeout=self._timeout_generacion(DEFAULT_TIMEOUT)
+        )
+        self.l1.set(key, (generacion, valor, time.monotonic()), timeout=self.l1_timeout)
+        return valor
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self.l1.delete(key)
+        eliminada = self.l2.delete(key)
+        self._invalidar([key])
+        return eliminada
+
+    def delete_many(self, keys, version=None):
+        claves = [self.make_and_validate_key(key, version=version) for key in keys]
+        if not claves:
+            return
+        self.l1.delete_many(claves)
+        self.l2.delete_many(claves)
+        self._invalidar(claves)
+
+    def clear(self):
+        self.l1.clear()
+        self.l2.clear()
+        self.l2.set(self._clave_epoca, time.time_ns(), timeout=None)
@@ -0,0 +1,49 @@
+# backend/myproject/exportacion.py
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+FORMATOS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+TAMANO_BLOQUE = 2000
+
+
+class _Eco:
+    """Pseudo-archivo para csv.writer: devuelve la línea en lugar de guardarla."""
+
+    def write(self, valor):
+        return valor
+
+
+def lineas_csv(columnas, filas):
+    escritor = csv.writer(_Eco())
+    yield escritor.writerow(columnas)
+    for fila in filas:
+        yield escritor.writerow(fila)
+
+
+def lineas_ndjson(columnas, filas):
+    codificador = DjangoJSONEncoder(ensure_ascii=False)
+    for fila in filas:
+        yield codificador.encode(dict(zip(columnas, fila))) + '\n'
+
+
+def respuesta_exportacion(formato, columnas, filas, nombre_archivo):
+    """
+    StreamingHttpResponse que emite las filas (tuplas en el orden de
+    `columnas`) a medida que se leen. `filas` debe ser un iterador perezoso,
+    por ejemplo queryset.values_list(...).iterator(chunk_size=...), para que
+    la memoria no dependa del número de registros.
+    """
+    generador = lineas_csv if formato == 'csv' else lineas_ndjson
+    respuesta = StreamingHttpResponse(
+        generador(columnas, filas),
+        content_type=FORMATOS[formato]
+    )
+    respuesta['Content-Disposition'] = f'attachment; filename="{nombre_archivo}.{formato}"'
+    respuesta['X-Accel-Buffering'] = 'no'
+    return respuesta
@@ -0,0 +1,171 @@
+# backend/myproject/lectura.py
+from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+
+
+class LecturaNoSoportada(Exception):
+    """El serializador tiene campos que no se pueden leer con .values()."""
+
+
+class ProyeccionValores:
+    """
+    Traduce los campos legibles de un serializador a una proyección
+    .values() y arma las filas con la misma forma que serializer.data.
+
+    Cada columna se convierte con el to_representation del campo del
+    serializador (decimales, fechas, choices), pero los objetos campo se
+    crean una sola vez por petición y no por fila. Los serializadores
+    anidados uno a uno se leen con JOIN en la misma consulta; los anidados
+    many=True con una consulta adicional para toda la página.
+    """
+
+    def __init__(self, serializer, prefijo=''):
+        self.entradas = []
+        self.columnas = []
+        for nombre, campo in serializer.fields.items():
+            if campo.write_only:
+                continue
+            if campo.source == '*' or isinstance(campo, serializers.SerializerMethodField):
+                raise LecturaNoSoportada(nombre)
+            ruta = prefijo + '__'.join(campo.source_attrs)
+
+            if isinstance(campo, serializers.ListSerializer):
+                if prefijo:
+                    raise LecturaNoSoportada(nombre)
+                self.entradas.append(('muchos', nombre, campo))
+            elif isinstance(campo, serializers.BaseSerializer):
+                modelo = campo.Meta.model
+                clave = f'{ruta}__{modelo._meta.pk.name}'
+                anidada = ProyeccionValores(campo, prefijo=f'{ruta}__')
+                self.columnas.append(clave)
+                self.columnas.extend(anidada.columnas)
+                self.entradas.append(('anidado', nombre, (clave, anidada)))
+            elif isinstance(campo, serializers.PrimaryKeyRelatedField) and campo.pk_field is None:
+                # .values() ya devuelve la clave primaria del relacionado
+                self.columnas.append(ruta)
+                self.entradas.append(('valor', nombre, (ruta, None, False)))
+            elif isinstance(campo, (serializers.RelatedField, serializers.ManyRelatedField)):
+                raise LecturaNoSoportada(nombre)
+            else:
+                # DRF omite la clave cuando una relación intermedia de un
+                # source con puntos es nula (SkipField); se replica aquí
+                omitir_nulo = (
+                    len(campo.source_attrs) > 1 and campo.default is empty
+                    and not campo.allow_null and not campo.required
+                )
+                self.columnas.append(ruta)
+                self.entradas.append(('valor', nombre, (ruta, campo.to_representation, omitir_nulo)))
+
+        self.muchos = {}
+        if not prefijo:
+            self.modelo = serializer.Meta.model
+            for tipo, nombre, campo in self.entradas:
+                if tipo == 'muchos':
+                    relacion = self.modelo._meta.get_field(campo.source)
+                    hijo = ProyeccionValores(campo.child)
+                    self.muchos[nombre] = (relacion.field.name, hijo)
+
+    def valores(self, queryset, *extra):
+        """
+        QuerySet .values() con las columnas de la proyección, la clave
+        primaria y las columnas adicionales (por ejemplo, las del cursor).
+        """
+        pk = queryset.model._meta.pk.name
+        columnas = dict.fromkeys([pk, *extra, *self.columnas])
+        return queryset.prefetch_related(None).values(*columnas)
+
+    def _fila(self, valores, hijos=None):
+        fila = {}
+        for tipo, nombre, dato in self.entradas:
+            if tipo == 'valor':
+                ruta, representar, omitir_nulo = dato
+                valor = valores[ruta]
+                if valor is None:
+                    if not omitir_nulo:
+                        fila[nombre] = None
+                else:
+                    fila[nombre] = representar(valor) if representar else valor
+            elif tipo == 'anidado':
+                clave, anidada = dato
+                fila[nombre] = None if valores[clave] is None else anidada._fila(valores)
+            else:
+                fila[nombre] = hijos.get(nombre, []) if hijos is not None else []
+        return fila
+
+    def representar(self, filas):
+        filas = list(filas)
+        pk = self.modelo._meta.pk.name
+        hijos = {fila[pk]: {} for fila in filas}
+        for nombre, (campo_padre, hijo) in self.muchos.items():
+            for lista in hijos.values():
+                lista[nombre] = []
+            if not filas:
+                continue
+            relacionados = hijo.valores(
+                hijo.modelo.objects.filter(**{f'{campo_padre}__in': list(hijos)}),
+                campo_padre
+            ).order_by(hijo.modelo._meta.pk.name)
+            for valores in relacionados:
+                hijos[valores[campo_padre]][nombre].append(hijo._fila(valores))
+        return [self._fila(fila, hijos[fila[pk]]) for fila in filas]
+
+
+class CamposDispersosMixin:
+    """
+    Permite pedir solo algunos campos con ?fields=a,b,c en las lecturas.
+    Los campos de escritura no se tocan.
+    """
+    campos_query_param = 'fields'
+
+    def get_campos_solicitados(self):
+        if self.request is None or self.request.method not in ('GET', 'HEAD'):
+            return None
+        valor = self.request.query_params.get(self.campos_query_param)
+        if not valor:
+            return None
+        return {campo.strip() for campo in valor.split(',') if campo.strip()}
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        campos = self.get_campos_solicitados()
+        if campos:
+            destino = getattr(serializer, 'child', serializer)
+            desconocidos = campos - set(destino.fields)
+            if desconocidos:
+                raise ParseError({
+                    'error': f'Campos desconocidos: {", ".join(sorted(desconocidos))}'
+                })
+            for nombre in list(destino.fields):
+                if nombre not in campos:
+                    destino.fields.pop(nombre)
+        return serializer
+
+
+class LecturaRapidaMixin(CamposDispersosMixin):
+    """
+    list() construye la respuesta desde .values() con ProyeccionValores en
+    lugar de instanciar modelos y serializar campo por campo. Si el
+    serializador tiene campos que no admiten esta ruta, se usa el list()
+    normal.
+    """
+    lectura_rapida = True
+
+    def list(self, request, *args, **kwargs):
+        if not self.lectura_rapida:
+            return super().list(request, *args, **kwargs)
+        try:
+            proyeccion = ProyeccionValores(self.get_serializer())
+        except LecturaNoSoportada:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        orden = [nombre.lstrip('-') for nombre in getattr(self, 'orden_cursor', ())]
+        filas = proyeccion.valores(queryset, *orden)
+
+        pagina = self.paginate_queryset(filas)
+        if pagina is not None:
+            return self.get_paginated_response(proyeccion.representar(pagina))
+        return Response(proyeccion.representar(filas))
+
@@ -0,0 +1,96 @@
+# backend/myproject/mixins.py
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from apps.inventario.utils import obtener_versiones
+
+
+class PlanConsultasMixin:
+    """
+    Aplica a get_queryset el plan de consultas declarado para cada acción.
+
+    plan_consultas = {
+        'list': {'select_related': (...), 'prefetch_related': (...)},
+        'retrieve': {...},
+    }
+
+    Las acciones sin entrada propia usan la entrada 'default', si existe.
+    Así los serializadores anidados leen las relaciones ya cargadas y el
+    número de consultas no crece con el número de filas.
+    """
+    plan_consultas = {}
+
+    def get_plan_consultas(self):
+        return self.plan_consultas.get(
+            self.action,
+            self.plan_consultas.get('default', {})
+        )
+
+    def aplicar_plan_consultas(self, queryset):
+        plan = self.get_plan_consultas()
+        if plan.get('select_related'):
+            queryset = queryset.select_related(*plan['select_related'])
+        if plan.get('prefetch_related'):
+            queryset = queryset.prefetch_related(*plan['prefetch_related'])
+        return queryset
+
+    def get_queryset(self):
+        return self.aplicar_plan_consultas(super().get_queryset())
+
+
+class GetCondicionalMixin:
+    """
+    GET condicional (ETag) para list y retrieve.
+
+    La vista declara en versiones_condicionales (o devuelve desde
+    get_versiones_condicionales) los nombres de versión de
+    apps.inventario.utils de los que depende su respuesta. Otras vistas
+    pueden envolver su get con respuesta_condicional. El validador se
+    calcula con una lectura de la caché, sin tocar la base de datos, y si
+    coincide con If-None-Match se responde 304 antes de ejecutar la
+    consulta y el serializador.
+
+    No se envía Last-Modified: tiene resolución de segundos y dos cambios
+    dentro del mismo segundo darían un 304 con datos viejos.
+    """
+    versiones_condicionales = ()
+    acciones_condicionales = ('list', 'retrieve')
+
+    def get_versiones_condicionales(self):
+        return self.versiones_condicionales
+
+    def get_etag(self, request):
+        versiones = obtener_versiones(*self.get_versiones_condicionales())
+        # La misma versión produce respuestas distintas según filtros,
+        # cursor, ?fields= y formato
+        firma = hashlib.md5(
+            '|'.join([
+                *(f'{nombre}={versiones[nombre]}' for nombre in sorted(versiones)),
+                request.get_full_path(),
+                request.accepted_renderer.format,
+            ]).encode()
+        ).hexdigest()
+        return quote_etag(firma)
+
+    def respuesta_condicional(self, request, accion, *args, **kwargs):
+        etag = self.get_etag(request)
+        respuesta = get_conditional_response(request, etag=etag)
+        if respuesta is None:
+            respuesta = accion(request, *args, **kwargs)
+        if respuesta.status_code in (200, 304):
+            respuesta['ETag'] = etag
+            # El cliente guarda la respuesta pero la revalida en cada uso
+            patch_cache_control(respuesta, private=True, no_cache=True)
+        return respuesta
+
+    def list(self, request, *args, **kwargs):
+        if 'list' not in self.acciones_condicionales:
+            return super().list(request, *args, **kwargs)
+        return self.respuesta_condicional(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        if 'retrieve' not in self.acciones_condicionales:
+            return super().retrieve(request, *args, **kwargs)
+        return self.respuesta_condicional(request, super().retrieve, *args, **kwargs)
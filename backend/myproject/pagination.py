@@ -0,0 +1,134 @@
+# backend/myproject/pagination.py
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) sobre varias columnas.
+
+    Cada vista declara `orden_cursor`, por ejemplo ('-fecha', '-id_venta'):
+    las columnas deben ser no nulas, la última debe ser única y conviene
+    que exista un índice compuesto con ellas. El cursor guarda los valores
+    de la última fila de la página, de modo que la página siguiente se
+    obtiene con un WHERE sobre el índice y cuesta lo mismo que la primera,
+    sin OFFSET.
+
+    Si la vista pone `pagina_unica = True` (por ejemplo, resultados de
+    búsqueda ordenados por relevancia) se respeta el orden del queryset y
+    se devuelve solo la primera página, sin cursor siguiente.
+    """
+    page_size = api_settings.PAGE_SIZE or 50
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'limite'
+    invalid_cursor_message = 'Cursor inválido'
+
+    def get_ordering(self, view, queryset):
+        orden = getattr(view, 'orden_cursor', None)
+        if orden:
+            return tuple(orden)
+        return ('-' + queryset.model._meta.pk.name,)
+
+    def get_page_size(self, request):
+        try:
+            limite = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(limite, self.max_page_size))
+
+    def _campos(self, queryset, orden):
+        return [
+            (nombre.lstrip('-'), nombre.startswith('-'), queryset.model._meta.get_field(nombre.lstrip('-')))
+            for nombre in orden
+        ]
+
+    def decode_cursor(self, request, campos):
+        codificado = request.query_params.get(self.cursor_query_param)
+        if not codificado:
+            return None
+        return self.leer_cursor(codificado, campos)
+
+    def leer_cursor(self, codificado, campos):
+        try:
+            valores = json.loads(base64.urlsafe_b64decode(codificado.encode('ascii')))
+            if len(valores) != len(campos):
+                raise ValueError
+            return [campo.to_python(valor) for (_, _, campo), valor in zip(campos, valores)]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, fila, campos):
+        valores = []
+        for nombre, _, campo in campos:
+            # La fila puede ser una instancia o un dict de .values()
+            valor = fila[nombre] if isinstance(fila, dict) else getattr(fila, campo.attname)
+            valores.append(valor.isoformat() if hasattr(valor, 'isoformat') else str(valor))
+        return base64.urlsafe_b64encode(json.dumps(valores).encode('utf-8')).decode('ascii')
+
+    def _filtro_keyset(self, campos, valores):
+        """
+        (a, b) > (x, y)  ->  a >= x AND (a > x OR (a = x AND b > y))
+        La cota sobre la primera columna permite un range scan del índice.
+        """
+        condicion = Q()
+        iguales = Q()
+        for (nombre, descendente, _), valor in zip(campos, valores):
+            operador = 'lt' if descendente else 'gt'
+            condicion |= iguales & Q(**{f'{nombre}__{operador}': valor})
+            iguales &= Q(**{nombre: valor})
+        nombre, descendente, _ = campos[0]
+        cota = Q(**{f'{nombre}__{"lte" if descendente else "gte"}': valores[0]})
+        return cota & condicion
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size_actual = self.get_page_size(request)
+        if getattr(view, 'pagina_unica', False):
+            self.siguiente_cursor = None
+            return list(queryset[:self.page_size_actual])
+
+        orden = self.get_ordering(view, queryset)
+        campos = self._campos(queryset, orden)
+
+        queryset = queryset.order_by(*orden)
+        valores = self.decode_cursor(request, campos)
+        if valores is not None:
+            queryset = queryset.filter(self._filtro_keyset(campos, valores))
+
+        filas = list(queryset[:self.page_size_actual + 1])
+        self.hay_siguiente = len(filas) > self.page_size_actual
+        filas = filas[:self.page_size_actual]
+        self.siguiente_cursor = (
+            self.encode_cursor(filas[-1], campos) if self.hay_siguiente else None
+        )
+        return filas
+
+    def get_next_link(self):
+        if not self.siguiente_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.siguiente_cursor)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
@@ -2,6 +2,8 @@
 import os
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
 SECRET_KEY = 'tu_clave_secreta_aqui'
@@ -100,6 +102,9 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Las terminales de venta se identifican para el throttling
+CORS_ALLOW_HEADERS = (*default_headers, 'x-terminal-id')
+
 CORS_ALLOW_METHODS = [
     "DELETE",
     "GET",
@@ -114,27 +119,36 @@ CORS_ALLOW_METHODS = [
 # DRF settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Rol y estado salen de los claims del token, sin consultar Usuario
+        'apps.usuarios.autenticacion.JWTSinConsultaAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'myproject.throttling.TokenBucketThrottle',
     ],
-    'DEFAULT_THROTTLE_RATES': {
-        'anon': '100/day',
-        'user': '1000/day'
-    },
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
     ],
+    # Sin paginador global: solo productos, movimientos, clientes y ventas
+    # declaran KeysetPagination (50 filas por página); el resto de los
+    # listados conserva la respuesta como lista
 
     'UNAUTHENTICATED_USER': None,
 
 }
 
+# Cubetas de tokens (myproject.throttling): tasa sostenida y ráfaga
+# admitida por rol, 'anon', 'user' (rol sin entrada) o 'terminal:<id>'
+# (cabecera X-Terminal-Id)
+THROTTLE_CUBETAS = {
+    'anon': {'tasa': '100/day', 'rafaga': 20},
+    'user': {'tasa': '1000/day', 'rafaga': 50},
+    'cajero': {'tasa': '300/min', 'rafaga': 60},
+    'administrador': {'tasa': '600/min', 'rafaga': 120},
+}
+
 def configure_token_view(_):
     from rest_framework_simplejwt.views import TokenObtainPairView
     TokenObtainPairView.permission_classes = []
@@ -143,6 +157,53 @@ from django.core.signals import setting_changed
 setting_changed.connect(configure_token_view)
 
 
+# Cachés. 'compartida' es la L2 común a todos los workers y máquinas:
+# Redis si hay REDIS_URL (requiere el paquete redis); si no, archivos en
+# disco, compartidos solo entre los procesos de una misma máquina (solo
+# desarrollo: production.py exige Redis).
+# CACHE_BACKEND=locmem la deja por proceso (un solo worker, pruebas).
+# 'default' y 'stock' (apps.inventario.utils.cache_stock) ponen delante
+# una L1 por proceso (myproject.cache.CacheDosNiveles); el stock usa su
+# propio alias para que sus escrituras frecuentes no vacíen la L1 del
+# resto. Las cubetas de throttling van directo a la L2.
+_BACKENDS_CACHE = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'compartida'),
+    'file': (
+        'django.core.cache.backends.filebased.FileBasedCache',
+        os.getenv('CACHE_LOCATION', '/var/tmp/django_cache'),
+    ),
+    'redis': (
+        'django.core.cache.backends.redis.RedisCache',
+        os.getenv('REDIS_URL', 'redis://localhost:6379/0'),
+    ),
+}
+_backend_l2, _ubicacion_l2 = _BACKENDS_CACHE[
+    os.getenv('CACHE_BACKEND', 'redis' if os.getenv('REDIS_URL') else 'file')
+]
+
+CACHES = {
+    'compartida': {
+        'BACKEND': _backend_l2,
+        'LOCATION': _ubicacion_l2,
+        # Cota explícita para el respaldo en archivos (el default es 300)
+        'OPTIONS': {'MAX_ENTRIES': 10000} if _backend_l2.endswith('FileBasedCache') else {},
+    },
+    'default': {
+        'BACKEND': 'myproject.cache.CacheDosNiveles',
+        'LOCATION': 'default',
+        'OPTIONS': {'L2': 'compartida', 'L1_TIMEOUT': 60},
+    },
+    'stock': {
+        'BACKEND': 'myproject.cache.CacheDosNiveles',
+        'LOCATION': 'stock',
+        'TIMEOUT': 300,
+        'KEY_PREFIX': 'stock',
+        'OPTIONS': {'L2': 'compartida', 'L1_TIMEOUT': 30},
+    },
+}
+INVENTARIO_CACHE_STOCK = 'stock'
+
+
 # JWT settings
 from datetime import timedelta
 
@@ -169,7 +230,9 @@ SIMPLE_JWT = {
 
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
-    'TOKEN_USER_CLASS': 'rest_framework_simplejwt.models.TokenUser',
+    'TOKEN_USER_CLASS': 'apps.usuarios.autenticacion.UsuarioToken',
+    'TOKEN_OBTAIN_SERIALIZER': 'apps.usuarios.autenticacion.TokenConClaimsSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.usuarios.autenticacion.RefreshConClaimsSerializer',
 
     'JTI_CLAIM': 'jti',
 }
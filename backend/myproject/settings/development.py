@@ -11,6 +11,9 @@ DATABASES = {
     }
 }
 
+# Los resúmenes de stock bajo (enviar_alertas_stock) se muestran en consola
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+
 # Ya que estás usando Docker, también es buena práctica agregar:
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -100,18 +100,23 @@ LOGGING = {
             'level': 'ERROR',
             'propagate': False,
         },
+        'apps': {
+            'handlers': ['console'],
+            'level': os.getenv('APPS_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
     },
 }
 
-# Cache configuration (uncomment and configure as needed)
-"""
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
-        'LOCATION': os.environ.get('REDIS_URL', 'redis://localhost:6379/0'),
-    }
-}
-"""
+# CACHES se define en base.py. En producción la L2 debe ser Redis: con
+# varias máquinas una caché en archivos o en memoria no se comparte y las
+# invalidaciones y revocaciones de un worker no llegarían a los demás.
+if not CACHES['compartida']['BACKEND'].endswith('RedisCache'):
+    from django.core.exceptions import ImproperlyConfigured
+    raise ImproperlyConfigured(
+        'Producción requiere una caché compartida: define REDIS_URL '
+        '(fly redis create; fly secrets set REDIS_URL=...).'
+    )
 
 # Public paths
 PUBLIC_PATHS = [
@@ -0,0 +1,82 @@
+# backend/myproject/tests.py
+from django.core.cache import caches
+from django.test import SimpleTestCase
+
+from .cache import CacheDosNiveles
+
+
+def _worker(nombre):
+    """
+    Una CacheDosNiveles con su propia L1, como la de otro proceso, sobre la
+    misma L2. Con INTERVALO_GENERACION=0 cada lectura revalida la generación.
+    """
+    return CacheDosNiveles(nombre, {
+        'OPTIONS': {'L2': 'compartida', 'L1_TIMEOUT': 60, 'INTERVALO_GENERACION': 0},
+    })
+
+
+class CacheDosNivelesTest(SimpleTestCase):
+
+    def setUp(self):
+        caches['compartida'].clear()
+        self.a = _worker('prueba_a')
+        self.b = _worker('prueba_b')
+        self.a.l1.clear()
+        self.b.l1.clear()
+
+    def test_escritura_en_un_worker_se_ve_en_otro(self):
+        self.a.set('producto', 1)
+        self.assertEqual(self.b.get('producto'), 1)
+
+        self.b.set('producto', 2)
+        self.assertEqual(self.a.get('producto'), 2)
+        self.assertEqual(self.a.get_many(['producto', 'otra']), {'producto': 2})
+
+    def test_delete_se_propaga(self):
+        self.a.set('producto', 1)
+        self.assertEqual(self.b.get('producto'), 1)
+
+        self.a.delete('producto')
+        self.assertIsNone(self.b.get('producto'))
+        self.assertIsNone(self.b.l1.get(self.b.make_key('producto')))
+
+    def test_incr_se_propaga(self):
+        self.a.set('contador', 1)
+        self.assertEqual(self.b.get('contador'), 1)
+        self.assertEqual(self.a.incr('contador'), 2)
+        self.assertEqual(self.b.get('contador'), 2)
+
+    def test_escritura_no_vacia_la_l1_de_otras_llaves(self):
+        self.a.set('producto', 1)
+        self.assertEqual(self.b.get('producto'), 1)
+
+        self.a.set('otra', 'x')
+        self.assertIsNotNone(self.b.l1.get(self.b.make_key('producto')))
+        self.assertEqual(self.b.get('producto'), 1)
+
+    def test_lectura_fallida_no_escribe_en_l2(self):
+        self.a.set('producto', 1)
+        clave = self.a.make_key('producto')
+        generacion = caches['compartida'].get(f'{clave}:generacion')
+
+        self.b.get('producto')
+        self.assertEqual(caches['compartida'].get(f'{clave}:generacion'), generacion)
+
+    def test_add_respeta_la_l2(self):
+        self.assertTrue(self.a.add('llave', 1))
+        self.assertFalse(self.b.add('llave', 2))
+        self.assertEqual(self.b.get('llave'), 1)
+        self.assertTrue(self.b.has_key('llave'))
+
+    def test_clear_vacia_la_l1_de_los_demas(self):
+        self.a.set('producto', 1)
+        self.assertEqual(self.b.get('producto'), 1)
+
+        self.a.clear()
+        self.assertIsNone(self.b.get('producto'))
+
+    def test_alias_configurados_comparten_la_l2(self):
+        caches['default'].set('llave', 1)
+        clave = caches['default'].make_key('llave')
+        self.assertEqual(caches['compartida'].get(clave), 1)
+        self.assertIsNone(caches['stock'].get('llave'))
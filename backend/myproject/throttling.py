@@ -0,0 +1,118 @@
+# backend/myproject/throttling.py
+"""
+Throttling por cubeta de tokens (GCRA) en la caché compartida.
+
+Cada llave guarda un solo entero: el instante teórico de llegada (TAT)
+en microsegundos. Una petición se admite si TAT - ahora no supera la
+tolerancia de ráfaga y entonces TAT avanza un intervalo (periodo / tasa).
+La memoria por llave es constante, a diferencia del historial de
+marcas de tiempo de SimpleRateThrottle.
+
+Con Redis la lectura-modificación-escritura es un script Lua atómico que
+usa el reloj de Redis. Con otros backends es un get/set: entre procesos
+puede admitir alguna petición de más, nunca bloquear de más.
+
+Los límites salen de THROTTLE_CUBETAS en settings:
+
+THROTTLE_CUBETAS = {
+    'anon': {'tasa': '100/day', 'rafaga': 10},
+    'cajero': {'tasa': '300/min', 'rafaga': 60},
+    'terminal:caja-1': {...},  # opcional, por cabecera X-Terminal-Id
+}
+
+Las peticiones autenticadas usan la entrada de la terminal, si existe;
+si no, la del rol (tipo_usuario); si no, 'user'. La cubeta es por
+usuario y terminal, así que varias cajas con la misma cuenta no se
+reparten el límite.
+"""
+import math
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+ALIAS_CACHE = 'compartida'
+CABECERA_TERMINAL = 'HTTP_X_TERMINAL_ID'
+_PERIODOS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+_SCRIPT_GCRA = """
+local t = redis.call('TIME')
+local ahora = tonumber(t[1]) * 1000000 + tonumber(t[2])
+local tat = tonumber(redis.call('GET', KEYS[1])) or ahora
+if tat < ahora then tat = ahora end
+if tat - ahora > tonumber(ARGV[2]) then
+    return {0, tat - ahora}
+end
+tat = tat + tonumber(ARGV[1])
+redis.call('SET', KEYS[1], tat, 'PX', math.max(1, math.ceil((tat - ahora) / 1000)))
+return {1, tat - ahora}
+"""
+
+_candado = threading.Lock()
+
+
+def interpretar_tasa(tasa):
+    """
+    '300/min' -> (300, 60). Acepta las mismas unidades que DRF.
+    """
+    cantidad, periodo = tasa.split('/')
+    return int(cantidad), _PERIODOS[periodo[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+
+    def get_cubeta(self, request):
+        """
+        Devuelve (llave, configuración) o (None, None) si no aplica límite.
+        """
+        cubetas = getattr(settings, 'THROTTLE_CUBETAS', {})
+        usuario = request.user
+        if not (usuario and usuario.is_authenticated):
+            return f'cubeta_anon_{self.get_ident(request)}', cubetas.get('anon')
+
+        terminal = re.sub(r'[^\w.-]', '', request.META.get(CABECERA_TERMINAL, ''))[:64]
+        configuracion = (
+            (terminal and cubetas.get(f'terminal:{terminal}'))
+            or cubetas.get(getattr(usuario, 'tipo_usuario', None))
+            or cubetas.get('user')
+        )
+        return f'cubeta_{usuario.pk}_{terminal}', configuracion
+
+    def allow_request(self, request, view):
+        llave, configuracion = self.get_cubeta(request)
+        if configuracion is None:
+            return True
+
+        cantidad, periodo = interpretar_tasa(configuracion['tasa'])
+        intervalo = math.ceil(periodo * 1_000_000 / cantidad)
+        tolerancia = intervalo * (configuracion.get('rafaga', 1) - 1)
+
+        admitida, self._espera = self._gcra(llave, intervalo, tolerancia)
+        return admitida
+
+    def _gcra(self, llave, intervalo, tolerancia):
+        """
+        Devuelve (admitida, microsegundos de TAT por delante de ahora).
+        """
+        cache = caches[ALIAS_CACHE]
+        cliente_redis = getattr(getattr(cache, '_cache', None), 'get_client', None)
+        if cliente_redis is not None:
+            admitida, adelanto = cliente_redis(llave, write=True).eval(
+                _SCRIPT_GCRA, 1, cache.make_key(llave), intervalo, tolerancia
+            )
+            return bool(admitida), adelanto - tolerancia
+
+        with _candado:
+            ahora = int(time.time() * 1_000_000)
+            tat = max(cache.get(llave) or ahora, ahora)
+            if tat - ahora > tolerancia:
+                return False, tat - ahora - tolerancia
+            tat += intervalo
+            cache.set(llave, tat, timeout=math.ceil((tat - ahora) / 1_000_000))
+            return True, 0
+
+    def wait(self):
+        return max(getattr(self, '_espera', 0), 0) / 1_000_000
@@ -5,7 +5,7 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
-from apps.usuarios.views import CurrentUserView
+from apps.usuarios.views import CurrentUserView, LogoutView
 
 class HealthCheckView(APIView):
     permission_classes = [AllowAny]
@@ -21,6 +21,7 @@ urlpatterns = [
     path('api/inventario/', include('apps.inventario.urls')),
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('api/auth/logout/', LogoutView.as_view(), name='logout'),
     path('health/', HealthCheckView.as_view(), name='health_check'),
 
 ]
\ No newline at end of file
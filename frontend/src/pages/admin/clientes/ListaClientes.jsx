@@ -5,6 +5,7 @@ import { clientesAPI } from '../../../services/api/clientesApi';
 
 const ListaClientes = () => {
   const [clientes, setClientes] = useState([]);
+  const [siguiente, setSiguiente] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [busqueda, setBusqueda] = useState('');
@@ -21,8 +22,9 @@ const ListaClientes = () => {
 
   const cargarClientes = async () => {
     try {
-      const data = await clientesAPI.listar(busqueda);
-      setClientes(data);
+      const { resultados, siguiente } = await clientesAPI.listar(busqueda);
+      setClientes(resultados);
+      setSiguiente(siguiente);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -30,6 +32,16 @@ const ListaClientes = () => {
     }
   };
 
+  const cargarMasClientes = async () => {
+    try {
+      const pagina = await clientesAPI.listar(busqueda, siguiente);
+      setClientes((actuales) => [...actuales, ...pagina.resultados]);
+      setSiguiente(pagina.siguiente);
+    } catch (err) {
+      setError(err.message);
+    }
+  };
+
   const handleSubmit = async (e) => {
     e.preventDefault();
     try {
@@ -157,6 +169,16 @@ const ListaClientes = () => {
             No se encontraron clientes
           </div>
         )}
+        {siguiente && (
+          <div className="text-center py-4">
+            <button
+              onClick={cargarMasClientes}
+              className="bg-gray-200 hover:bg-gray-300 text-gray-700 px-4 py-2 rounded"
+            >
+              Cargar más
+            </button>
+          </div>
+        )}
       </div>
 
       {modalAbierto && (
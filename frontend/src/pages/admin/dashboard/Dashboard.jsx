@@ -1,8 +1,6 @@
 // src/pages/admin/dashboard/Dashboard.jsx
 import React, { useState, useEffect } from 'react';
 import { ventasAPI } from '../../../services/api/ventasApi';
-import { clientesAPI } from '../../../services/api/clientesApi';
-import { productosAPI } from '../../../services/api/productosApi';
 
 const DashboardCard = ({ title, value, icon: Icon }) => (
   <div className="bg-white p-6 rounded-lg shadow-md">
@@ -30,16 +28,12 @@ const Dashboard = () => {
   useEffect(() => {
     const fetchDashboardData = async () => {
       try {
-        const [ventas, clientes, productos] = await Promise.all([
-          ventasAPI.listar(),
-          clientesAPI.listar(),
-          productosAPI.listar()
-        ]);
+        const estadisticas = await ventasAPI.estadisticas();
 
         setStats({
-          ventasHoy: ventas.length,
-          totalClientes: clientes.length,
-          productosStock: productos.length
+          ventasHoy: estadisticas.ventas_hoy,
+          totalClientes: estadisticas.total_clientes,
+          productosStock: estadisticas.productos_activos
         });
       } catch (err) {
         console.error('Error al cargar datos del dashboard:', err);
@@ -7,6 +7,7 @@ import { useAuth } from '../../../services/auth/AuthContext';
 const ListaProductos = () => {
   const { isAuthenticated, logout } = useAuth();
   const [productos, setProductos] = useState([]);
+  const [siguiente, setSiguiente] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [busqueda, setBusqueda] = useState('');
@@ -65,8 +66,9 @@ const ListaProductos = () => {
     try {
       setLoading(true);
       setError(null);
-      const data = await productosAPI.listar(busqueda);
-      setProductos(data);
+      const { resultados, siguiente } = await productosAPI.listar(busqueda);
+      setProductos(resultados);
+      setSiguiente(siguiente);
     } catch (error) {
       await handleAuthError(error);
     } finally {
@@ -74,6 +76,16 @@ const ListaProductos = () => {
     }
   };
 
+  const cargarMasProductos = async () => {
+    try {
+      const pagina = await productosAPI.listar(busqueda, siguiente);
+      setProductos((actuales) => [...actuales, ...pagina.resultados]);
+      setSiguiente(pagina.siguiente);
+    } catch (error) {
+      await handleAuthError(error);
+    }
+  };
+
   const eliminarProducto = async (id) => {
     if (!isAuthenticated) return;
     
@@ -227,6 +239,16 @@ const ListaProductos = () => {
               No se encontraron productos
             </div>
           )}
+          {siguiente && (
+            <div className="text-center py-4">
+              <button
+                onClick={cargarMasProductos}
+                className="bg-gray-200 hover:bg-gray-300 text-gray-700 px-4 py-2 rounded"
+              >
+                Cargar más
+              </button>
+            </div>
+          )}
         </div>
       )}
 
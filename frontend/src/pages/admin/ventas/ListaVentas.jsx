@@ -4,43 +4,58 @@ import { ventasAPI } from '../../../services/api/ventasApi';
 
 const ListaVentas = () => {
   const [ventas, setVentas] = useState([]);
+  const [siguiente, setSiguiente] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [filtroFecha, setFiltroFecha] = useState('');
 
+  // Validar la estructura de cada venta de una página
+  const validarVentas = (data) => {
+    if (!Array.isArray(data)) {
+      throw new Error('El formato de datos recibido no es válido');
+    }
+
+    return data.map(venta => ({
+      id: venta.id,
+      cliente: {
+        nombre: venta.cliente?.nombre || 'Cliente',
+        apellido: venta.cliente?.apellido || 'Desconocido'
+      },
+      fecha_venta: venta.fecha_venta || new Date().toISOString(),
+      total: typeof venta.total === 'number' ? venta.total : 0,
+      metodo_pago: venta.metodo_pago || 'No especificado'
+    }));
+  };
+
   const cargarVentas = async () => {
     try {
       // Usar el servicio de API configurado
-      const data = await ventasAPI.listar(filtroFecha);
-      
-      // Validar que data sea un array
-      if (!Array.isArray(data)) {
-        throw new Error('El formato de datos recibido no es válido');
-      }
+      const { resultados, siguiente } = await ventasAPI.listar(filtroFecha);
 
-      // Validar la estructura de cada venta
-      const ventasValidadas = data.map(venta => ({
-        id: venta.id,
-        cliente: {
-          nombre: venta.cliente?.nombre || 'Cliente',
-          apellido: venta.cliente?.apellido || 'Desconocido'
-        },
-        fecha_venta: venta.fecha_venta || new Date().toISOString(),
-        total: typeof venta.total === 'number' ? venta.total : 0,
-        metodo_pago: venta.metodo_pago || 'No especificado'
-      }));
-
-      setVentas(ventasValidadas);
+      setVentas(validarVentas(resultados));
+      setSiguiente(siguiente);
       setError(null);
     } catch (err) {
       console.error('Error en cargarVentas:', err);
       setError(err.message || 'Error al cargar las ventas');
       setVentas([]);
+      setSiguiente(null);
     } finally {
       setLoading(false);
     }
   };
 
+  const cargarMasVentas = async () => {
+    try {
+      const pagina = await ventasAPI.listar(filtroFecha, siguiente);
+      setVentas((actuales) => [...actuales, ...validarVentas(pagina.resultados)]);
+      setSiguiente(pagina.siguiente);
+    } catch (err) {
+      console.error('Error en cargarMasVentas:', err);
+      setError(err.message || 'Error al cargar las ventas');
+    }
+  };
+
   useEffect(() => {
     cargarVentas();
   }, [filtroFecha]);
@@ -156,6 +171,16 @@ const ListaVentas = () => {
             No se encontraron ventas para los criterios seleccionados
           </div>
         )}
+        {siguiente && (
+          <div className="text-center py-4">
+            <button
+              onClick={cargarMasVentas}
+              className="bg-gray-200 hover:bg-gray-300 text-gray-700 px-4 py-2 rounded"
+            >
+              Cargar más
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
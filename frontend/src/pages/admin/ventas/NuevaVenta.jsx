@@ -12,6 +12,8 @@ const NuevaVenta = () => {
   const [busquedaCliente, setBusquedaCliente] = useState('');
   const [productosEncontrados, setProductosEncontrados] = useState([]);
   const [clientesEncontrados, setClientesEncontrados] = useState([]);
+  const [siguienteProductos, setSiguienteProductos] = useState(null);
+  const [siguienteClientes, setSiguienteClientes] = useState(null);
   const [metodoPago, setMetodoPago] = useState('efectivo');
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
@@ -19,15 +21,20 @@ const NuevaVenta = () => {
   const navigate = useNavigate();
 
   // Función para buscar productos usando el servicio API
-  const buscarProductos = async (termino) => {
+  // Con `siguiente` agrega la página siguiente a los resultados actuales
+  const buscarProductos = async (termino, siguiente = null) => {
     if (!termino) {
       setProductosEncontrados([]);
+      setSiguienteProductos(null);
       return;
     }
 
     try {
-      const productos = await productosAPI.listar(termino);
-      setProductosEncontrados(productos);
+      const pagina = await productosAPI.listar(termino, siguiente);
+      setProductosEncontrados((actuales) =>
+        siguiente ? [...actuales, ...pagina.resultados] : pagina.resultados
+      );
+      setSiguienteProductos(pagina.siguiente);
       setError(null);
     } catch (error) {
       console.error('Error al buscar productos:', error);
@@ -35,16 +42,42 @@ const NuevaVenta = () => {
     }
   };
 
+  // Lectura del escáner: el lector envía el código seguido de Enter
+  const escanearCodigo = async (e) => {
+    if (e.key !== 'Enter' || !busquedaProducto.trim()) {
+      return;
+    }
+    e.preventDefault();
+
+    try {
+      const producto = await productosAPI.porCodigo(busquedaProducto.trim());
+      if (producto) {
+        agregarAlCarrito(producto);
+        setBusquedaProducto('');
+        setProductosEncontrados([]);
+        setError(null);
+      }
+    } catch (error) {
+      console.error('Error al buscar producto por código:', error);
+      setError('Error al buscar producto por código');
+    }
+  };
+
   // Función para buscar clientes usando el servicio API
-  const buscarClientes = async (termino) => {
+  // Con `siguiente` agrega la página siguiente a los resultados actuales
+  const buscarClientes = async (termino, siguiente = null) => {
     if (!termino) {
       setClientesEncontrados([]);
+      setSiguienteClientes(null);
       return;
     }
     
     try {
-      const clientes = await clientesAPI.listar(termino);
-      setClientesEncontrados(clientes);
+      const pagina = await clientesAPI.listar(termino, siguiente);
+      setClientesEncontrados((actuales) =>
+        siguiente ? [...actuales, ...pagina.resultados] : pagina.resultados
+      );
+      setSiguienteClientes(pagina.siguiente);
       setError(null);
     } catch (error) {
       console.error('Error al buscar clientes:', error);
@@ -121,6 +154,18 @@ const NuevaVenta = () => {
     setError(null);
   
     try {
+      // Revalidar el stock de todo el carrito antes de enviar la venta
+      const stockActual = await productosAPI.stock(carrito.map(item => item.id_producto));
+      const sinStock = carrito.filter(item => (stockActual[item.id_producto] ?? 0) < item.cantidad);
+      if (sinStock.length > 0) {
+        setCarrito(carrito.map(item => ({
+          ...item,
+          stock: stockActual[item.id_producto] ?? 0
+        })));
+        setError(`Stock insuficiente para ${sinStock.map(item => item.nombre).join(', ')}`);
+        return;
+      }
+
       const ventaData = {
         id_cliente: cliente?.id_cliente || null,
         metodo_pago: metodoPago,
@@ -180,6 +225,7 @@ const NuevaVenta = () => {
               type="text"
               value={busquedaProducto}
               onChange={(e) => setBusquedaProducto(e.target.value)}
+              onKeyDown={escanearCodigo}
               placeholder="Buscar producto por nombre o código"
               className="w-full p-2 border rounded"
             />
@@ -197,6 +243,14 @@ const NuevaVenta = () => {
                     </div>
                   </div>
                 ))}
+                {siguienteProductos && (
+                  <button
+                    onClick={() => buscarProductos(busquedaProducto, siguienteProductos)}
+                    className="w-full p-2 text-sm text-blue-600 hover:bg-gray-100"
+                  >
+                    Ver más productos
+                  </button>
+                )}
               </div>
             )}
           </div>
@@ -262,6 +316,14 @@ const NuevaVenta = () => {
                     <div className="text-sm text-gray-600">{clienteEncontrado.email}</div>
                   </div>
                 ))}
+                {siguienteClientes && (
+                  <button
+                    onClick={() => buscarClientes(busquedaCliente, siguienteClientes)}
+                    className="w-full p-2 text-sm text-blue-600 hover:bg-gray-100"
+                  >
+                    Ver más clientes
+                  </button>
+                )}
               </div>
             )}
             {cliente && (
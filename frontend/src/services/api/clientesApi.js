@@ -3,10 +3,14 @@ import axios from './config';
 import { endpoints } from './config';
 
 export const clientesAPI = {
-  listar: async (busqueda = '') => {
+  // Devuelve una página { resultados, siguiente }; para la página
+  // siguiente se pasa la URL `siguiente` en lugar de los filtros
+  listar: async (busqueda = '', siguiente = null) => {
     const params = busqueda ? { q: busqueda } : {};
-    const { data } = await axios.get(endpoints.clientes, { params });
-    return data;
+    const { data } = siguiente
+      ? await axios.get(siguiente)
+      : await axios.get(endpoints.clientes, { params });
+    return { resultados: data.results, siguiente: data.next };
   },
   crear: async (clienteData) => {
     const { data } = await axios.post(endpoints.clientes, clienteData);
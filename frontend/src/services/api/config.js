@@ -15,8 +15,11 @@ export const endpoints = {
   cliente: (id) => `/api/clientes/${id}/`,
   ventas: '/api/ventas/',
   venta: (id) => `/api/ventas/${id}/`,
+  dashboard: '/api/ventas/dashboard/',
   productos: '/api/inventario/productos/',
-  producto: (id) => `/api/inventario/productos/${id}/`
+  producto: (id) => `/api/inventario/productos/${id}/`,
+  productoPorCodigo: (codigo) => `/api/inventario/productos/codigo/${encodeURIComponent(codigo)}/`,
+  stockProductos: '/api/inventario/productos/stock/'
 };
 
 const axiosInstance = axios.create({
@@ -3,17 +3,47 @@ import axios from './config';
 import { endpoints } from './config';
 
 export const productosAPI = {
-  listar: async (busqueda = '') => {
+  // Devuelve una página { resultados, siguiente }; para la página
+  // siguiente se pasa la URL `siguiente` en lugar de los filtros
+  listar: async (busqueda = '', siguiente = null) => {
     try {
-      const params = busqueda ? { q: busqueda } : {};
-      const { data } = await axios.get(endpoints.productos, { params });
-      return data;
+      const params = busqueda ? { buscar: busqueda } : {};
+      const { data } = siguiente
+        ? await axios.get(siguiente)
+        : await axios.get(endpoints.productos, { params });
+      return { resultados: data.results, siguiente: data.next };
     } catch (error) {
       console.error('Error al listar productos:', error);
       throw error;
     }
   },
 
+  porCodigo: async (codigo) => {
+    try {
+      const { data } = await axios.get(endpoints.productoPorCodigo(codigo));
+      return data;
+    } catch (error) {
+      if (error.response?.status === 404) {
+        return null;
+      }
+      console.error('Error al buscar producto por código:', error);
+      throw error;
+    }
+  },
+
+  // Devuelve { id_producto: stock } para varios productos en una petición
+  stock: async (ids) => {
+    try {
+      const { data } = await axios.get(endpoints.stockProductos, {
+        params: { ids: ids.join(',') }
+      });
+      return data;
+    } catch (error) {
+      console.error('Error al consultar stock:', error);
+      throw error;
+    }
+  },
+
   crear: async (productoData) => {
     try {
       const { data } = await axios.post(endpoints.productos, productoData);
@@ -3,13 +3,21 @@ import axios from './config';
 import { endpoints } from './config';
 
 export const ventasAPI = {
-  listar: async (fecha = '') => {
+  // Devuelve una página { resultados, siguiente }; para la página
+  // siguiente se pasa la URL `siguiente` en lugar de los filtros
+  listar: async (fecha = '', siguiente = null) => {
     const params = fecha ? { fecha } : {};
-    const { data } = await axios.get(endpoints.ventas, { params });
-    return data;
+    const { data } = siguiente
+      ? await axios.get(siguiente)
+      : await axios.get(endpoints.ventas, { params });
+    return { resultados: data.results, siguiente: data.next };
   },
   crear: async (ventaData) => {
     const { data } = await axios.post(endpoints.ventas, ventaData);
     return data;
   },
+  estadisticas: async () => {
+    const { data } = await axios.get(endpoints.dashboard);
+    return data;
+  },
 };
\ No newline at end of file
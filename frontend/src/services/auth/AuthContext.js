@@ -47,10 +47,13 @@ export const AuthProvider = ({ children }) => {
     }
   };
 
-  const logout = () => {
-    AuthService.logout();
-    setCurrentUser(null);
-    setIsAuthenticated(false);
+  const logout = async () => {
+    try {
+      await AuthService.logout();
+    } finally {
+      setCurrentUser(null);
+      setIsAuthenticated(false);
+    }
   };
 
   return (
@@ -1,5 +1,5 @@
 // src/services/auth/AuthService.js
-import axios from '../api/config';
+import axios, { endpoints } from '../api/config';
 import TokenService from './tokenService';
 
 class AuthService {
@@ -24,8 +24,19 @@ class AuthService {
   }
 
 
-  logout() {
-    TokenService.removeTokens();
+  async logout() {
+    // Revoca el refresh y el access actual en el servidor; la sesión
+    // local se cierra aunque la petición falle
+    const refresh = TokenService.getRefreshToken();
+    try {
+      if (refresh) {
+        await axios.post(endpoints.auth.logout, { refresh });
+      }
+    } catch (error) {
+      console.error('Error al cerrar sesión:', error.response?.data || error.message);
+    } finally {
+      TokenService.removeTokens();
+    }
   }
 
   async getCurrentUser() {